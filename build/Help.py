@@ -2,21 +2,13 @@
 # https://github.com/ParthJadhav/Tkinter-Designer
 
 from pathlib import Path
-from tkinter import Tk, Canvas, Button, PhotoImage, Label
+from tkinter import Canvas, Button, PhotoImage, Label
 import math  # <-- for rounded borders
-import sys
-import subprocess
-
-# --- Get Fullname from Argument ---
-user_id = None
-fullname = "User" # Default
-if len(sys.argv) > 1:
-    try:
-        user_id = int(sys.argv[1]) # Expect user_id as the first argument
-    except ValueError:
-        print("Warning: First argument should be user_id (integer).")
-if len(sys.argv) > 2:
-    fullname = sys.argv[2]
+import app
+
+# --- Get user_id and Fullname from the session ---
+user_id = app.session["user_id"]
+fullname = app.session["fullname"]
 
 # --- Rounded Rectangle Function ---
 def round_rectangle(canvas, x1, y1, x2, y2, r=15, **kwargs):
@@ -72,20 +64,16 @@ def rounded_box(cnv, x1, y1, x2, y2, r=12, fill="#FFFFFF",
 
 # --- Opens Sesame ---
 def open_user_py():
-    subprocess.Popen([sys.executable, "user.py", fullname])
-    window.destroy()
+    app.show("user")
 
 def open_notification_py():
-    subprocess.Popen([sys.executable, "Notification.py", fullname])
-    window.destroy()
+    app.show("notification")
 
 def open_prices_py():
-    subprocess.Popen([sys.executable, "Prices.py", "Help.py", fullname])
-    window.destroy()
+    app.show("prices")
 
 def open_printer_py():
-    subprocess.Popen([sys.executable, "printer.py", fullname])
-    window.destroy()
+    app.show("printer")
 
 def make_icon_clickable(widget, command):
     widget.bind("<Button-1>", lambda e: command())
@@ -99,7 +87,7 @@ FONT_BTN_MED = ("Inter Bold", -15)
 WHITE = "#FFFFFF"
 BLACK = "#000000"
 
-window = Tk()
+window = app.create_window()
 # --- Center the Window ---
 window_width = 859
 window_height = 534
@@ -305,5 +293,4 @@ make_icon_clickable(lbl_pr, open_printer_py)
 make_icon_clickable(lbl_sheet, open_prices_py)
 make_icon_clickable(lbl_bell, open_notification_py)
 
-window.resizable(False, False)
-window.mainloop()
\ No newline at end of file
+window.resizable(False, False)
\ No newline at end of file
@@ -1,84 +1,41 @@
 # Notifications – icons above buttons + visible borders
 
 from pathlib import Path
-from tkinter import Tk, Canvas, Button, PhotoImage, Label, Frame, Scrollbar, messagebox, ttk
+from tkinter import Canvas, Button, PhotoImage, Label, Frame, Scrollbar, messagebox, ttk
 import tkinter as tk # Use tk alias
 import math
-import sys
-import subprocess
-import mysql.connector
 from datetime import datetime # To format timestamps
+import app
+import db
+import inbox
 
-# --- Get User ID and Fullname from Arguments ---
-user_id = None
-fullname = "User" # Default
-if len(sys.argv) > 1:
-    try:
-        user_id = int(sys.argv[1]) # Expect user_id as the first argument
-    except ValueError:
-        print("Warning: First argument should be user_id (integer).")
-        # Handle error or exit if user_id is crucial
-if len(sys.argv) > 2:
-    fullname = sys.argv[2] # Fullname as the second argument
-
-# --- Database Connection ---
-def get_db_connection():
-    try:
-        return mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="copy_corner_db"
-        )
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", f"Connection failed: {err}")
-        return None
+# --- Get User ID and Fullname from the session ---
+user_id = app.session["user_id"]
+fullname = app.session["fullname"]
 
 # --- Fetch Notifications (MODIFIED) ---
-def fetch_notifications(current_user_id):
-    """Fetches ALL notifications (Read and Unread) for the user or sent to all."""
+def fetch_notifications(current_user_id, before=None):
+    """Fetches one page of notifications (Read and Unread) for the user or sent to all."""
     if current_user_id is None:
         return [] # Cannot fetch without user ID
 
-    notifications = []
-    conn = get_db_connection()
-    if not conn: return notifications
-
     try:
-        cursor = conn.cursor(dictionary=True)
-        # Fetch notifications specifically for the user OR where user_id is NULL (broadcast)
-        # Fetch ALL statuses, ordered newest first
-        query = """
-            SELECT notif_id, subject, message, created_at, status
-            FROM notifications
-            WHERE (user_id = %s OR user_id IS NULL)
-            ORDER BY created_at DESC
-        """
-        cursor.execute(query, (current_user_id,))
-        notifications = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return notifications
-    except mysql.connector.Error as err:
+        # Notifications specifically for the user plus broadcasts, ALL statuses,
+        # newest first, inbox.PAGE_SIZE at a time
+        return inbox.fetch_page(current_user_id, before)
+    except db.Error as err:
         messagebox.showerror("Database Error", f"Error fetching notifications:\n{err}")
         return []
 
 # --- Mark Notification as Read ---
-def mark_notification_as_read(notif_id):
-    """Updates the status of a specific notification to 'Read'."""
-    conn = get_db_connection()
-    if not conn: return
-
+def mark_notification_as_read(notification):
+    """Marks one notification read for this user (a receipt, for broadcasts)."""
     try:
-        cursor = conn.cursor()
-        query = "UPDATE notifications SET status = 'Read' WHERE notif_id = %s"
-        cursor.execute(query, (notif_id,))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        print(f"Marked notification {notif_id} as read.")
-    except mysql.connector.Error as err:
-         print(f"Error marking notification {notif_id} as read: {err}")
+        if inbox.mark_read(user_id, notification):
+            print(f"Marked notification {notification['notif_id']} as read.")
+            set_unread_count(unread_count - 1)
+    except db.Error as err:
+         print(f"Error marking notification {notification['notif_id']} as read: {err}")
 
 # --- Clear Read Notifications (NEW FUNCTION) ---
 def clear_read_notifications():
@@ -87,45 +44,48 @@ def clear_read_notifications():
         messagebox.showerror("Error", "User ID not found.")
         return
 
-    conn = get_db_connection()
-    if not conn: return
-
     try:
-        cursor = conn.cursor()
-        # Update status to 'Read' for all 'Unread' messages for this user or broadcast messages
-        query = """
-            UPDATE notifications
-            SET status = 'Read'
-            WHERE (user_id = %s OR user_id IS NULL) AND status = 'Unread'
-        """
-        cursor.execute(query, (user_id,))
-        affected_rows = cursor.rowcount # Get how many were updated
-        conn.commit()
-        cursor.close()
-        conn.close()
+        # Own messages are updated in place, broadcasts get a receipt for this user only
+        affected_rows = inbox.clear(user_id)
         print(f"Marked {affected_rows} notifications as read.")
-        # Refresh the list to show the visual change
-        refresh_notifications()
+        # Grey out the loaded items instead of reloading the list
+        for notification in loaded_notifications:
+            restyle_as_read(notification)
+        set_unread_count(0)
         if affected_rows > 0:
              messagebox.showinfo("Notifications Cleared", f"{affected_rows} notifications marked as read.")
         else:
              messagebox.showinfo("Notifications Cleared", "No new notifications to clear.")
 
-    except mysql.connector.Error as err:
+    except db.Error as err:
          messagebox.showerror("Database Error", f"Error clearing notifications: {err}")
 
+# --- Unread Badge ---
+unread_count = 0
+
+def set_unread_count(count):
+    global unread_count
+    unread_count = max(count, 0)
+    unread_label.config(text=f"Unread: {unread_count}")
+
+def load_unread_count():
+    """Reads the maintained per-user unread count (no rows are counted)."""
+    try:
+        set_unread_count(inbox.unread_count(user_id))
+    except db.Error as err:
+        print(f"Error loading unread count: {err}")
+
 # --- Show Full Message Window (MODIFIED) ---
 def show_message_window(notification_details):
     """Creates a Toplevel window to display the full notification message."""
-    notif_id = notification_details['notif_id']
     subject = notification_details.get('subject', 'No Subject')
     message = notification_details.get('message', 'No Message Body')
     current_status = notification_details.get('status', 'Unread') # Get status
 
     # --- Mark as read only if it was Unread ---
     if current_status == 'Unread':
-        mark_notification_as_read(notif_id)
-        # We will refresh the list *after* the window closes anyway
+        mark_notification_as_read(notification_details)
+        restyle_as_read(notification_details)
 
     # --- Create the Toplevel window ---
     message_win = tk.Toplevel(window)
@@ -199,18 +159,23 @@ def show_message_window(notification_details):
     # Wait for the window to be closed before returning
     message_win.wait_window()
 
-    # --- Refresh main list after closing ---
-    # Needed now because marking read happens inside, and we want to see the visual change
-    refresh_notifications()
-
 # --- Display Notifications Function (MODIFIED) ---
-def display_notifications(frame, notifications_data):
-    """Populates the frame with notification items. Shows Read items differently."""
-    # Clear previous notifications
-    for widget in frame.winfo_children():
-        widget.destroy()
-
-    if not notifications_data:
+def display_notifications(frame, notifications_data, append=False):
+    """Populates the frame with notification items. Shows Read items differently.
+
+    With append=True the items are added below the ones already shown.
+    """
+    if not append:
+        # Clear previous notifications
+        for widget in frame.winfo_children():
+            widget.destroy()
+        loaded_notifications.clear()
+        subject_labels.clear()
+    elif load_more_button[0] is not None:
+        load_more_button[0].destroy()
+    load_more_button[0] = None
+
+    if not notifications_data and not append:
         no_notif_label = Label(
             frame,
             text="No notifications.", # Changed message slightly
@@ -222,7 +187,7 @@ def display_notifications(frame, notifications_data):
         return
 
     for notification in notifications_data:
-        notif_id = notification['notif_id']
+        loaded_notifications.append(notification)
         status = notification.get('status', 'Unread') # Get status
 
         # Determine colors based on status
@@ -246,6 +211,7 @@ def display_notifications(frame, notifications_data):
             justify="left"
         )
         subject_label.pack(fill="x")
+        subject_labels[notification['notif_id']] = subject_label
 
         # Timestamp Label (Smaller, Gray)
         timestamp = notification.get('created_at', datetime.now())
@@ -275,6 +241,33 @@ def display_notifications(frame, notifications_data):
             w.bind("<Enter>", lambda e: window.config(cursor="hand2"))
             w.bind("<Leave>", lambda e: window.config(cursor=""))
 
+    # A full page means there may be older notifications
+    if len(notifications_data) >= inbox.PAGE_SIZE:
+        load_more_button[0] = Button(frame, text="Load older notifications", font=("Inter Bold", 10),
+                                     command=load_older_notifications, relief="flat", bg=WHITE)
+        load_more_button[0].pack(pady=8)
+
+
+loaded_notifications = []  # notifications shown so far, newest first
+subject_labels = {}  # notif_id -> subject Label, to restyle an item in place
+load_more_button = [None]
+
+
+def restyle_as_read(notification):
+    """Shows a notification as Read without rebuilding the list."""
+    notification['status'] = 'Read'
+    label = subject_labels.get(notification['notif_id'])
+    if label is not None and label.winfo_exists():
+        label.config(fg="grey")
+
+
+def load_older_notifications():
+    """Appends the next page, keyed on the oldest notif_id shown."""
+    if not loaded_notifications:
+        return
+    older = fetch_notifications(user_id, before=loaded_notifications[-1]['notif_id'])
+    display_notifications(notif_content_frame, older, append=True)
+
 
 # --- Scrollbar Helper Functions ---
 # (Keep on_frame_configure and on_mousewheel as they are)
@@ -319,23 +312,23 @@ FONT_BTN_SM = ("Inter Bold", -15)
 # (Keep navigation functions as they are)
 def open_user_py():
     if user_id is None: messagebox.showerror("Error", "User ID not found."); return
-    subprocess.Popen([sys.executable, "user.py", str(user_id), fullname]); window.destroy()
+    app.show("user")
 def open_printer_py():
     if user_id is None: messagebox.showerror("Error", "User ID not found."); return
-    subprocess.Popen([sys.executable, "printer.py", str(user_id), fullname]); window.destroy()
+    app.show("printer")
 def open_prices_py():
     if user_id is None: messagebox.showerror("Error", "User ID not found."); return
-    subprocess.Popen([sys.executable, "Prices.py", "Notification.py", str(user_id), fullname]); window.destroy()
+    app.show("prices")
 def open_help_py():
     if user_id is None: messagebox.showerror("Error", "User ID not found."); return
-    subprocess.Popen([sys.executable, "Help.py", str(user_id), fullname]); window.destroy()
+    app.show("help")
 def make_icon_clickable(widget, command):
     widget.bind("<Button-1>", lambda e: command())
     widget.bind("<Enter>", lambda e: window.config(cursor="hand2"))
     widget.bind("<Leave>", lambda e: window.config(cursor=""))
 
 # -------- window --------
-window = Tk()
+window = app.create_window()
 # --- Center the Window ---
 window_width = 829 # Adjusted to match canvas
 window_height = 504 # Adjusted to match canvas
@@ -414,8 +407,8 @@ notif_content_frame = Frame(notif_canvas, bg=WHITE)
 notif_content_frame_window = notif_canvas.create_window((0, 0), window=notif_content_frame, anchor="nw")
 notif_content_frame.bind("<Configure>", lambda event, canvas=notif_canvas: on_frame_configure(canvas))
 notif_canvas.bind("<Configure>", lambda e: notif_canvas.itemconfig(notif_content_frame_window, width=e.width))
-# Bind mousewheel scrolling
-window.bind_all("<MouseWheel>", lambda event: on_mousewheel(event, notif_canvas)) # Bind globally
+# Bind mousewheel scrolling (on this screen's window only, other screens share the process)
+window.bind("<MouseWheel>", lambda event: on_mousewheel(event, notif_canvas))
 
 
 # --- Add Clear Read Button (NEW) ---
@@ -432,11 +425,18 @@ clear_button = Button(
 # Place it below the notification area, aligned right
 clear_button.place(x=NOTIF_X + NOTIF_W - 80, y=NOTIF_Y + NOTIF_H + 5, width=70, height=25)
 
+# --- Unread badge, left of the Clear Read button ---
+unread_label = Label(window, text="Unread: 0", font=("Inter Bold", 10), bg=WHITE, fg=BLACK, anchor="w")
+unread_label.place(x=NOTIF_X, y=NOTIF_Y + NOTIF_H + 5, width=150, height=25)
+
 
 # --- Fetch and Display Initial Notifications ---
 def refresh_notifications():
+    """Reloads the first page and the unread badge."""
     notifications = fetch_notifications(user_id)
     display_notifications(notif_content_frame, notifications)
+    notif_canvas.yview_moveto(0)
+    load_unread_count()
 
 if user_id is not None:
     refresh_notifications()
@@ -445,5 +445,10 @@ else:
            font=("Inter", 12), bg=WHITE, fg="red").pack(pady=20)
 
 
-window.resizable(False, False)
-window.mainloop()
\ No newline at end of file
+# --- Called by the app shell each time the cached screen is shown again ---
+def on_show():
+    if user_id is not None:
+        refresh_notifications()
+
+
+window.resizable(False, False)
\ No newline at end of file
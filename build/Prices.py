@@ -2,9 +2,10 @@
 # https://github.com/ParthJadhav/Tkinter-Designer
 
 from pathlib import Path
-from tkinter import Tk, Canvas, Button, PhotoImage
-import sys
-import subprocess
+from tkinter import Canvas, Button, PhotoImage
+import app
+import pricing
+import worker
 
 OUTPUT_PATH = Path(__file__).parent
 ASSETS_PATH = OUTPUT_PATH / Path(r"D:\downloadss\New folder\Tkinter\Tkinter-Designer-master\build\assets\frame0")
@@ -12,22 +13,12 @@ ASSETS_PATH = OUTPUT_PATH / Path(r"D:\downloadss\New folder\Tkinter\Tkinter-Desi
 def relative_to_assets(path: str) -> Path:
     return ASSETS_PATH / Path(path)
 
-# --- Handle passed arguments properly ---
-previous_file = "login.py"  # fallback if none provided
-fullname = "User"
-
-if len(sys.argv) > 1:
-    previous_file = sys.argv[1]
-if len(sys.argv) > 2:
-    fullname = sys.argv[2]
-
-# --- Go Back Function (preserves fullname) ---
+# --- Go Back Function (returns to whichever screen opened the pricelist) ---
 def go_back():
-    subprocess.Popen([sys.executable, previous_file, fullname])
-    window.destroy()
+    app.back()
 
 # --- Window setup ---
-window = Tk()
+window = app.create_window()
 # --- Center the Window ---
 window_width = 859
 window_height = 534
@@ -75,23 +66,33 @@ canvas.create_text(38.0, 81.0, anchor="nw", text="TEXT WITH PICTURE", fill="#FF9
 canvas.create_text(498.0, 81.0, anchor="nw", text="EXAMPLE", fill="#FF9400", font=("Inter Bold", 32 * -1))
 canvas.create_text(29.0, 23.0, anchor="nw", text=f"Docs Printing Pricelist:", fill="#FFFFFF", font=("Inter Bold", 32 * -1))
 
-# Section titles
-canvas.create_text(71.0, 128.0, anchor="nw", text="Black & White:", fill="#000000", font=("Inter Bold", 20 * -1))
-canvas.create_text(71.0, 248.0, anchor="nw", text="Partially Colored:", fill="#000000", font=("Inter Bold", 20 * -1))
-canvas.create_text(71.0, 372.0, anchor="nw", text="Full Colored:", fill="#000000", font=("Inter Bold", 20 * -1))
+# Price rows, rendered from the price matrix (see pricing.py)
+SECTION_Y = {"Black & White": 128.0, "Partially Colored": 248.0, "Color": 372.0}
+price_texts = {}  # (color_option, paper_size) -> canvas text id
+
+for color_option, section_y in SECTION_Y.items():
+    canvas.create_text(71.0, section_y, anchor="nw", text=f"{pricing.COLOR_LABELS[color_option]}:",
+                       fill="#000000", font=("Inter Bold", 20 * -1))
+    for row, paper_size in enumerate(pricing.PAPER_SIZES):
+        row_y = section_y + 34.0 + row * 24.0
+        canvas.create_text(87.0, row_y, anchor="nw", text=f"{paper_size} Size", fill="#000000",
+                           font=("Inter Bold", 14 * -1))
+        price_texts[(color_option, paper_size)] = canvas.create_text(
+            250.0, row_y, anchor="nw", text="-", fill="#000000", font=("Inter Bold", 14 * -1))
+
+
+def show_prices(matrix):
+    for key, text_id in price_texts.items():
+        price = matrix.get(key)
+        text = f"{pricing.peso(price)}/per page" if price is not None else "Not available"
+        canvas.itemconfigure(text_id, text=text)
 
-# Price rows
-canvas.create_text(87.0, 162.0, anchor="nw", text="Short Size                ₱3.00/per page", fill="#000000", font=("Inter Bold", 14 * -1))
-canvas.create_text(87.0, 187.0, anchor="nw", text="A4 Size                     ₱3.00/per page", fill="#000000", font=("Inter Bold", 14 * -1))
-canvas.create_text(87.0, 212.0, anchor="nw", text="Long Size                 ₱3.00/per page", fill="#000000", font=("Inter Bold", 14 * -1))
 
-canvas.create_text(86.0, 282.0, anchor="nw", text="Short Size                ₱7.00/per page", fill="#000000", font=("Inter Bold", 14 * -1))
-canvas.create_text(86.0, 306.0, anchor="nw", text="A4  Size                     ₱7.00/per page", fill="#000000", font=("Inter Bold", 14 * -1))
-canvas.create_text(86.0, 332.0, anchor="nw", text="Long  Size                 ₱8.00/per page", fill="#000000", font=("Inter Bold", 14 * -1))
+def load_prices():
+    worker.submit(pricing.load, on_done=show_prices, on_error=lambda err: print(f"Database Error: {err}"))
 
-canvas.create_text(88.0, 402.0, anchor="nw", text="Short Size                ₱10.00/per page", fill="#000000", font=("Inter Bold", 14 * -1))
-canvas.create_text(88.0, 425.0, anchor="nw", text="A4  Size                     ₱10.00/per page", fill="#000000", font=("Inter Bold", 14 * -1))
-canvas.create_text(88.0, 448.0, anchor="nw", text="Long  Size                 ₱15.00/per page", fill="#000000", font=("Inter Bold", 14 * -1))
+
+load_prices()
 
 # Example pictures
 image_image_3 = PhotoImage(file=relative_to_assets("image_8.png"))
@@ -109,6 +110,7 @@ image_6 = canvas.create_image(649.0, 316.0, image=image_image_6)
 # --- Back Button ---
 button_image_1 = PhotoImage(file=relative_to_assets("button_1.png"))
 button_1 = Button(
+    window,
     image=button_image_1,
     borderwidth=0,
     highlightthickness=0,
@@ -118,5 +120,10 @@ button_1 = Button(
 button_1.place(x=726.0, y=446.0, width=71.0, height=31.0)
 button_1.configure(text="Back", compound="center", fg="#FFFFFF", font=("Inter Bold", 15 * -1))
 
+
+# --- Called by the app shell each time the cached screen is shown again ---
+def on_show():
+    load_prices()
+
+
 window.resizable(False, False)
-window.mainloop()
@@ -0,0 +1,28 @@
+# Customer account reads shared by admin_user.py and loadtest.py (no Tk here).
+
+import db
+
+
+def fetch_user_details(user_id):
+    """A user's row plus print job stats and display defaults, or None if not found."""
+    user_info = db.fetch_one("user_details", (user_id,))
+    if not user_info:
+        return None
+    details = dict(user_info)
+
+    stats = db.fetch_one("user_stats", (user_id,))
+    if stats:
+        details.update(stats)
+
+    if details.get("created_at"):
+        details["member_since"] = details["created_at"].strftime("%Y-%m-%d")
+    else:
+        details["member_since"] = "-"
+
+    # Defaults for stats SUM() may return as NULL
+    details["total_jobs"] = details.get("total_jobs", 0)
+    details["completed_jobs"] = details.get("completed_jobs", 0)
+    details["voided_jobs"] = details.get("voided_jobs", 0)
+    details["total_pages"] = details.get("total_pages", 0) or 0
+    details["role"] = details.get("role", "User")  # no roles in the users table yet
+    return details
@@ -2,225 +2,212 @@
 # https://github.com/ParthJhadav/Tkinter-Designer
 
 from pathlib import Path
-import sys
-import subprocess
-from tkinter import Tk, Canvas, Button, PhotoImage, messagebox
-import mysql.connector
-from datetime import datetime
-
-# --- Add this block after imports ---
-admin_name = "Admin" # Default if not passed
-if len(sys.argv) > 1:
-    admin_name = sys.argv[1] # Get admin name from command-line argument
-else:
-    # Optional: Handle case where admin_name isn't passed as expected
-    print("Warning: Admin name not provided to dashboard.")
-    # messagebox.showwarning("Startup Error", "Admin name missing.")
-    # You might want to redirect to login or handle this more robustly
-
-
-
-def update_voided_and_users_count():
-    """Updates 'Voided Today' and 'Users' boxes based on the database records."""
-    conn = None
-    try:
-        conn = create_db_connection()
-        if not conn:
+from tkinter import Canvas, Button, PhotoImage, messagebox
+from datetime import datetime, timedelta
+import app
+import db
+import printjobs
+import reports
+import worker
+
+# --- Admin name comes from the session set by login.py ---
+admin_name = app.session["admin_name"]
+
+
+
+# --- Live Refresh Settings ---
+LIVE_REFRESH_MS = 5000  # poll for changed jobs this often while the screen is shown (0 = off)
+CHANGES_LIMIT = 200  # changed rows fetched per poll; a full batch polls again at once
+# updated_at is stamped when a statement runs, not when its transaction
+# commits, so each poll looks this far behind last_seen for late commits.
+CHANGES_OVERLAP = timedelta(seconds=10)
+REQUEST_ROWS = printjobs.STATUS_BOX_ROWS  # rows that fit in the STATUS PRINT REQUESTS box
+STATUS_PRIORITY = {"Pending": 1, "Approved": 2, "Voided": 3}
+STATUS_COLORS = {
+    "Approved": "#2E7D32",  # green
+    "Voided": "#D32F2F",  # red
+    "Pending": "#F9A825",  # yellow-ish for pending
+}
+
+request_rows = []  # jobs currently drawn in the status box, in display order
+rows_full = False  # True when more jobs exist below the last drawn row
+last_seen = None  # (updated_at, job_id) of the newest change applied so far
+applied_changes = set()  # (job_id, updated_at) applied within the overlap window
+refresh_busy = False  # a background refresh or poll is in flight
+live_job = None  # after() id of the next live refresh tick
+counters_day = None  # date the "today" counters were computed for
+
+
+def request_sort_key(request):
+    return STATUS_PRIORITY.get(str(request["status"]).capitalize(), 4), request["job_id"]
+
+
+# --- Background Tasks (run on a worker thread: no Tk calls here) ---
+def load_counters():
+    return printjobs.dashboard_counters()
+
+
+def load_dashboard():
+    """Counters first: rows changed after their server_time are picked up by the next poll."""
+    counters = load_counters()
+    rows = printjobs.dashboard_requests(REQUEST_ROWS)
+    return counters, rows
+
+
+def load_changes(cursor, applied):
+    """Changes after cursor, without those already applied; counters only if something is new."""
+    updated_at, job_id = cursor
+    changes = db.fetch_all("dashboard_changes", (updated_at, updated_at, job_id, CHANGES_LIMIT))
+    fresh = [change for change in changes if (change["job_id"], change["updated_at"]) not in applied]
+    counters = load_counters() if fresh else None
+    return changes, fresh, counters
+
+
+# --- Drawing (main thread) ---
+def update_counters(counters):
+    """Writes the Pending / Voided Today / Users numbers into their boxes."""
+    canvas.itemconfigure("pending_count", text=str(counters["pending_count"] or 0))
+    canvas.itemconfigure("voided_today_count", text=str(counters["voided_today"] or 0))
+    canvas.itemconfigure("users_count", text=str(counters["total_users"] or 0))
+
+
+def draw_requests():
+    """Writes request_rows into the existing row items (status only, no buttons)."""
+    for slot, items in enumerate(request_row_items):
+        if slot >= len(request_rows):
+            for item in items:
+                canvas.itemconfigure(item, text="")
+            continue
+        request = request_rows[slot]
+        status = str(request['status']).capitalize()
+        values = (request['job_id'], request['user_id'] or "N/A", request['pages'], status)
+        for item, value in zip(items, values):
+            canvas.itemconfigure(item, text=value)
+        canvas.itemconfigure(items[3], fill=STATUS_COLORS.get(status, "#333333"))
+
+
+def apply_changes(changes):
+    """Merges changed jobs into the drawn rows.
+
+    While the box is full, a row is only known to belong in it if it sorts
+    before the last drawn row; if a drawn row moves below that line the row
+    that replaces it is unknown, so the box is reloaded instead.
+    """
+    global request_rows, rows_full
+    boundary = request_sort_key(request_rows[-1]) if rows_full and request_rows else None
+    rows = {request["job_id"]: request for request in request_rows}
+    lost_row = False
+    for change in changes:
+        was_drawn = rows.pop(change["job_id"], None) is not None
+        if boundary is None or request_sort_key(change) < boundary:
+            rows[change["job_id"]] = change
+        elif was_drawn:
+            lost_row = True
+    merged = sorted(rows.values(), key=request_sort_key)
+    rows_full = rows_full or len(merged) > REQUEST_ROWS
+    request_rows = merged[:REQUEST_ROWS]
+    draw_requests()
+    return lost_row
+
+
+# --- Refresh ---
+def refresh_dashboard():
+    """Reloads the counters and the status box in the background."""
+    global refresh_busy
+    refresh_busy = True
+
+    def done(result):
+        global request_rows, rows_full, last_seen, refresh_busy, counters_day
+        refresh_busy = False
+        if not window.winfo_exists():
             return
-
-        cursor = conn.cursor()
-
-        # --- Count unique users who submitted at least one print job ---
-        cursor.execute("SELECT COUNT(DISTINCT user_id) FROM print_jobs")
-        total_users = cursor.fetchone()[0] or 0
-
-        # --- Count how many jobs were Declined today ---
-        today = datetime.now().date()
-        cursor.execute("""
-            SELECT COUNT(*) FROM print_jobs 
-            WHERE status = 'Voided' AND DATE(created_at) = %s
-        """, (today,))
-        voided_today = cursor.fetchone()[0] or 0
-
-        # --- Clear old counts ---
-        canvas.delete("users_count")
-        canvas.delete("voided_today_count")
-
-        # --- Draw updated text counts ---
-        # Users (bottom-right box)
-        canvas.create_text(
-            518, 235,  # position inside the "Users" box
-            text=str(total_users),
-            fill="#000000",
-            font=("Inter Bold", 20),
-            tags="users_count"
-        )
-
-        # Voided Today (middle-right box)
-        canvas.create_text(
-            520, 178,  # position inside the "Voided Today" box
-            text=str(voided_today),
-            fill="#000000",
-            font=("Inter Bold", 20),
-            tags="voided_today_count"
-        )
-
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", f"Failed to fetch counts: {err}")
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
-
-
-
-# --- Database Connection Function ---
-def create_db_connection():
-    """Creates and returns a connection to the MySQL database."""
-    try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="copy_corner_db"
-        )
-        return connection
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", f"Failed to connect to database: {err}")
-        return None
-
-def update_pending_approvals_count():
-    """Fetch and display the total number of pending requests."""
-    conn = None
-    try:
-        conn = create_db_connection()
-        if not conn:
+        counters, rows = result
+        last_seen = (counters["server_time"], 0)
+        applied_changes.clear()
+        counters_day = datetime.now().date()
+        request_rows = rows
+        rows_full = len(rows) >= REQUEST_ROWS
+        update_counters(counters)
+        draw_requests()
+
+    def failed(err):
+        global refresh_busy
+        refresh_busy = False
+        messagebox.showerror("Database Error", f"Failed to load the dashboard: {err}")
+
+    worker.submit(load_dashboard, on_done=done, on_error=failed)
+
+
+def poll_changes(cursor=None):
+    """Fetches the jobs changed since last_seen (minus CHANGES_OVERLAP) and applies the new ones."""
+    global refresh_busy
+    refresh_busy = True
+    if cursor is None:
+        cursor = (last_seen[0] - CHANGES_OVERLAP, 0)
+
+    def done(result):
+        global last_seen, refresh_busy
+        refresh_busy = False
+        if not window.winfo_exists():
             return
-
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM print_jobs WHERE status = 'Pending'")
-        pending_count = cursor.fetchone()[0]
-
-        # Update the number in the Pending Approvals box
-        # First, clear the old number if any (tagged for easy replace)
-        canvas.delete("pending_count")
-
-        # Then create a new text number (centered inside the box)
-        canvas.create_text(
-            360, 120,  # coordinates inside the box
-            text=str(pending_count),
-            fill="#000000",
-            font=("Inter Bold", 20),
-            tags="pending_count"
-        )
-
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", f"Failed to fetch pending count: {err}")
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+        changes, fresh, counters = result
+        if changes:
+            newest = changes[-1]
+            last_seen = max(last_seen, (newest["updated_at"], newest["job_id"]))
+        applied_changes.update((change["job_id"], change["updated_at"]) for change in fresh)
+        horizon = last_seen[0] - CHANGES_OVERLAP
+        applied_changes.difference_update([key for key in applied_changes if key[1] < horizon])
+        if counters is not None:
+            update_counters(counters)
+        if fresh and apply_changes(fresh):
+            refresh_dashboard()
+        elif len(changes) >= CHANGES_LIMIT:
+            newest = changes[-1]
+            poll_changes((newest["updated_at"], newest["job_id"]))  # more changes are waiting
+
+    def failed(err):
+        global refresh_busy
+        refresh_busy = False
+        print(f"Live refresh failed: {err}")
+
+    worker.submit(load_changes, cursor, frozenset(applied_changes), on_done=done, on_error=failed)
+
+
+def live_refresh_tick():
+    """Polls for changes every LIVE_REFRESH_MS while the dashboard is visible."""
+    global live_job
+    live_job = None
+    if not window.winfo_exists():
+        return
+    if window.winfo_viewable() and not refresh_busy:
+        if last_seen is None or counters_day != datetime.now().date():
+            refresh_dashboard()  # first load, or the "today" counters rolled over
+        else:
+            poll_changes()
+    live_job = window.after(LIVE_REFRESH_MS, live_refresh_tick)
+
+
+def start_live_refresh():
+    global live_job
+    if LIVE_REFRESH_MS and live_job is None:
+        live_job = window.after(LIVE_REFRESH_MS, live_refresh_tick)
 
 
 # --- Function to update a job's status in the database ---
 def update_job_status(job_id, new_status):
     """Updates the status of a specific job_id in the database and refreshes UI instantly."""
-    conn = None
     try:
-        conn = create_db_connection()
-        if not conn:
-            return
-
-        cursor = conn.cursor()
-        sql_query = "UPDATE print_jobs SET status = %s WHERE job_id = %s"
-        cursor.execute(sql_query, (new_status, job_id))
-        conn.commit()
+        reports.set_job_status(job_id, new_status)
 
         # ✅ Show confirmation popup
         messagebox.showinfo("Success", f"Job #{job_id} has been {new_status.lower()}.")
 
-        # ✅ Refresh request table to immediately show new status text
-        fetch_and_display_requests()
+        # ✅ Pick up the new status text right away instead of waiting for the next tick
+        if last_seen is not None and not refresh_busy:
+            poll_changes()
 
-    except mysql.connector.Error as err:
+    except db.Error as err:
         messagebox.showerror("Database Error", f"Failed to update status: {err}")
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
-
-
-# --- Function to fetch and display all print requests ---
-def fetch_and_display_requests():
-    """Fetches all print requests and displays them in the GUI (status only, no buttons)."""
-    # --- Clear previous text rows ---
-    canvas.delete("request_row")
-
-    conn = None
-    try:
-        conn = create_db_connection()
-        if not conn:
-            return
-
-        cursor = conn.cursor(dictionary=True)
-        sql_query = """
-            SELECT job_id, user_id, pages, status
-            FROM print_jobs
-            ORDER BY 
-                CASE 
-                    WHEN status = 'Pending' THEN 1
-                    WHEN status = 'Approved' THEN 2
-                    WHEN status = 'Voided' THEN 3
-                    ELSE 4
-                END,
-                job_id ASC
-        """
-        cursor.execute(sql_query)
-        requests = cursor.fetchall()
-
-        y_pos = 345
-        for request in requests:
-            job_id = request['job_id']
-            user_id = request['user_id'] or "N/A"
-            pages = request['pages']
-            status = str(request['status']).capitalize()
-
-            # Display basic row data
-            canvas.create_text(286, y_pos, text=job_id, anchor="nw", fill="#333333",
-                                font=("Inter", 12), tags="request_row")
-            canvas.create_text(360, y_pos, text=user_id, anchor="nw", fill="#333333",
-                                font=("Inter", 12), tags="request_row")
-            canvas.create_text(484, y_pos, text=pages, anchor="nw", fill="#333333",
-                                font=("Inter", 12), tags="request_row")
-
-            # --- Status coloring ---
-            if status == "Approved":
-                color = "#2E7D32"  # green
-            elif status == "Voided":
-                color = "#D32F2F"  # red
-            elif status == "Pending":
-                color = "#F9A825"  # yellow-ish for pending
-            else:
-                color = "#333333"
-
-            # Draw status text only (no buttons)
-            canvas.create_text(
-                545, y_pos, text=status, anchor="nw",
-                fill=color, font=("Inter Bold", 12),
-                tags="request_row"
-            )
-
-            y_pos += 30  # move down per row
-
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", f"Failed to fetch requests: {err}")
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
-
-            update_pending_approvals_count()
-
 
 
 # --- Rounded Rectangle Function ---
@@ -235,26 +222,21 @@ def round_rectangle(canvas, x1, y1, x2, y2, r=15, **kwargs):
 
 # --- Sidebar Buttons with Navigation ---
 def open_admin_user():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_user.py"])
+    app.show("admin_user")
 
 def open_admin_print():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_print.py"])
+    app.show("admin_print")
 
 def open_admin_report():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_report.py"])
+    app.show("admin_report")
 
 def open_admin_notification():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_notification.py"])
+    app.show("admin_notification")
 
 # --- Logout Function ---
 def logout():
     messagebox.showinfo("Logged Out", "Logout successful!")
-    subprocess.Popen([sys.executable, "login.py"])
-    window.destroy()
+    app.logout()
 
 def create_rounded_menu_button(canvas, x, y, w, h, text, command=None):
     rect = round_rectangle(canvas, x, y, x + w, y + h, r=10, fill="#FFFFFF", outline="#000000", width=1)
@@ -288,7 +270,7 @@ def relative_to_assets(path: str) -> Path:
     return ASSETS_PATH / Path(path)
 
 
-window = Tk()
+window = app.create_window()
 window_width = 905
 window_height = 534
 
@@ -377,10 +359,35 @@ canvas.create_rectangle(774.0, 40.0, 860.0, 75.0, fill="#FFFFFF", outline="#0000
 canvas.create_text(801.0, 50.0, anchor="nw", text="Filter", fill="#000000", font=("Inter Bold", -12))
 canvas.create_text(686.0, 50.0, anchor="nw", text="Data Range", fill="#000000", font=("Inter Bold", -12))
 
-# --- Populate table on load ---
-fetch_and_display_requests()
-update_pending_approvals_count()
-update_voided_and_users_count()
+# --- Counter and request row items (created once, updated in place) ---
+canvas.create_text(360, 120, text="", fill="#000000", font=("Inter Bold", 20), tags="pending_count")
+canvas.create_text(520, 178, text="", fill="#000000", font=("Inter Bold", 20), tags="voided_today_count")
+canvas.create_text(518, 235, text="", fill="#000000", font=("Inter Bold", 20), tags="users_count")
+
+request_row_items = []
+for slot in range(REQUEST_ROWS):
+    y_pos = 345 + slot * 30  # move down per row
+    request_row_items.append([
+        canvas.create_text(286, y_pos, text="", anchor="nw", fill="#333333",
+                           font=("Inter", 12), tags="request_row"),
+        canvas.create_text(360, y_pos, text="", anchor="nw", fill="#333333",
+                           font=("Inter", 12), tags="request_row"),
+        canvas.create_text(484, y_pos, text="", anchor="nw", fill="#333333",
+                           font=("Inter", 12), tags="request_row"),
+        canvas.create_text(545, y_pos, text="", anchor="nw", fill="#333333",
+                           font=("Inter Bold", 12), tags="request_row"),
+    ])
+
+# --- Populate on load, then keep it live ---
+refresh_dashboard()
+start_live_refresh()
+
+
+# --- Called by the app shell each time the cached screen is shown again ---
+def on_show():
+    if not refresh_busy:
+        refresh_dashboard()
+    start_live_refresh()
+
 
 window.resizable(False, False)
-window.mainloop()
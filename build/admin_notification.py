@@ -3,55 +3,31 @@
 
 
 from pathlib import Path
-import sys
-import subprocess
-import mysql.connector
 import tkinter as tk
 # Explicit imports to satisfy Flake8
-from tkinter import Tk, Canvas, Entry, Text, Button, PhotoImage, messagebox, ttk, Listbox
+from tkinter import Canvas, Entry, Text, Button, PhotoImage, messagebox, ttk, Listbox
+import app
+import db
+import inbox
+import userindex
+import worker
 
-admin_name = "Admin" # Default if not passed
-if len(sys.argv) > 1:
-    admin_name = sys.argv[1] # Get admin name from command-line argument
-else:
-    print("Warning: Admin name not provided to notification script.")
+admin_name = app.session["admin_name"]
 
 
 # --- Global Variables ---
-all_users = [] # To store fetched users for autocomplete
 selected_user_id = None # To store the ID if a single user is selected
+SUGGESTION_LIMIT = 8  # rows in the autocomplete Listbox
+SUGGEST_DEBOUNCE_MS = 150  # wait for typing to pause before searching
+suggest_job = None  # after() id of the pending debounced search
 
-# --- Database Connection & User Fetching ---
-def get_db_connection():
-    try:
-        return mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="copy_corner_db"
-        )
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", f"Connection failed: {err}")
-        return None
-
+# --- User Fetching ---
 def fetch_users_for_autocomplete():
-    """Fetches user_id and username from the users table for autocomplete."""
-    global all_users
-    conn = get_db_connection()
-    if not conn: return []
-
+    """Loads the shared user index used for autocomplete (once per process)."""
     try:
-        cursor = conn.cursor(dictionary=True)
-        # Fetching id and username
-        query = "SELECT user_id, username FROM users ORDER BY username ASC"
-        cursor.execute(query)
-        all_users = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return all_users
-    except mysql.connector.Error as err:
+        userindex.load()
+    except db.Error as err:
         messagebox.showerror("Database Error", f"Error fetching users: {err}")
-        return []
 
 # --- UI Interaction Functions ---
 
@@ -69,22 +45,28 @@ def toggle_user_entry():
         selected_user_id = None # Reset selected user
 
 def update_user_suggestions(event=None):
-    """Filters users based on entry and updates the listbox."""
-    global selected_user_id
-    search_term = user_entry.get().lower()
-    user_listbox.delete(0, tk.END) # Clear previous suggestions
+    """Debounces typing in the user entry before searching."""
+    global selected_user_id, suggest_job
     selected_user_id = None # Reset if user is typing again
+    if suggest_job is not None:
+        window.after_cancel(suggest_job)
+    suggest_job = window.after(SUGGEST_DEBOUNCE_MS, show_user_suggestions)
+
+def show_user_suggestions():
+    """Fills the listbox with the best matches from the user index."""
+    global suggest_job
+    suggest_job = None
+    search_term = user_entry.get()
 
-    if not search_term:
+    if not search_term.strip():
         hide_suggestions()
         return
 
-    matches = [user for user in all_users if search_term in user['username'].lower()]
+    matches = userindex.search(search_term, SUGGESTION_LIMIT)
 
     if matches:
-        for user in matches:
-            # Store both username and id, display username
-            user_listbox.insert(tk.END, f"{user['username']} (ID: {user['user_id']})")
+        # Store both username and id, display username
+        set_listbox_items([f"{user['username']} (ID: {user['user_id']})" for user in matches])
         # Position listbox below entry
         entry_x = user_entry.winfo_x()
         entry_y = user_entry.winfo_y()
@@ -94,6 +76,17 @@ def update_user_suggestions(event=None):
     else:
         hide_suggestions()
 
+def set_listbox_items(items):
+    """Updates the listbox, rewriting only the entries that changed."""
+    current = user_listbox.get(0, tk.END)
+    same = 0
+    while same < min(len(current), len(items)) and current[same] == items[same]:
+        same += 1
+    if same < len(current):
+        user_listbox.delete(same, tk.END)
+    for item in items[same:]:
+        user_listbox.insert(tk.END, item)
+
 def select_user_from_list(event=None):
     """Puts the selected username in the entry and stores the ID."""
     global selected_user_id
@@ -137,10 +130,10 @@ def send_notification():
         # More robust check: ensure the entered text corresponds to a selected ID
         if selected_user_id is None:
              # Check if the current text matches exactly one user (case-insensitive)
-             matches = [user for user in all_users if user['username'].lower() == user_text.lower()]
-             if len(matches) == 1:
-                 select_user_id = matches[0]['user_id'] # Use the matched ID
-                 print(f"Assuming user: {matches[0]['username']} (ID: {select_user_id})")
+             match = userindex.find_username(user_text)
+             if match:
+                 select_user_id = match['user_id'] # Use the matched ID
+                 print(f"Assuming user: {match['username']} (ID: {select_user_id})")
              else:
                 messagebox.showerror("Input Error", "Please select a valid user from the suggestions or ensure the username is exact.")
                 return
@@ -157,41 +150,15 @@ def send_notification():
 
     # --- Sending Logic (Placeholder) ---
     try:
-        conn = get_db_connection()
-        if not conn: return
-        cursor = conn.cursor()
-
         if send_to == "single":
             # Insert notification for a single user
-            sql = """
-                            INSERT INTO notifications (user_id, subject, message)
-                            VALUES (%s, %s, %s)
-                        """
-            cursor.execute(sql, (select_user_id, subject, message))
-            conn.commit()
+            inbox.send_to_user(select_user_id, subject, message)
             messagebox.showinfo("Success", f"Notification sent to user ID {select_user_id}!")
 
         elif send_to == "all":
-             # Fetch all user IDs first
-             cursor.execute("SELECT user_id FROM users")
-             user_ids = [row[0] for row in cursor.fetchall()]
-
-             if not user_ids:
-                 messagebox.showwarning("No Users", "There are no users to send notifications to.")
-                 return
-
-             # Prepare data for bulk insert
-             sql = """
-                             INSERT INTO notifications (user_id, subject, message)
-                             VALUES (%s, %s, %s)
-                         """
-             data_to_insert = [(user_id, subject, message) for user_id in user_ids]
-             cursor.executemany(sql, data_to_insert)
-             conn.commit()
-             messagebox.showinfo("Success", f"Notification sent to all {len(user_ids)} users!")
-
-        cursor.close()
-        conn.close()
+             # One broadcast row; users get a receipt only when they read it
+             inbox.broadcast(subject, message)
+             messagebox.showinfo("Success", "Notification sent to all users!")
 
         # Clear fields after sending
         send_to_var.set(None) # Reset radio
@@ -201,7 +168,7 @@ def send_notification():
         toggle_user_entry() # Disable user entry if needed
 
 
-    except mysql.connector.Error as err:
+    except db.Error as err:
         messagebox.showerror("Database Error", f"Failed to send notification: {err}")
     except Exception as e:
          messagebox.showerror("Error", f"An unexpected error occurred: {e}")
@@ -219,33 +186,23 @@ def round_rectangle(canvas, x1, y1, x2, y2, r=15, **kwargs):
 
 # --- Sidebar Buttons with Navigation ---
 def open_admin_dashboard():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_dashboard.py", admin_name])
+    app.show("admin_dashboard")
 
-# def go_back_to_dashboard():
-#     """Opens the admin dashboard, passing the admin name back."""
-#     window.destroy()
-#     # Pass the current admin_name back to the dashboard script
-#     subprocess.Popen([sys.executable, "admin_dashboard.py", admin_name])
 
 
 def open_admin_print():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_print.py", admin_name])
+    app.show("admin_print")
 
 def open_admin_report():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_report.py", admin_name])
+    app.show("admin_report")
 
 def open_admin_user():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_user.py", admin_name])
+    app.show("admin_user")
 
 # --- Logout Function ---
 def logout():
     messagebox.showinfo("Logged Out", "Logout successful!")
-    subprocess.Popen([sys.executable, "login.py"])
-    window.destroy()
+    app.logout()
 
 def create_rounded_menu_button(canvas, x, y, w, h, text, command=None):
     rect = round_rectangle(canvas, x, y, x + w, y + h, r=10, fill="#FFFFFF", outline="#000000", width=1)
@@ -283,7 +240,7 @@ def relative_to_assets(path: str) -> Path:
 
 
 
-window = Tk()
+window = app.create_window()
 window_width = 905
 window_height = 567
 
@@ -537,5 +494,11 @@ create_rounded_menu_button(canvas, 89, 462, 111, 38, "Logout", logout)
 fetch_users_for_autocomplete() # Fetch users when the app starts
 toggle_user_entry() # Set initial state of user entry based on default radio
 
-window.resizable(False, False)
-window.mainloop()
\ No newline at end of file
+
+# --- Called by the app shell each time the cached screen is shown again ---
+def on_show():
+    # Users registered or edited on other PCs become suggestions too
+    worker.submit(userindex.refresh, on_error=lambda err: print(f"Could not refresh users: {err}"))
+
+
+window.resizable(False, False)
\ No newline at end of file
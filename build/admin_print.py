@@ -3,272 +3,191 @@
 
 
 from pathlib import Path
-import sys
-import subprocess
+import app
+import db
+import filestore
+import pricing
+import printjobs
+import reports
+import worker
 # from tkinter import *
 # Explicit imports to satisfy Flake8
-from tkinter import Tk, Canvas, Entry, Text, Button, PhotoImage, messagebox, ttk
+from tkinter import Canvas, Entry, Text, Button, PhotoImage, messagebox, filedialog, ttk
 import tkinter as tk
 
 
-def fetch_print_jobs():
-    import mysql.connector
-    try:
-        conn = mysql.connector.connect(
-            host="localhost",
-            user="root",  # change if needed
-            password="",  # add your password if any
-            database="copy_corner_db"
+TABLE_TOP = 194  # Y coordinate of the first row
+TABLE_BOTTOM = 527  # rows are never drawn below this line
+ROW_HEIGHT = 25
+STATUS_SHORT = {"Pending": "P", "Approved": "A", "Voided": "V", "Completed": "C"}
+COLOR_SHORT = {"Black & White": "B&W", "Partially Colored": "PC", "Color": "C"}
+class JobTable:
+    """
+    Virtualized print job table: only the rows that fit between TABLE_TOP and
+    TABLE_BOTTOM are drawn, their canvas items are created once and reused
+    while scrolling, and pages are fetched from the database on demand.
+    """
+
+    COLUMNS = (261, 307, 385, 430, 465, 502, 536, 575)  # X of each column
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.visible_rows = (TABLE_BOTTOM - TABLE_TOP) // ROW_HEIGHT
+        self.jobs = []  # every job loaded so far for the current filter
+        self.offset = 0  # index in self.jobs of the first visible row
+        self.exhausted = False  # True once the last page has been fetched
+        self.filters = ("", "All")
+        self.selected_job = [None]  # shared with the action buttons
+        self.highlight = canvas.create_rectangle(
+            255, 0, 650, 0, fill="#CCE5FF", outline="#CCE5FF", state="hidden", tags="highlight"
+        )
+        self.slots = []
+        for slot in range(self.visible_rows):
+            y = TABLE_TOP + slot * ROW_HEIGHT
+            self.slots.append([
+                canvas.create_text(x, y, text="", fill="#000000", font=("Inter Bold", 12 * -1),
+                                   anchor="nw", state="hidden", tags=("job_row", f"row_{slot}"))
+                for x in self.COLUMNS
+            ])
+
+    def reset(self, username_filter="", status_filter="All"):
+        """Starts over from the first page with new filters."""
+        self.filters = (username_filter, status_filter)
+        self.jobs = []
+        self.offset = 0
+        self.exhausted = False
+        self.selected_job[0] = None
+        self.load_more()
+        self.render()
+
+    def load_more(self):
+        """Fetches the next keyset page after the last loaded job."""
+        if self.exhausted:
+            return
+        after = None
+        if self.jobs:
+            after = (self.jobs[-1]["created_at"], self.jobs[-1]["job_id"])
+        page = printjobs.fetch_print_jobs(*self.filters, after=after)
+        self.jobs.extend(page)
+        if len(page) < printjobs.JOB_PAGE_SIZE:
+            self.exhausted = True
+
+    def scroll(self, rows):
+        """Moves the visible window by `rows`, fetching more jobs when near the end."""
+        new_offset = max(0, self.offset + rows)
+        while not self.exhausted and new_offset + 2 * self.visible_rows > len(self.jobs):
+            loaded = len(self.jobs)
+            self.load_more()
+            if len(self.jobs) == loaded:
+                break
+        self.offset = max(0, min(new_offset, len(self.jobs) - self.visible_rows))
+        self.render()
+
+    def job_at(self, slot):
+        index = self.offset + slot
+        return self.jobs[index] if 0 <= index < len(self.jobs) else None
+
+    def render(self):
+        """Writes the visible jobs into the existing row items."""
+        for slot, items in enumerate(self.slots):
+            job = self.job_at(slot)
+            if job is None:
+                for item in items:
+                    self.canvas.itemconfigure(item, text="", state="hidden")
+                continue
+            for item, value in zip(items, self.row_values(job)):
+                self.canvas.itemconfigure(item, text=value, state="normal")
+        self.move_highlight()
+
+    def move_highlight(self, slot=None, color="#CCE5FF"):
+        """Draws the highlight behind `slot`, or behind the selected job if it is visible."""
+        if slot is None:
+            selected = self.selected_job[0]
+            visible = [self.job_at(s) for s in range(self.visible_rows)]
+            if selected is None or selected not in visible:
+                self.canvas.itemconfigure(self.highlight, state="hidden")
+                return
+            slot = visible.index(selected)
+        y = TABLE_TOP + slot * ROW_HEIGHT
+        self.canvas.coords(self.highlight, 255, y - 2, 650, y + 20)
+        self.canvas.itemconfigure(self.highlight, fill=color, outline=color, state="normal")
+        self.canvas.tag_lower(self.highlight)
+
+    @staticmethod
+    def row_values(job):
+        color_option = job["color_option"] or "-"
+        color = COLOR_SHORT.get(color_option, color_option)
+        status_text = job["status"] or "-"
+        submitted = job["created_at"].strftime("%m/%d/%y %H:%M") if job["created_at"] else "-"
+        return (
+            f"#{job['job_id']}",
+            job["username"] or "-",
+            job["file_name"] or f"File {job['file_id'] or '-'}",
+            job["pages"] or "-",
+            job["paper_size"] or "-",
+            color,
+            STATUS_SHORT.get(status_text, status_text),
+            submitted,
         )
-        cursor = conn.cursor(dictionary=True)
-        query = """
-            SELECT 
-                pj.job_id, 
-                u.username, 
-                f.file_id,
-                f.file_name,
-                f.file_type,
-                pj.pages, 
-                pj.paper_size,
-                pj.color_option, 
-                pj.copies, 
-                pj.payment_method, 
-                pj.total_amount,
-                pj.status, 
-                pj.notes, 
-                pj.created_at
-            FROM print_jobs pj
-            LEFT JOIN users u ON pj.user_id = u.user_id
-            LEFT JOIN files f ON pj.file_id = f.file_id
-            ORDER BY pj.created_at DESC
-        """
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return rows
-    except mysql.connector.Error as err:
-        print(f"Database Error: {err}")
-        return []
 
 
 def display_print_jobs(canvas):
     """
-    Fetches print job data from database and displays it
+    Fetches the first page of print jobs and displays it
     in the Canvas table area.
     """
-    jobs = fetch_print_jobs()
-    canvas.delete("job_row")
-
-    y_position = 194  # starting Y coordinate for first row
-    job_widgets = []  # keep track of row item IDs
-
-    for index, job in enumerate(jobs):
-        job_id = job["job_id"]
-        username = job["username"] or "-"
-        file_id = job["file_id"] or "-"
-        pages = job["pages"] or "-"
-        size = job["paper_size"] or "-"
-        color_option = job["color_option"] or "-"
-        if color_option == "Black & White":
-            color = "B&W"
-        elif color_option == "Color":
-            color = "C"
-        else:
-            color = color_option
-        status_text = job["status"] or "-"
-        if status_text == "Pending":
-            status = "P"
-        elif status_text == "Approved":
-            status = "A"
-        else:
-            status = "V"
-
-        submitted = (
-            job["created_at"].strftime("%m/%d/%y %H:%M")
-            if job["created_at"]
-            else "-"
-        )
+    job_table.reset()
 
-        # Combine all row text items with a shared tag per row
-        row_tag = f"row_{index}"
-
-        row_items = [
-            canvas.create_text(261, y_position, text=f"#{job_id}", fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag)),
-            canvas.create_text(307, y_position, text=username, fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag)),
-            canvas.create_text(385, y_position, text=(job["file_name"] or f"File {file_id}"), fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag)),
-            canvas.create_text(430, y_position, text=pages, fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag)),
-            canvas.create_text(465, y_position, text=size, fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag)),
-            canvas.create_text(502, y_position, text=color, fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag)),
-            canvas.create_text(536, y_position, text=status, fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag)),
-            canvas.create_text(575, y_position, text=submitted, fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag)),
-        ]
-
-        job_widgets.append(row_items)
-        y_position += 25
-
-    enable_job_selection(canvas, jobs)
-
-
-def enable_job_selection(canvas, jobs):
-    """Enable clicking and hovering on rows."""
-    selected_box = [None]
-    selected_job = [None]
-
-    def highlight_row(index, color):
-        """Draw a background rectangle for hover or selection."""
-        y = 194 + (index * 25)
-        if selected_box[0]:
-            canvas.delete(selected_box[0])
-        selected_box[0] = canvas.create_rectangle(
-            255, y - 2, 650, y + 20,
-            fill=color, outline=color, tags="highlight"
-        )
-        canvas.tag_lower(selected_box[0])
 
-    def on_enter(event):
+def enable_job_selection(canvas, table):
+    """Enable clicking, hovering and mouse-wheel scrolling on rows."""
+
+    def slot_of_current():
         clicked = canvas.find_withtag("current")
         if not clicked:
-            return
-        tags = canvas.gettags(clicked[0])
-        for t in tags:
+            return None
+        for t in canvas.gettags(clicked[0]):
             if t.startswith("row_"):
-                index = int(t.split("_")[1])
-                highlight_row(index, "#E0F0FF")
-                canvas.config(cursor="hand2")  # pointer cursor
-                return
+                return int(t.split("_")[1])
+        return None
+
+    def on_enter(event):
+        slot = slot_of_current()
+        if slot is not None and table.job_at(slot) is not None:
+            if table.job_at(slot) is not table.selected_job[0]:
+                table.move_highlight(slot, "#E0F0FF")
+            canvas.config(cursor="hand2")  # pointer cursor
 
     def on_leave(event):
         canvas.config(cursor="")
-        if selected_job[0] is None:
-            canvas.delete("highlight")
+        table.move_highlight()
 
     def on_click(event):
-        clicked = canvas.find_withtag("current")
-        if not clicked:
-            return
-        tags = canvas.gettags(clicked[0])
-        for t in tags:
-            if t.startswith("row_"):
-                index = int(t.split("_")[1])
-                selected_job[0] = jobs[index]
-                highlight_row(index, "#CCE5FF")
-                update_job_details(canvas, jobs[index])
-                selected_job[0] = jobs[index]
-                return
-
+        slot = slot_of_current()
+        job = table.job_at(slot) if slot is not None else None
+        if job is not None:
+            table.selected_job[0] = job
+            table.move_highlight()
+            update_job_details(canvas, job)
 
+    def on_mousewheel(event):
+        # Only scroll when the pointer is over the table area
+        if 255 <= event.x <= 650 and TABLE_TOP <= event.y <= TABLE_BOTTOM:
+            table.scroll(-3 if event.delta > 0 else 3)
 
     # Bind events
     canvas.tag_bind("job_row", "<Enter>", on_enter)
     canvas.tag_bind("job_row", "<Leave>", on_leave)
     canvas.tag_bind("job_row", "<Button-1>", on_click)
+    canvas.bind("<MouseWheel>", on_mousewheel)
+
+    add_print_job_buttons(canvas, table.selected_job)
 
-    add_print_job_buttons(canvas, selected_job)
 
 def filter_print_jobs(canvas, username_filter, status_filter):
-    import mysql.connector
     try:
-        conn = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="copy_corner_db"
-        )
-        cursor = conn.cursor(dictionary=True)
-
-        query = """
-            SELECT 
-                pj.job_id, 
-                u.username, 
-                f.file_id,
-                f.file_name,
-                f.file_type,
-                pj.pages, 
-                pj.paper_size,
-                pj.color_option, 
-                pj.copies, 
-                pj.payment_method, 
-                pj.total_amount,
-                pj.status, 
-                pj.notes, 
-                pj.created_at
-            FROM print_jobs pj
-            LEFT JOIN users u ON pj.user_id = u.user_id
-            LEFT JOIN files f ON pj.file_id = f.file_id
-            WHERE 1=1
-        """
-
-        params = []
-
-        if username_filter:
-            query += " AND u.username LIKE %s"
-            params.append(f"%{username_filter}%")
-
-        if status_filter and status_filter != "All":
-            query += " AND pj.status = %s"
-            params.append(status_filter)
-
-        query += " ORDER BY pj.created_at DESC"
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-
-        cursor.close()
-        conn.close()
-
-        canvas.delete("job_row")
-        y_position = 194
-
-        for index, job in enumerate(rows):
-            job_id = job["job_id"]
-            username = job["username"] or "-"
-            file_id = job["file_id"] or "-"
-            pages = job["pages"] or "-"
-            size = job["paper_size"] or "-"
-            color_option = job["color_option"] or "-"
-            color = "B&W" if color_option == "Black & White" else "C" if color_option == "Color" else color_option
-            status_text = job["status"] or "-"
-            status = {
-                "Pending": "P",
-                "Approved": "A",
-                "Voided": "V",
-                "Completed": "C"
-            }.get(status_text, status_text)
-            submitted = (
-                job["created_at"].strftime("%m/%d/%y %H:%M") if job["created_at"] else "-"
-            )
-
-            row_tag = f"row_{index}"
-
-            canvas.create_text(261, y_position, text=f"#{job_id}", fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag))
-            canvas.create_text(307, y_position, text=username, fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag))
-            canvas.create_text(385, y_position, text=(job["file_name"] or f"File {file_id}"), fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag))
-            canvas.create_text(430, y_position, text=pages, fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag))
-            canvas.create_text(465, y_position, text=size, fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag))
-            canvas.create_text(502, y_position, text=color, fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag))
-            canvas.create_text(536, y_position, text=status, fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag))
-            canvas.create_text(575, y_position, text=submitted, fill="#000000",
-                               font=("Inter Bold", 12 * -1), anchor="nw", tags=("job_row", row_tag))
-            y_position += 25
-
-        enable_job_selection(canvas, rows)
-
-    except mysql.connector.Error as err:
+        job_table.reset(username_filter, status_filter)
+    except db.Error as err:
         messagebox.showerror("Database Error", f"Error while filtering:\n{err}")
 
 
@@ -281,6 +200,7 @@ def update_job_details(canvas, job):
         f"User: {job['username'] or '-'}",
         f"File: {job['file_name'] or '-'}",
         f"Pages: {job['pages'] or '-'}",
+        f"Amount: {pricing.peso(job['total_amount']) if job['total_amount'] is not None else '-'}",
         f"Status: {job['status'] or '-'}",
         f"Submitted: {job['created_at'].strftime('%Y-%m-%d %H:%M') if job['created_at'] else '-'}",
     ]
@@ -300,35 +220,21 @@ def add_print_job_buttons(canvas, selected_job_ref):
 
     def change_status(new_status):
         """Approve or Void the selected job and update DB + UI."""
-        import mysql.connector
         job = selected_job_ref[0]
         if not job:
             messagebox.showwarning("No Selection", "Please select a job first.")
             return
 
         try:
-            conn = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",
-                database="copy_corner_db"
-            )
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE print_jobs SET status = %s WHERE job_id = %s",
-                (new_status, job["job_id"])
-            )
-            conn.commit()
-            cursor.close()
-            conn.close()
-
-            # Update local data and UI instantly
+            reports.set_job_status(job["job_id"], new_status)
+
+            # Update local data and UI instantly (the row items are redrawn in place)
             job["status"] = new_status
             update_job_details(canvas, job)
-            display_print_jobs(canvas)
+            job_table.render()
             messagebox.showinfo("Success", f"Request marked as {new_status}.")
 
-        except mysql.connector.Error as err:
+        except db.Error as err:
             messagebox.showerror("Database Error", f"Error updating status:\n{err}")
 
     # def download_file():
@@ -339,56 +245,59 @@ def add_print_job_buttons(canvas, selected_job_ref):
     #     messagebox.showinfo("Download", f"Downloading file for Job #{job['job_id']}...")
 
     def download_file():
-        import mysql.connector
-        import os
-        import shutil
-        from tkinter import filedialog
-
         job = selected_job_ref[0]
         if not job:
             messagebox.showwarning("No Selection", "Please select a job first.")
             return
+        if download_progress["active"]:
+            messagebox.showinfo("Download", "A download is already in progress.")
+            return
 
         try:
-            conn = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",
-                database="copy_corner_db"
-            )
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("SELECT file_name, file_path FROM files WHERE file_id = %s", (job["file_id"],))
-            file_record = cursor.fetchone()
-            cursor.close()
-            conn.close()
-
-            if not file_record:
-                messagebox.showerror("Error", "File record not found in the database.")
-                return
+            file_record = db.fetch_one("file_by_id", (job["file_id"],))
+        except db.Error as err:
+            messagebox.showerror("Database Error", f"Error accessing file:\n{err}")
+            return
 
-            file_name = file_record["file_name"]
-            file_path = file_record["file_path"]
+        if not file_record:
+            messagebox.showerror("Error", "File record not found in the database.")
+            return
 
-            if not os.path.exists(file_path):
-                messagebox.showerror("Error", f"File not found: {file_path}")
-                return
+        save_path = filedialog.asksaveasfilename(
+            initialfile=file_record["file_name"],
+            title="Save File As",
+            defaultextension="",
+            filetypes=[("All Files", "*.*")]
+        )
+        if not save_path:
+            return
 
-            # Ask user where to save the file
-            save_path = filedialog.asksaveasfilename(
-                initialfile=file_name,
-                title="Save File As",
-                defaultextension="",
-                filetypes=[("All Files", "*.*")]
-            )
+        # Copy in chunks on a worker thread; the UI polls the byte counts.
+        download_progress.update(active=True, done=0, total=file_record["size"] or 0)
 
-            if save_path:
-                shutil.copy(file_path, save_path)
-                messagebox.showinfo("Download Complete", f"File saved to:\n{save_path}")
+        def report(done, total):  # called on the worker thread
+            download_progress["done"], download_progress["total"] = done, total
 
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", f"Error accessing file:\n{err}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Unexpected error:\n{e}")
+        def finished(_):
+            download_progress["active"] = False
+            canvas.itemconfigure(progress_text, text="")
+            messagebox.showinfo("Download Complete", f"File saved to:\n{save_path}")
+
+        def failed(err):
+            download_progress["active"] = False
+            canvas.itemconfigure(progress_text, text="")
+            messagebox.showerror("Error", f"Download failed:\n{err}")
+
+        worker.submit(filestore.copy_out, file_record, save_path, report, on_done=finished, on_error=failed)
+        show_download_progress()
+
+    def show_download_progress():
+        if not download_progress["active"]:
+            return
+        done, total = download_progress["done"], download_progress["total"]
+        percent = f"{done * 100 // total}%" if total else f"{done // 1024} KB"
+        canvas.itemconfigure(progress_text, text=f"Downloading... {percent}")
+        window.after(100, show_download_progress)
 
     def start_print():
         job = selected_job_ref[0]
@@ -404,6 +313,10 @@ def add_print_job_buttons(canvas, selected_job_ref):
             return
         messagebox.showinfo("Message", f"Opening chat with {job['username']}...")
 
+    download_progress = {"active": False, "done": 0, "total": 0}
+    progress_text = canvas.create_text(753, 522, anchor="n", text="", fill="#000000",
+                                       font=("Inter Bold", 11 * -1))
+
     # Helper to bind clickable areas on canvas
     def make_clickable(x1, y1, x2, y2, command):
         rect_id = canvas.create_rectangle(x1, y1, x2, y2, outline="", fill="", tags="btn_area")
@@ -430,23 +343,19 @@ def add_print_job_buttons(canvas, selected_job_ref):
 
 # --- Sidebar Buttons with Navigation ---
 def open_admin_user():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_user.py"])
+    app.show("admin_user")
 
 
 def open_admin_dashboard():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_dashboard.py"])
+    app.show("admin_dashboard")
 
 
 def open_admin_report():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_report.py"])
+    app.show("admin_report")
 
 
 def open_admin_notification():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_notification.py"])
+    app.show("admin_notification")
 
 
 def round_rectangle(canvas, x1, y1, x2, y2, r=15, **kwargs):
@@ -483,8 +392,7 @@ def create_rounded_menu_button(canvas, x, y, w, h, text, command=None):
 # --- Logout Function ---
 def logout():
     messagebox.showinfo("Logged Out", "Logout successful!")
-    subprocess.Popen([sys.executable, "login.py"])
-    window.destroy()
+    app.logout()
 
 
 OUTPUT_PATH = Path(__file__).parent
@@ -495,7 +403,7 @@ def relative_to_assets(path: str) -> Path:
     return ASSETS_PATH / Path(path)
 
 
-window = Tk()
+window = app.create_window()
 window_width = 905
 window_height = 570
 
@@ -1166,7 +1074,12 @@ canvas.create_rectangle(
     318.0,
     fill="#FFFFFF",
     outline="#000000")
-display_print_jobs(canvas)
+job_table = JobTable(canvas)
+enable_job_selection(canvas, job_table)
+try:
+    display_print_jobs(canvas)
+except db.Error as err:
+    print(f"Database Error: {err}")
 
 # --- Search Box (Username or File) ---
 search_entry = Entry(
@@ -1235,5 +1148,10 @@ canvas.tag_bind("filter_btn_canvas", "<Button-1>", lambda e: on_filter_click())
 canvas.tag_bind("filter_btn_canvas", "<Enter>", on_filter_hover)
 canvas.tag_bind("filter_btn_canvas", "<Leave>", on_filter_leave)
 
+
+# --- Called by the app shell each time the cached screen is shown again ---
+def on_show():
+    on_filter_click()
+
+
 window.resizable(False, False)
-window.mainloop()
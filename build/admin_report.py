@@ -3,11 +3,13 @@
 
 
 from pathlib import Path
-import sys
-import subprocess
+from datetime import datetime, timedelta
+import app
+import reports
+import worker
 # from tkinter import *
 # Explicit imports to satisfy Flake8
-from tkinter import Tk, Canvas, Entry, Text, Button, PhotoImage, messagebox
+from tkinter import Canvas, Entry, Text, Button, PhotoImage, StringVar, messagebox, ttk
 
 # --- Rounded Rectangle Function ---
 def round_rectangle(canvas, x1, y1, x2, y2, r=15, **kwargs):
@@ -21,26 +23,122 @@ def round_rectangle(canvas, x1, y1, x2, y2, r=15, **kwargs):
 
 # --- Sidebar Buttons with Navigation ---
 def open_admin_user():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_user.py"])
+    app.show("admin_user")
 
 def open_admin_print():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_print.py"])
+    app.show("admin_print")
 
 def open_admin_dashboard():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_dashboard.py"])
+    app.show("admin_dashboard")
 
 def open_admin_notification():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_notification.py"])
+    app.show("admin_notification")
 
 # --- Logout Function ---
 def logout():
     messagebox.showinfo("Logged Out", "Logout successful!")
-    subprocess.Popen([sys.executable, "login.py"])
-    window.destroy()
+    app.logout()
+
+
+# --- Reports ---
+DEFAULT_RANGE_DAYS = 30  # the report opens on the last 30 days
+DATE_FORMAT = "%Y-%m-%d"
+CHART_LEFT, CHART_RIGHT = 320, 562  # plot area of "Revenue Over Time"
+CHART_TOP, CHART_BOTTOM = 345, 476
+
+
+def default_range():
+    today = datetime.now().date()
+    return today - timedelta(days=DEFAULT_RANGE_DAYS - 1), today
+
+
+def parse_range(text):
+    """Reads "YYYY-MM-DD - YYYY-MM-DD" (or a single day) from the date range box."""
+    parts = [part.strip() for part in text.replace(" to ", " - ").split(" - ") if part.strip()]
+    if len(parts) not in (1, 2):
+        raise ValueError
+    first_day = datetime.strptime(parts[0], DATE_FORMAT).date()
+    last_day = datetime.strptime(parts[-1], DATE_FORMAT).date()
+    if last_day < first_day:
+        first_day, last_day = last_day, first_day
+    return first_day, last_day
+
+
+def short_amount(value):
+    """50000 -> 50K, for the chart axis."""
+    if value >= 1000:
+        return f"{value / 1000:.0f}K" if value % 1000 == 0 or value >= 10000 else f"{value / 1000:.1f}K"
+    return f"{value:.0f}"
+
+
+def bucket_label(day, group_by):
+    return day.strftime("%b '%y") if group_by == "Monthly" else f"{day:%b} {day.day}"
+
+
+def draw_chart(series, group_by):
+    """Redraws the revenue bars and axis labels for [(bucket start, revenue)]."""
+    canvas.delete("chart")
+    top = max((float(revenue) for _, revenue in series), default=0) or 1
+    height = CHART_BOTTOM - CHART_TOP
+
+    for tick in range(5):  # 0, 25, 50, 75, 100 % of the top value
+        y = CHART_BOTTOM - height * tick / 4
+        canvas.create_text(312, y, anchor="e", text=short_amount(top * tick / 4),
+                           fill="#000000", font=("Inter Bold", 10 * -1), tags="chart")
+
+    if not series:
+        return
+    slot = (CHART_RIGHT - CHART_LEFT) / len(series)
+    gap = 1 if slot > 3 else 0
+    for index, (day, revenue) in enumerate(series):
+        x1 = CHART_LEFT + index * slot
+        bar_top = CHART_BOTTOM - height * float(revenue) / top
+        if revenue:
+            canvas.create_rectangle(x1 + gap, bar_top, x1 + max(slot - gap, 1), CHART_BOTTOM,
+                                    fill="#000000", outline="", tags="chart")
+
+    label_every = max(1, len(series) // 5)  # at most ~5 date labels under the axis
+    for index in range(0, len(series), label_every):
+        day = series[index][0]
+        canvas.create_text(CHART_LEFT + (index + 0.5) * slot, 483, anchor="n",
+                           text=bucket_label(day, group_by), fill="#000000",
+                           font=("Inter Bold", 10 * -1), tags="chart")
+
+
+def show_report(report, group_by):
+    summary = report["summary"]
+    canvas.itemconfigure(kpi_items["revenue"], text=f"{summary['revenue']:,.2f}")
+    canvas.itemconfigure(kpi_items["total_jobs"], text=f"{summary['total_jobs']:,}")
+    canvas.itemconfigure(kpi_items["pages"], text=f"{summary['pages']:,}")
+    canvas.itemconfigure(kpi_items["avg_job_value"], text=f"{summary['avg_job_value']:,.2f}")
+
+    for row, items in enumerate(spender_rows):
+        if row < len(report["top_users"]):
+            user = report["top_users"][row]
+            values = (user["username"] or f"User {user['user_id']}", f"{user['jobs']:,}",
+                      f"{user['pages']:,}", f"{user['spend']:,.0f}")
+        else:
+            values = ("", "", "", "")
+        for item, value in zip(items, values):
+            canvas.itemconfigure(item, text=value)
+
+    draw_chart(report["series"], group_by)
+
+
+def apply_report(event=None):
+    """Loads the report for the date range and grouping in the filter bar."""
+    try:
+        first_day, last_day = parse_range(range_entry.get())
+    except ValueError:
+        messagebox.showerror("Invalid Date Range", "Enter the range as YYYY-MM-DD - YYYY-MM-DD.")
+        return
+    group_by = group_var.get()
+
+    worker.submit(
+        reports.load_report, first_day, last_day, group_by,
+        on_done=lambda report: show_report(report, group_by),
+        on_error=lambda err: messagebox.showerror("Database Error", f"Failed to load the report: {err}"),
+    )
 
 
 OUTPUT_PATH = Path(__file__).parent
@@ -51,7 +149,7 @@ def relative_to_assets(path: str) -> Path:
     return ASSETS_PATH / Path(path)
 
 
-window = Tk()
+window = app.create_window()
 window_width = 905
 window_height = 575
 
@@ -384,27 +482,19 @@ canvas.create_rectangle(
     831.0,
     129.0,
     fill="#FFFFFF",
-    outline="#000000")
+    outline="#000000",
+    tags="apply_button")
 
-canvas.create_text(
-    397.0,
-    107.0,
-    anchor="nw",
-    text="Sep 1, 2025 - Oct 6, 2025",
-    fill="#000000",
-    font=("Inter", 12 * -1)
-)
+# --- Report Filters: date range (custom), grouping and Apply ---
+range_entry = Entry(window, bd=0, bg="#FFFFFF", fg="#000000", font=("Inter", 12 * -1), highlightthickness=0)
+range_entry.place(x=392.0, y=104.0, width=157.0, height=21.0)
 
-canvas.create_text(
-    650.0,
-    107.0,
-    anchor="nw",
-    text="Daily",
-    fill="#000000",
-    font=("Inter", 12 * -1)
-)
+group_var = StringVar(value="Daily")
+group_box = ttk.Combobox(window, textvariable=group_var, values=reports.GROUPINGS, state="readonly",
+                         font=("Inter", 12 * -1))
+group_box.place(x=643.0, y=103.0, width=104.0, height=23.0)
 
-canvas.create_text(
+apply_text = canvas.create_text(
     775.0,
     105.0,
     anchor="nw",
@@ -449,41 +539,17 @@ canvas.create_text(
     font=("Inter Bold", 14 * -1)
 )
 
-canvas.create_text(
-    374.0,
-    186.0,
-    anchor="nw",
-    text="10,566",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    372.0,
-    257.0,
-    anchor="nw",
-    text="70,020",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    614.0,
-    257.0,
-    anchor="nw",
-    text="20,001",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    618.0,
-    186.0,
-    anchor="nw",
-    text="1,287",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
+# --- KPI values (filled in by show_report) ---
+kpi_items = {
+    "revenue": canvas.create_text(374.0, 186.0, anchor="nw", text="-", fill="#000000",
+                                  font=("Inter Bold", 14 * -1)),
+    "pages": canvas.create_text(372.0, 257.0, anchor="nw", text="-", fill="#000000",
+                                font=("Inter Bold", 14 * -1)),
+    "avg_job_value": canvas.create_text(614.0, 257.0, anchor="nw", text="-", fill="#000000",
+                                        font=("Inter Bold", 14 * -1)),
+    "total_jobs": canvas.create_text(618.0, 186.0, anchor="nw", text="-", fill="#000000",
+                                     font=("Inter Bold", 14 * -1)),
+}
 
 canvas.create_rectangle(
     274.0,
@@ -518,154 +584,6 @@ canvas.create_rectangle(
     fill="#000000",
     outline="#000000")
 
-canvas.create_text(
-    285.0,
-    356.0,
-    anchor="nw",
-    text="40K",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    285.0,
-    331.0,
-    anchor="nw",
-    text="50K",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    331.0,
-    483.0,
-    anchor="nw",
-    text="Sep 5",
-    fill="#000000",
-    font=("Inter Bold", 12 * -1)
-)
-
-canvas.create_text(
-    379.0,
-    483.0,
-    anchor="nw",
-    text="Sep 10",
-    fill="#000000",
-    font=("Inter Bold", 12 * -1)
-)
-
-canvas.create_text(
-    430.0,
-    483.0,
-    anchor="nw",
-    text="Sep 15",
-    fill="#000000",
-    font=("Inter Bold", 12 * -1)
-)
-
-canvas.create_text(
-    479.0,
-    483.0,
-    anchor="nw",
-    text="Sep 25",
-    fill="#000000",
-    font=("Inter Bold", 12 * -1)
-)
-
-canvas.create_text(
-    529.0,
-    483.0,
-    anchor="nw",
-    text="Sep 30",
-    fill="#000000",
-    font=("Inter Bold", 12 * -1)
-)
-
-canvas.create_text(
-    285.0,
-    381.0,
-    anchor="nw",
-    text="30K",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    285.0,
-    406.0,
-    anchor="nw",
-    text="20K",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    287.0,
-    431.0,
-    anchor="nw",
-    text="10K",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    300.0,
-    460.0,
-    anchor="nw",
-    text="0",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_rectangle(
-    323.0,
-    451.00000089085097,
-    364.9999999128913,
-    477.0,
-    fill="#000000",
-    outline="#000000")
-
-canvas.create_rectangle(
-    363.99999961019824,
-    450.9999996881586,
-    375.0,
-    460.0,
-    fill="#000000",
-    outline="")
-
-canvas.create_rectangle(
-    374.0,
-    429.99999923151745,
-    424.9999995429539,
-    460.0,
-    fill="#000000",
-    outline="#000000")
-
-canvas.create_rectangle(
-    423.9999993785941,
-    429.9999997730729,
-    441.0,
-    445.0,
-    fill="#000000",
-    outline="#000000")
-
-canvas.create_rectangle(
-    440.0,
-    394.00000080036784,
-    479.0000008890195,
-    445.0,
-    fill="#000000",
-    outline="#000000")
-
-canvas.create_rectangle(
-    478.0000006573159,
-    394.0000004770111,
-    500.0,
-    408.0,
-    fill="#000000",
-    outline="#000000"
-)
-
 canvas.create_rectangle(
     595.0,   # x1 (left)
     303.0,   # y1 (top)
@@ -719,149 +637,16 @@ canvas.create_text(
     font=("Inter Bold", 14 * -1)
 )
 
-canvas.create_text(
-    601.0,
-    356.0,
-    anchor="nw",
-    text="joshua12",
-    fill="#000000",
-    font=("Inter Bold", 12 * -1)
-)
-
-canvas.create_text(
-    601.0,
-    390.0,
-    anchor="nw",
-    text="jericho4",
-    fill="#000000",
-    font=("Inter Bold", 12 * -1)
-)
-
-canvas.create_text(
-    602.0,
-    420.0,
-    anchor="nw",
-    text="robin4",
-    fill="#000000",
-    font=("Inter Bold", 12 * -1)
-)
-
-canvas.create_text(
-    602.0,
-    447.0,
-    anchor="nw",
-    text="jan90",
-    fill="#000000",
-    font=("Inter Bold", 12 * -1)
-)
-
-canvas.create_text(
-    677.0,
-    355.0,
-    anchor="nw",
-    text="48",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    732.0,
-    356.0,
-    anchor="nw",
-    text="120",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    794.0,
-    355.0,
-    anchor="nw",
-    text="5,600",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    794.0,
-    386.0,
-    anchor="nw",
-    text="7,600",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    794.0,
-    420.0,
-    anchor="nw",
-    text="4,000",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    792.0,
-    443.0,
-    anchor="nw",
-    text="11,000",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    677.0,
-    388.0,
-    anchor="nw",
-    text="20",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    735.0,
-    388.0,
-    anchor="nw",
-    text="68",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    735.0,
-    420.0,
-    anchor="nw",
-    text="78",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    730.0,
-    446.0,
-    anchor="nw",
-    text="167",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    677.0,
-    419.0,
-    anchor="nw",
-    text="10",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
-
-canvas.create_text(
-    677.0,
-    446.0,
-    anchor="nw",
-    text="35",
-    fill="#000000",
-    font=("Inter Bold", 14 * -1)
-)
+# --- Top spender rows (created once, filled in by show_report) ---
+spender_rows = []
+for row in range(reports.TOP_SPENDERS):
+    y_pos = 356.0 + row * 30
+    spender_rows.append([
+        canvas.create_text(601.0, y_pos, anchor="nw", text="", fill="#000000", font=("Inter Bold", 12 * -1)),
+        canvas.create_text(677.0, y_pos, anchor="nw", text="", fill="#000000", font=("Inter Bold", 14 * -1)),
+        canvas.create_text(732.0, y_pos, anchor="nw", text="", fill="#000000", font=("Inter Bold", 14 * -1)),
+        canvas.create_text(792.0, y_pos, anchor="nw", text="", fill="#000000", font=("Inter Bold", 14 * -1)),
+    ])
 
 # canvas.create_text(
 #     111.0,
@@ -917,4 +702,17 @@ canvas.create_text(
 #     font=("Inter Bold", 16 * -1)
 # )
 window.resizable(False, False)
-window.mainloop()
\ No newline at end of file
+
+
+# --- Load the default report (last 30 days, daily) ---
+first_day, last_day = default_range()
+range_entry.insert(0, f"{first_day:%Y-%m-%d} - {last_day:%Y-%m-%d}")
+for tag in ("apply_button", apply_text):
+    canvas.tag_bind(tag, "<Button-1>", apply_report)
+range_entry.bind("<Return>", apply_report)
+apply_report()
+
+
+# --- Called by the app shell each time the cached screen is shown again ---
+def on_show():
+    apply_report()
@@ -3,94 +3,34 @@
 
 
 from pathlib import Path
-import sys
-import subprocess
-import mysql.connector
 import tkinter as tk
 # from tkinter import *
 # Explicit imports to satisfy Flake8
-from tkinter import Tk, Canvas, Entry, Text, Button, PhotoImage, messagebox, ttk
+from tkinter import Canvas, Entry, Text, Button, PhotoImage, messagebox, ttk
+import accounts
+import app
+import db
+import userindex
+import worker
 
-all_users = []
-admin_name = "Admin" # Default if not passed
-if len(sys.argv) > 1:
-    admin_name = sys.argv[1] # Get admin name from command-line argument
-else:
-    print("Warning: Admin name not provided to notification script.")
+admin_name = app.session["admin_name"]
+SEARCH_DEBOUNCE_MS = 150  # wait for typing to pause before searching
+LIST_LIMIT = userindex.RESULT_LIMIT  # rows shown in the user list
 
 def fetch_users():
-    """Fetches user_id and username from the users table."""
+    """Loads the shared user index (one SELECT per process, not per screen)."""
     try:
-        conn = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",  # Add your password if you have one
-            database="copy_corner_db"
-        )
-        cursor = conn.cursor(dictionary=True)
-        query = "SELECT user_id, username FROM users ORDER BY user_id ASC"
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return rows
-    except mysql.connector.Error as err:
+        userindex.load()
+        return True
+    except db.Error as err:
         messagebox.showerror("Database Error", f"Error fetching users:\n{err}")
-        return []
+        return False
 
 def fetch_user_details(user_id):
     """Fetches detailed information for a specific user, including stats."""
-    details = {}
     try:
-        conn = mysql.connector.connect(
-            host="localhost", user="root", password="", database="copy_corner_db"
-        )
-        cursor = conn.cursor(dictionary=True)
-
-        # Fetch basic user info
-        cursor.execute("SELECT * FROM users WHERE user_id = %s", (user_id,))
-        user_info = cursor.fetchone()
-        if not user_info:
-            return None # User not found
-        details.update(user_info) # Add all columns from users table
-
-        # Fetch print job stats
-        cursor.execute("""
-            SELECT
-                COUNT(*) as total_jobs,
-                SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END) as completed_jobs,
-                SUM(CASE WHEN status = 'Voided' THEN 1 ELSE 0 END) as voided_jobs,
-                SUM(CASE WHEN status = 'Completed' THEN pages ELSE 0 END) as total_pages
-            FROM print_jobs
-            WHERE user_id = %s
-        """, (user_id,))
-        stats = cursor.fetchone()
-        if stats:
-            details.update(stats) # Add stats columns
-
-        cursor.close()
-        conn.close()
-
-        # Format date if needed (assuming 'created_at' exists)
-        if 'created_at' in details and details['created_at']:
-            details['member_since'] = details['created_at'].strftime('%Y-%m-%d') # Or desired format
-        else:
-             details['member_since'] = '-'
-
-        # Provide defaults for potentially missing stats
-        details['total_jobs'] = details.get('total_jobs', 0)
-        details['completed_jobs'] = details.get('completed_jobs', 0)
-        details['voided_jobs'] = details.get('voided_jobs', 0)
-        details['total_pages'] = details.get('total_pages', 0) or 0 # Handle potential None from SUM
-
-        # Add role (assuming it's always 'User' based on your table structure)
-        # If you add roles later, fetch it from user_info
-        details['role'] = details.get('role', 'User')
-
-
-        return details
-
-    except mysql.connector.Error as err:
+        return accounts.fetch_user_details(user_id)
+    except db.Error as err:
         messagebox.showerror("Database Error", f"Error fetching user details:\n{err}")
         return None
 
@@ -138,119 +78,133 @@ def update_user_details(details):
                        fill="#000000", font=("Inter", 12 * -1), tags="user_detail") # Password
 
 selected_user_row_bg = None
+user_rows = {}  # user_id -> {"bg", "id", "name", "sep", "position"} for every row built so far
+shown_user_ids = []  # user_ids currently shown, top to bottom
+more_label = [None]  # "Showing N of M users" hint below the list
+
+
+def create_user_row(frame, user):
+    """Builds the widgets of one row (hidden until display_users_list grids it)."""
+    # Background Frame for hover/selection
+    # Use a Frame instead of Label for background to avoid text clipping issues
+    row_bg_frame = tk.Frame(frame, bg="white")
+    # Configure columns inside the background frame as well
+    row_bg_frame.columnconfigure(0, weight=1)
+    row_bg_frame.columnconfigure(1, weight=3)
+
+    # User ID Label (Place inside the row_bg_frame)
+    id_label = tk.Label(row_bg_frame, text=user["user_id"], font=("Inter Bold", 14 * -1), bg="white", anchor="nw")
+    id_label.grid(row=0, column=0, sticky="nw", padx=(15, 0), pady=5)
+
+    # Username Label (Place inside the row_bg_frame)
+    username_label = tk.Label(row_bg_frame, text=user["username"], font=("Inter Bold", 14 * -1), bg="white", anchor="nw")
+    username_label.grid(row=0, column=1, sticky="nw", padx=(10, 0), pady=5)
+
+    # Separator Line (Still placed in the main 'frame')
+    line_sep = ttk.Separator(frame, orient="horizontal")
+
+    # Bind events to all elements within the row background frame
+    user_id = user["user_id"]
+    for widget in [row_bg_frame, id_label, username_label]:
+        widget.bind("<Enter>", lambda e, bg=row_bg_frame: on_row_enter(e, bg))
+        widget.bind("<Leave>", lambda e, bg=row_bg_frame: on_row_leave(e, bg))
+        # Look the user up at click time so an edited username is picked up
+        widget.bind("<Button-1>", lambda e, uid=user_id, bg=row_bg_frame: on_row_click(e, uid, bg))
+
+    return {"bg": row_bg_frame, "id": id_label, "name": username_label, "sep": line_sep, "position": None}
+
+
+# --- Click and Hover Handlers ---
+def on_row_enter(event, bg_widget):
+    # Change background color on hover if not selected
+    if bg_widget != selected_user_row_bg:
+        set_row_bg(bg_widget, "#E0F0FF") # Light blue hover
+    user_content_frame.config(cursor="hand2")
+
+def on_row_leave(event, bg_widget):
+    # Change background back if not selected
+    if bg_widget != selected_user_row_bg:
+        set_row_bg(bg_widget, "white")
+    user_content_frame.config(cursor="")
+
+def on_row_click(event, user_id, bg_widget):
+    global selected_user_row_bg
+    # Deselect previous row
+    if selected_user_row_bg:
+        set_row_bg(selected_user_row_bg, "white")
+
+    # Select new row
+    set_row_bg(bg_widget, "#CCE5FF") # Darker blue selection
+    selected_user_row_bg = bg_widget
+
+    # Fetch and display details
+    details = fetch_user_details(user_id)
+    update_user_details(details)
+
+def set_row_bg(bg_widget, color):
+    """Colors a row's background frame and its labels together."""
+    bg_widget.config(bg=color)
+    for child in bg_widget.winfo_children():
+        child.config(bg=color)
+
+
 def display_users_list(frame, users_to_display):
     """
     Displays the given list of users in the right-side scrollable frame.
-    Adds hover effects and click handlers to each row.
+    Only rows that appear, disappear, move or change are touched; row
+    widgets are built once per user and reused between searches.
     """
-    global selected_user_row_bg # Allow modification of the global variable
-
-    # Clear old user widgets
-    for widget in frame.winfo_children():
-        widget.destroy()
-
     # Set column weights for proper spacing
     frame.columnconfigure(0, weight=1)
     frame.columnconfigure(1, weight=3)
 
-    # --- Click and Hover Handlers ---
-    def on_row_enter(event, bg_widget):
-        # Change background color on hover if not selected
-        if bg_widget != selected_user_row_bg:
-            bg_widget.config(bg="#E0F0FF") # Light blue hover
-        frame.config(cursor="hand2")
-
-    def on_row_leave(event, bg_widget):
-        # Change background back if not selected
-        if bg_widget != selected_user_row_bg:
-            bg_widget.config(bg="white")
-        frame.config(cursor="")
-
-    def on_row_click(event, user_data, bg_widget):
-        global selected_user_row_bg
-        # Deselect previous row
-        if selected_user_row_bg:
-            selected_user_row_bg.config(bg="white")
-
-        # Select new row
-        bg_widget.config(bg="#CCE5FF") # Darker blue selection
-        selected_user_row_bg = bg_widget
-
-        # Fetch and display details
-        details = fetch_user_details(user_data['user_id'])
-        update_user_details(details)
-
-
-    # --- Add each user to the frame ---
-    row_index = 0
-    for user in users_to_display:
-        # Background Frame for hover/selection
-        # Use a Frame instead of Label for background to avoid text clipping issues
-        row_bg_frame = tk.Frame(frame, bg="white")
-        row_bg_frame.grid(row=row_index, column=0, columnspan=2, sticky="ew")
-        # Configure columns inside the background frame as well
-        row_bg_frame.columnconfigure(0, weight=1)
-        row_bg_frame.columnconfigure(1, weight=3)
-
-
-        # User ID Label (Place inside the row_bg_frame)
-        id_label = tk.Label(
-            row_bg_frame, # Parent is now row_bg_frame
-            text=user["user_id"],
-            font=("Inter Bold", 14 * -1),
-            bg="white", # Inherit background initially
-            anchor="nw"
-        )
-        id_label.grid(row=0, column=0, sticky="nw", padx=(15, 0), pady=5)
-
-        # Username Label (Place inside the row_bg_frame)
-        username_label = tk.Label(
-            row_bg_frame, # Parent is now row_bg_frame
-            text=user["username"],
-            font=("Inter Bold", 14 * -1),
-            bg="white", # Inherit background initially
-            anchor="nw"
-        )
-        username_label.grid(row=0, column=1, sticky="nw", padx=(10, 0), pady=5)
-
-        # Separator Line (Still placed in the main 'frame')
-        line_sep = ttk.Separator(frame, orient="horizontal")
-        line_sep.grid(row=row_index + 1, column=0, columnspan=2, sticky="ew")
-
-        # Bind events to all elements within the row background frame
-        for widget in [row_bg_frame, id_label, username_label]:
-            widget.bind("<Enter>", lambda e, bg=row_bg_frame: on_row_enter(e, bg))
-            widget.bind("<Leave>", lambda e, bg=row_bg_frame: on_row_leave(e, bg))
-            # Pass user data and the background frame to the click handler
-            widget.bind("<Button-1>", lambda e, u=user, bg=row_bg_frame: on_row_click(e, u, bg))
-            # Make labels transparent to background frame color changes
-            if widget != row_bg_frame:
-                 widget.bind("<Map>", lambda e, w=widget: w.config(bg=w.master.cget('bg'))) # Update on map
-                 widget.bind("<<BackgroundChanged>>", lambda e, w=widget: w.config(bg=w.master.cget('bg'))) # Custom event if needed, Map is usually enough
-
-
-        row_index += 2
+    new_ids = [user["user_id"] for user in users_to_display]
+    keep = set(new_ids)
+    for user_id in shown_user_ids:
+        if user_id not in keep:
+            row = user_rows[user_id]
+            row["bg"].grid_remove()
+            row["sep"].grid_remove()
+            row["position"] = None
+
+    for position, user in enumerate(users_to_display):
+        row = user_rows.get(user["user_id"])
+        if row is None:
+            row = user_rows[user["user_id"]] = create_user_row(frame, user)
+        if row["name"].cget("text") != user["username"]:
+            row["name"].config(text=user["username"])
+        if row["position"] != position:
+            row["bg"].grid(row=position * 2, column=0, columnspan=2, sticky="ew")
+            row["sep"].grid(row=position * 2 + 1, column=0, columnspan=2, sticky="ew")
+            row["position"] = position
+
+    shown_user_ids[:] = new_ids
+
+    # Tell the admin the list is cut off
+    total = userindex.count()
+    if more_label[0] is None:
+        more_label[0] = tk.Label(frame, text="", font=("Inter", 11 * -1), bg="white", fg="grey")
+    if not search_entry.get().strip() and total > len(new_ids):
+        more_label[0].config(text=f"Showing {len(new_ids)} of {total} users - type to search")
+        more_label[0].grid(row=len(new_ids) * 2, column=0, columnspan=2, pady=5)
+    else:
+        more_label[0].grid_remove()
 
 
-def on_user_search(event):
-    """Filters the user list on the canvas based on search entry text."""
-    search_term = search_entry.get().lower()
+search_job = [None]  # after() id of the pending debounced search
 
-    if not search_term:
-        # If search bar is empty, show all users
-        filtered_users = all_users
-    else:
-        filtered_users = []
-        for user in all_users:
-            # Convert user_id to string for searching
-            user_id_str = str(user["user_id"])
-            username_str = str(user["username"]).lower()
 
-            # Check if search term is in either the ID or the username
-            if search_term in user_id_str or search_term in username_str:
-                filtered_users.append(user)
+def on_user_search(event):
+    """Filters the user list through the shared index once typing pauses."""
+    if search_job[0] is not None:
+        window.after_cancel(search_job[0])
+    search_job[0] = window.after(SEARCH_DEBOUNCE_MS, run_user_search)
+
 
-    # Update the call to use the new frame
+def run_user_search():
+    search_job[0] = None
+    # Ranked (exact / prefix first) and limited, from the in-memory index
+    filtered_users = userindex.search(search_entry.get(), LIST_LIMIT)
     display_users_list(user_content_frame, filtered_users)
 
 
@@ -287,30 +241,25 @@ def round_rectangle(canvas, x1, y1, x2, y2, r=15, **kwargs):
 
 # --- Sidebar Buttons with Navigation ---
 def open_admin_dashboard():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_dashboard.py", admin_name])
+    app.show("admin_dashboard")
 
 
 def open_admin_print():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_print.py", admin_name])
+    app.show("admin_print")
 
 
 def open_admin_report():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_report.py", admin_name])
+    app.show("admin_report")
 
 
 def open_admin_notification():
-    window.destroy()
-    subprocess.Popen([sys.executable, "admin_notification.py", admin_name])
+    app.show("admin_notification")
 
 
 # --- Logout Function ---
 def logout():
     messagebox.showinfo("Logged Out", "Logout successful!")
-    subprocess.Popen([sys.executable, "login.py"])
-    window.destroy()
+    app.logout()
 
 
 def create_rounded_menu_button(canvas, x, y, w, h, text, command=None):
@@ -343,7 +292,7 @@ def relative_to_assets(path: str) -> Path:
     return ASSETS_PATH / Path(path)
 
 
-window = Tk()
+window = app.create_window()
 window_width = 905
 window_height = 570
 
@@ -1309,7 +1258,7 @@ user_list_canvas.bind(
 )
 
 # Bind mousewheel scrolling
-user_list_canvas.bind_all(
+window.bind(
     "<MouseWheel>",
     lambda event, canvas=user_list_canvas: on_mousewheel(event, canvas)
 )
@@ -1425,9 +1374,15 @@ create_rounded_menu_button(canvas, 71, 320, 151, 38, "Notifications", open_admin
 create_rounded_menu_button(canvas, 71, 377, 151, 38, "Settings")
 create_rounded_menu_button(canvas, 89, 450, 111, 38, "Logout", logout)
 
-all_users = fetch_users()
+fetch_users()
 # Update the call to use the new frame
-display_users_list(user_content_frame, all_users)
+run_user_search()
+
+
+# --- Called by the app shell each time the cached screen is shown again ---
+def on_show():
+    # Pick up users registered or edited on other PCs, then redraw only the changed rows
+    worker.submit(userindex.refresh, on_done=lambda _: run_user_search(),
+                  on_error=lambda err: print(f"Could not refresh users: {err}"))
 
-window.resizable(False, False)
-window.mainloop()
\ No newline at end of file
+window.resizable(False, False)
\ No newline at end of file
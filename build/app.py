@@ -0,0 +1,165 @@
+# Single-process application shell for Copy Corner.
+#
+# Every screen module builds its UI into a Toplevel handed out by
+# create_window() instead of creating its own Tk() root.  Screens are imported
+# (= built) the first time they are shown, cached, and afterwards only hidden
+# and shown again, so navigating no longer starts a new interpreter, re-imports
+# tkinter/mysql.connector or reloads the PNG assets.
+#
+# Usage:  python app.py            (or python login.py)
+
+import importlib
+import sys
+import tkinter as tk
+
+import db
+import worker
+
+# --- Screen Registry: screen name -> module that builds it ---
+SCREENS = {
+    "login": "login",
+    "register": "register",
+    "forgot": "forgot",
+    "printer": "printer",
+    "user": "user",
+    "notification": "Notification",
+    "prices": "Prices",
+    "help": "Help",
+    "history": "history",
+    "dashboard": "dashboard",
+    "admin_dashboard": "admin_dashboard",
+    "admin_user": "admin_user",
+    "admin_print": "admin_print",
+    "admin_report": "admin_report",
+    "admin_notification": "admin_notification",
+}
+
+# --- Session Context (replaces the old sys.argv hand-over) ---
+DEFAULT_SESSION = {"user_id": None, "fullname": "User", "admin_name": "Admin"}
+session = dict(DEFAULT_SESSION)
+
+root = None
+_screens = {}  # name -> {"module": module, "window": Toplevel, "session": snapshot}
+_building = None  # name of the screen currently being imported
+current_screen = None
+previous_screen = None
+
+
+def get_root():
+    """Creates (once) and returns the hidden Tk root that owns every screen."""
+    global root
+    if root is None:
+        root = tk.Tk()
+        root.withdraw()
+    return root
+
+
+def create_window():
+    """Returns the Toplevel the screen being built should draw into."""
+    window = tk.Toplevel(get_root())
+    window.withdraw()  # show() makes it visible once it is fully built
+    window.protocol("WM_DELETE_WINDOW", quit_app)
+    if _building is not None:
+        _screens[_building] = {"module": None, "window": window, "session": None}
+    return window
+
+
+def _session_snapshot():
+    return tuple(sorted(session.items()))
+
+
+def _build(name):
+    """Imports (or re-imports) the module of a screen and caches it."""
+    global _building
+    module_name = SCREENS[name]
+    _building = name
+    try:
+        if module_name in sys.modules:
+            module = importlib.reload(sys.modules[module_name])
+        else:
+            module = importlib.import_module(module_name)
+    except Exception:
+        _drop(name)
+        raise
+    finally:
+        _building = None
+    _screens[name]["module"] = module
+    _screens[name]["session"] = _session_snapshot()
+    return _screens[name]
+
+
+def _drop(name):
+    """Destroys a cached screen so it is rebuilt the next time it is shown."""
+    screen = _screens.pop(name, None)
+    if screen and screen["window"].winfo_exists():
+        screen["window"].destroy()
+
+
+def show(name, **context):
+    """Hides the current screen and shows `name`, updating the session first.
+
+    A cached screen is reused as long as it was built for the same session
+    (user_id / fullname / admin_name); otherwise it is rebuilt.
+    """
+    global current_screen, previous_screen
+    if name not in SCREENS:
+        raise KeyError(f"Unknown screen: {name}")
+
+    session.update(context)
+
+    screen = _screens.get(name)
+    if screen is not None and screen["session"] != _session_snapshot():
+        _drop(name)
+        screen = None
+    if screen is None:
+        screen = _build(name)
+    elif hasattr(screen["module"], "on_show"):
+        screen["module"].on_show()
+
+    if current_screen and current_screen != name and current_screen in _screens:
+        _screens[current_screen]["window"].withdraw()
+        previous_screen = current_screen
+    current_screen = name
+
+    window = screen["window"]
+    window.deiconify()
+    window.lift()
+    window.focus_force()
+
+
+def back(default="login"):
+    """Returns to the screen that was shown before the current one."""
+    show(previous_screen or default)
+
+
+def logout():
+    """Clears the session, forgets the user's cached screens and shows the login."""
+    global previous_screen
+    session.clear()
+    session.update(DEFAULT_SESSION)
+    for name in list(_screens):
+        if name not in (current_screen, "login"):
+            _drop(name)
+    previous_screen = None
+    show("login")
+
+
+def quit_app():
+    """Closes the whole application."""
+    if root is not None:
+        root.destroy()
+
+
+def main(start="login"):
+    get_root()
+    show(start)
+    root.mainloop()
+    worker.shutdown()
+    db.close_pool()
+
+
+if __name__ == "__main__":
+    # Run through the importable module so the screens (which `import app`)
+    # share this shell's root, session and screen cache.
+    import app
+    app.main()
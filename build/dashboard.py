@@ -4,11 +4,13 @@
 
 
 from pathlib import Path
-import sys
-import subprocess
+from datetime import datetime
+import app
+import reports
+import worker
 # from tkinter import *
 # Explicit imports to satisfy Flake8
-from tkinter import Tk, Canvas, Entry, Text, Button, PhotoImage, messagebox
+from tkinter import Canvas, Entry, Text, Button, PhotoImage, messagebox
 
 # --- Rounded Rectangle Function ---
 def round_rectangle(canvas, x1, y1, x2, y2, r=15, **kwargs):
@@ -32,8 +34,7 @@ def round_rectangle(canvas, x1, y1, x2, y2, r=15, **kwargs):
 # --- Log Out ---
 def logout():
     messagebox.showinfo("Logged Out", "Logout successful!")
-    subprocess.Popen([sys.executable, "login.py"])
-    window.destroy()
+    app.logout()
 
 
 OUTPUT_PATH = Path(__file__).parent
@@ -44,7 +45,7 @@ def relative_to_assets(path: str) -> Path:
     return ASSETS_PATH / Path(path)
 
 
-window = Tk()
+window = app.create_window()
 window_width = 839
 window_height = 534
 
@@ -356,6 +357,7 @@ entry_bg_1 = canvas.create_image(
     image=entry_image_1
 )
 entry_1 = Entry(
+    window,
     bd=0,
     bg="#FFFFFF",
     fg="#000716",
@@ -441,6 +443,7 @@ entry_bg_2 = canvas.create_image(
     image=entry_image_2
 )
 entry_2 = Entry(
+    window,
     bd=0,
     bg="#FFFFFF",
     fg="#000716",
@@ -461,6 +464,7 @@ entry_bg_3 = canvas.create_image(
     image=entry_image_3
 )
 entry_3 = Entry(
+    window,
     bd=0,
     bg="#FFFFFF",
     fg="#000716",
@@ -481,6 +485,7 @@ entry_bg_4 = canvas.create_image(
     image=entry_image_4
 )
 entry_4 = Entry(
+    window,
     bd=0,
     bg="#FFFFFF",
     fg="#000716",
@@ -501,6 +506,7 @@ entry_bg_5 = canvas.create_image(
     image=entry_image_5
 )
 entry_5 = Entry(
+    window,
     bd=0,
     bg="#FFFFFF",
     fg="#000716",
@@ -521,6 +527,7 @@ entry_bg_6 = canvas.create_image(
     image=entry_image_6
 )
 entry_6 = Entry(
+    window,
     bd=0,
     bg="#FFFFFF",
     fg="#000716",
@@ -541,6 +548,7 @@ entry_bg_7 = canvas.create_image(
     image=entry_image_7
 )
 entry_7 = Entry(
+    window,
     bd=0,
     bg="#FFFFFF",
     fg="#000716",
@@ -556,6 +564,7 @@ entry_7.place(
 button_image_7 = PhotoImage(
     file=relative_to_assets("button_7.png"))
 button_7 = Button(
+    window,
     image=button_image_7,
     borderwidth=0,
     highlightthickness=0,
@@ -706,5 +715,30 @@ canvas.create_rectangle(
     365.5,
     fill="#000000",
     outline="")
+# --- Revenue Today (read from the report rollups, off the UI thread) ---
+revenue_today_text = canvas.create_text(
+    292.0,
+    236.0,
+    text="-",
+    fill="#000000",
+    font=("Inter Bold", 16)
+)
+
+
+def update_revenue_today():
+    worker.submit(
+        reports.revenue_on, datetime.now().date(),
+        on_done=lambda revenue: canvas.itemconfigure(revenue_today_text, text=f"{revenue:,.2f}"),
+        on_error=lambda err: print(f"Database Error: {err}"),
+    )
+
+
+update_revenue_today()
+
+
+# --- Called by the app shell each time the cached screen is shown again ---
+def on_show():
+    update_revenue_today()
+
+
 window.resizable(False, False)
-window.mainloop()
@@ -0,0 +1,587 @@
+# Shared data-access layer for copy_corner_db.
+#
+# Every screen goes through this module instead of opening its own
+# mysql.connector connection:
+#   * one configuration source (DB_CONFIG, overridable with COPY_CORNER_DB_* env vars)
+#   * a thread-safe pool of long-lived connections, so a refresh no longer pays a
+#     TCP + auth handshake
+#   * server-side prepared statements that are reused per pooled connection
+#   * the application's queries defined once, by name, in QUERIES
+#   * per-query timings and row counts (query_stats / print_query_stats)
+
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import mysql.connector
+
+Error = mysql.connector.Error
+
+# --- Configuration (the only place credentials live) ---
+DB_CONFIG = {
+    "host": os.environ.get("COPY_CORNER_DB_HOST", "localhost"),
+    "port": int(os.environ.get("COPY_CORNER_DB_PORT", "3306")),
+    "user": os.environ.get("COPY_CORNER_DB_USER", "root"),
+    "password": os.environ.get("COPY_CORNER_DB_PASSWORD", ""),
+    "database": os.environ.get("COPY_CORNER_DB_NAME", "copy_corner_db"),
+}
+POOL_SIZE = int(os.environ.get("COPY_CORNER_DB_POOL_SIZE", "5"))
+POOL_TIMEOUT = 10  # seconds to wait for a free connection
+IDLE_PING_SECONDS = 30  # only connections idle longer than this are pinged on checkout
+SLOW_QUERY_MS = 200  # queries slower than this are printed to the console
+
+
+FILE_LOOKUP_SIZE = 20  # hashes per file_batch_ids query (unused slots are sent as NULL)
+
+# --- Named Queries ---
+_JOB_COLUMNS = """
+    pj.job_id,
+    u.username,
+    f.file_id,
+    f.file_name,
+    f.file_type,
+    pj.pages,
+    pj.paper_size,
+    pj.color_option,
+    pj.copies,
+    pj.payment_method,
+    pj.total_amount,
+    pj.status,
+    pj.notes,
+    pj.created_at
+"""
+
+
+def _job_page_sql(where):
+    """Builds a keyset-paginated print job query, newest first.
+
+    The cursor is spelled out with OR rather than a row constructor
+    ((a, b) < (x, y)), which MySQL does not turn into a range scan when it
+    follows an equality on the index prefix.
+    """
+    return f"""
+        SELECT {_JOB_COLUMNS}
+        FROM print_jobs pj
+        LEFT JOIN users u ON pj.user_id = u.user_id
+        LEFT JOIN files f ON pj.file_id = f.file_id
+        WHERE {where} (pj.created_at < %s OR (pj.created_at = %s AND pj.job_id < %s))
+        ORDER BY pj.created_at DESC, pj.job_id DESC
+        LIMIT %s
+    """
+
+
+QUERIES = {
+    # login.py / register.py / forgot.py / user.py
+    "login_user": """
+        SELECT user_id, fullname FROM users
+        WHERE (username = %s OR email = %s) AND password = %s
+    """,
+    "login_admin": """
+        SELECT * FROM admin_login
+        WHERE admin_username = %s AND admin_password = %s
+    """,
+    "user_exists": "SELECT 1 FROM users WHERE fullname = %s OR username = %s OR email = %s",
+    "user_insert": """
+        INSERT INTO users (fullname, username, contact, email, password)
+        VALUES (%s, %s, %s, %s, %s)
+    """,
+    "user_by_email": "SELECT user_id FROM users WHERE email = %s",
+    "user_password_reset": "UPDATE users SET password = %s WHERE email = %s",
+    "user_profile": """
+        SELECT fullname, username, email, password, contact
+        FROM users
+        WHERE user_id = %s
+    """,
+    "user_profile_update": """
+        UPDATE users
+        SET fullname = %s, username = %s, email = %s, password = %s, contact = %s
+        WHERE user_id = %s
+    """,
+
+    # userindex.py / admin_user.py
+    "user_index": "SELECT user_id, username, fullname, email, updated_at FROM users",
+    # Users added or edited (by any PC) since updated_at >= %s
+    "user_index_changes": """
+        SELECT user_id, username, fullname, email, updated_at FROM users
+        WHERE updated_at >= %s
+        ORDER BY updated_at, user_id
+    """,
+    "user_details": "SELECT * FROM users WHERE user_id = %s",
+    "user_stats": """
+        SELECT
+            COUNT(*) AS total_jobs,
+            SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END) AS completed_jobs,
+            SUM(CASE WHEN status = 'Voided' THEN 1 ELSE 0 END) AS voided_jobs,
+            SUM(CASE WHEN status = 'Completed' THEN pages ELSE 0 END) AS total_pages
+        FROM print_jobs
+        WHERE user_id = %s
+    """,
+
+    # admin_print.py
+    # Keyset pages: params are (*filters, created_at, created_at, job_id, limit) where
+    # (created_at, job_id) is the last row of the previous page.
+    "job_page": _job_page_sql(""),
+    "job_page_status": _job_page_sql("pj.status = %s AND"),
+    "job_page_user": _job_page_sql("u.username LIKE %s AND"),
+    "job_page_user_status": _job_page_sql("u.username LIKE %s AND pj.status = %s AND"),
+    "job_status_update": "UPDATE print_jobs SET status = %s WHERE job_id = %s",
+    "file_by_id": "SELECT file_name, file_path, sha256, size FROM files WHERE file_id = %s",
+
+    # printer.py / filestore.py
+    # filestore.attach_many: one multi-row upsert on (user_id, sha256, file_name),
+    # then the ids of just the batch's hashes
+    "file_insert": """
+        INSERT INTO files (user_id, file_name, file_path, file_type, sha256, size)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE file_id = file_id
+    """,
+    "file_batch_ids": f"""
+        SELECT file_id, sha256, file_name FROM files
+        WHERE user_id = %s AND sha256 IN ({", ".join(["%s"] * FILE_LOOKUP_SIZE)})
+    """,
+    "file_gc_rows": """
+        DELETE FROM files
+        WHERE NOT EXISTS (SELECT 1 FROM print_jobs pj WHERE pj.file_id = files.file_id)
+    """,
+    "file_live_hashes": "SELECT DISTINCT sha256 FROM files WHERE sha256 IS NOT NULL",
+    "job_insert": """
+        INSERT INTO print_jobs
+        (user_id, file_id, pages, paper_size, color_option, copies, notes, status, total_amount)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+
+    # pricing.py (Prices.py / printer.py)
+    "price_matrix": "SELECT color_option, paper_size, price_per_page FROM prices",
+
+    "recent_requests": """
+        SELECT pages, status, created_at FROM print_jobs
+        WHERE user_id = %s
+        ORDER BY created_at DESC
+        LIMIT 5
+    """,
+
+    # history.py
+    "history": """
+        SELECT pj.job_id, f.file_name, pj.created_at
+        FROM print_jobs pj
+        LEFT JOIN files f ON pj.file_id = f.file_id
+        WHERE pj.user_id = %s
+        ORDER BY pj.created_at DESC
+    """,
+
+    # inbox.py (Notification.py / admin_notification.py)
+    # One feed page, newest first: the user's own notifications and the
+    # broadcasts (read state from the receipts), each read as an index range.
+    # params: (user_id, before, limit, user_id, before, limit, limit)
+    "notification_page": """
+        SELECT notif_id, subject, message, created_at, status, broadcast FROM (
+            (SELECT n.notif_id, n.subject, n.message, n.created_at, n.status, 0 AS broadcast
+             FROM notifications n
+             WHERE n.user_id = %s AND n.notif_id < %s
+             ORDER BY n.notif_id DESC
+             LIMIT %s)
+            UNION ALL
+            (SELECT n.notif_id, n.subject, n.message, n.created_at,
+                    IF(r.notif_id IS NULL, 'Unread', 'Read') AS status, 1 AS broadcast
+             FROM notifications n
+             LEFT JOIN notification_receipts r ON r.user_id = %s AND r.notif_id = n.notif_id
+             WHERE n.user_id IS NULL AND n.notif_id < %s
+             ORDER BY n.notif_id DESC
+             LIMIT %s)
+        ) AS feed
+        ORDER BY notif_id DESC
+        LIMIT %s
+    """,
+    # params: (user_id); unread_direct + broadcasts sent - broadcasts read
+    "notification_unread_count": """
+        SELECT b.value + COALESCE(c.unread_direct, 0) - COALESCE(c.read_broadcasts, 0) AS unread
+        FROM counters b
+        LEFT JOIN notification_counts c ON c.user_id = %s
+        WHERE b.name = 'broadcasts'
+    """,
+    "notification_insert": """
+        INSERT INTO notifications (user_id, subject, message)
+        VALUES (%s, %s, %s)
+    """,
+    "notification_mark_read": """
+        UPDATE notifications SET status = 'Read'
+        WHERE notif_id = %s AND user_id = %s AND status = 'Unread'
+    """,
+    "notification_receipt_insert": """
+        INSERT IGNORE INTO notification_receipts (user_id, notif_id) VALUES (%s, %s)
+    """,
+    "notifications_clear": """
+        UPDATE notifications SET status = 'Read'
+        WHERE user_id = %s AND status = 'Unread'
+    """,
+    # params: (user_id, user_id); receipts for every broadcast the user has not read yet
+    "notification_receipts_clear": """
+        INSERT IGNORE INTO notification_receipts (user_id, notif_id)
+        SELECT %s, n.notif_id
+        FROM notifications n
+        LEFT JOIN notification_receipts r ON r.user_id = %s AND r.notif_id = n.notif_id
+        WHERE n.user_id IS NULL AND r.notif_id IS NULL
+    """,
+    "notification_count_sent": """
+        INSERT INTO notification_counts (user_id, unread_direct) VALUES (%s, 1)
+        ON DUPLICATE KEY UPDATE unread_direct = unread_direct + 1
+    """,
+    # params: (read, user_id)
+    "notification_count_read": """
+        UPDATE notification_counts SET unread_direct = GREATEST(unread_direct - %s, 0)
+        WHERE user_id = %s
+    """,
+    # params: (user_id, read)
+    "notification_count_read_broadcasts": """
+        INSERT INTO notification_counts (user_id, read_broadcasts) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE read_broadcasts = read_broadcasts + VALUES(read_broadcasts)
+    """,
+    "broadcast_count_add": """
+        INSERT INTO counters (name, value) VALUES ('broadcasts', 1)
+        ON DUPLICATE KEY UPDATE value = value + 1
+    """,
+
+    # admin_dashboard.py
+    # params: (today_start, tomorrow_start). One round trip, every part is an
+    # index range: status / (status, created_at) / (user_id, ...) on print_jobs.
+    "dashboard_counters": """
+        SELECT
+            (SELECT COUNT(*) FROM print_jobs WHERE status = 'Pending') AS pending_count,
+            (SELECT COUNT(*) FROM print_jobs
+             WHERE status = 'Voided' AND created_at >= %s AND created_at < %s) AS voided_today,
+            (SELECT COUNT(*) FROM users u
+             WHERE EXISTS (SELECT 1 FROM print_jobs pj WHERE pj.user_id = u.user_id)) AS total_users,
+            NOW(6) AS server_time
+    """,
+    # Top rows of the status box: Pending, Approved, Voided, then the rest,
+    # each by job_id. params: (limit, limit, limit, limit, limit)
+    "dashboard_requests": """
+        SELECT job_id, user_id, pages, status, updated_at FROM (
+            (SELECT job_id, user_id, pages, status, updated_at, 1 AS priority
+             FROM print_jobs WHERE status = 'Pending' ORDER BY job_id LIMIT %s)
+            UNION ALL
+            (SELECT job_id, user_id, pages, status, updated_at, 2 AS priority
+             FROM print_jobs WHERE status = 'Approved' ORDER BY job_id LIMIT %s)
+            UNION ALL
+            (SELECT job_id, user_id, pages, status, updated_at, 3 AS priority
+             FROM print_jobs WHERE status = 'Voided' ORDER BY job_id LIMIT %s)
+            UNION ALL
+            (SELECT job_id, user_id, pages, status, updated_at, 4 AS priority
+             FROM print_jobs
+             WHERE status IS NULL OR status NOT IN ('Pending', 'Approved', 'Voided')
+             ORDER BY job_id LIMIT %s)
+        ) AS top_requests
+        ORDER BY priority, job_id
+        LIMIT %s
+    """,
+    # Rows inserted or updated since a (updated_at, job_id) cursor, oldest first.
+    # params: (updated_at, job_id, limit)
+    "dashboard_changes": """
+        SELECT job_id, user_id, pages, status, updated_at
+        FROM print_jobs
+        WHERE updated_at > %s OR (updated_at = %s AND job_id > %s)
+        ORDER BY updated_at, job_id
+        LIMIT %s
+    """,
+
+    # reports.py -- rollup keys are (day, status, paper_size, color_option[, user_id]).
+    # "Billable" jobs (revenue, pages printed, spend) are the Approved and Completed ones.
+    "report_job": """
+        SELECT job_id, user_id, status, paper_size, color_option, pages, total_amount, created_at
+        FROM print_jobs
+        WHERE job_id = %s
+        FOR UPDATE
+    """,
+    # params: (*key, user_id, jobs, pages, amount); rowcount 1 = new user in the cell, 2 = existing
+    "rollup_user_add": """
+        INSERT INTO report_user_daily (day, status, paper_size, color_option, user_id, jobs, pages, spend)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            jobs = jobs + VALUES(jobs), pages = pages + VALUES(pages), spend = spend + VALUES(spend)
+    """,
+    # params: (*key, jobs, pages, amount, new_users)
+    "rollup_daily_add": """
+        INSERT INTO report_daily (day, status, paper_size, color_option, jobs, pages, revenue, users)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            jobs = jobs + VALUES(jobs), pages = pages + VALUES(pages),
+            revenue = revenue + VALUES(revenue), users = users + VALUES(users)
+    """,
+    # params: (pages, amount, *key, user_id)
+    "rollup_user_remove": """
+        UPDATE report_user_daily
+        SET jobs = jobs - 1, pages = pages - %s, spend = spend - %s
+        WHERE day = %s AND status = %s AND paper_size = %s AND color_option = %s AND user_id = %s
+    """,
+    # params: (*key, user_id); rowcount 1 = the user left the cell
+    "rollup_user_prune": """
+        DELETE FROM report_user_daily
+        WHERE day = %s AND status = %s AND paper_size = %s AND color_option = %s AND user_id = %s
+          AND jobs <= 0
+    """,
+    # params: (pages, amount, users_left, *key)
+    "rollup_daily_remove": """
+        UPDATE report_daily
+        SET jobs = jobs - 1, pages = pages - %s, revenue = revenue - %s, users = users - %s
+        WHERE day = %s AND status = %s AND paper_size = %s AND color_option = %s
+    """,
+    "rollup_clear_user": "DELETE FROM report_user_daily WHERE day >= %s",
+    "rollup_clear_daily": "DELETE FROM report_daily WHERE day >= %s",
+    "rollup_backfill_user": """
+        INSERT INTO report_user_daily (day, status, paper_size, color_option, user_id, jobs, pages, spend)
+        SELECT DATE(created_at), COALESCE(status, ''), COALESCE(paper_size, ''),
+               COALESCE(color_option, ''), COALESCE(user_id, 0),
+               COUNT(*), COALESCE(SUM(pages), 0), COALESCE(SUM(total_amount), 0)
+        FROM print_jobs
+        WHERE created_at >= %s
+        GROUP BY 1, 2, 3, 4, 5
+    """,
+    "rollup_backfill_daily": """
+        INSERT INTO report_daily (day, status, paper_size, color_option, jobs, pages, revenue, users)
+        SELECT day, status, paper_size, color_option, SUM(jobs), SUM(pages), SUM(spend), COUNT(*)
+        FROM report_user_daily
+        WHERE day >= %s
+        GROUP BY day, status, paper_size, color_option
+    """,
+    # params: (first_day, day_after_last)
+    "report_summary": """
+        SELECT
+            COALESCE(SUM(jobs), 0) AS total_jobs,
+            COALESCE(SUM(CASE WHEN status IN ('Approved', 'Completed') THEN jobs END), 0) AS billable_jobs,
+            COALESCE(SUM(CASE WHEN status IN ('Approved', 'Completed') THEN pages END), 0) AS pages,
+            COALESCE(SUM(CASE WHEN status IN ('Approved', 'Completed') THEN revenue END), 0) AS revenue
+        FROM report_daily
+        WHERE day >= %s AND day < %s
+    """,
+    "report_revenue_by_day": """
+        SELECT day, SUM(CASE WHEN status IN ('Approved', 'Completed') THEN revenue ELSE 0 END) AS revenue
+        FROM report_daily
+        WHERE day >= %s AND day < %s
+        GROUP BY day
+        ORDER BY day
+    """,
+    # params: (first_day, day_after_last, limit)
+    "report_top_spenders": """
+        SELECT r.user_id, u.username,
+               SUM(r.jobs) AS jobs, SUM(r.pages) AS pages, SUM(r.spend) AS spend
+        FROM report_user_daily r
+        LEFT JOIN users u ON u.user_id = r.user_id
+        WHERE r.day >= %s AND r.day < %s AND r.status IN ('Approved', 'Completed')
+        GROUP BY r.user_id, u.username
+        ORDER BY spend DESC
+        LIMIT %s
+    """,
+}
+
+
+# --- Connection Pool ---
+class _PooledConnection:
+    """A pooled connection plus the prepared statements created on it."""
+
+    def __init__(self):
+        self.cnx = mysql.connector.connect(**DB_CONFIG)
+        self.statements = {}  # sql -> prepared cursor
+        self.returned_at = time.monotonic()  # when it last went back to the pool
+
+    def cursor_for(self, sql):
+        """Returns a prepared cursor for `sql`, preparing it only once."""
+        cursor = self.statements.get(sql)
+        if cursor is None:
+            cursor = self.cnx.cursor(prepared=True)
+            self.statements[sql] = cursor
+        return cursor
+
+    def ensure_alive(self):
+        """Reconnects if the server dropped the connection (prepared statements die with it).
+
+        is_connected() costs a round trip (COM_PING), so only connections that
+        sat idle for IDLE_PING_SECONDS are checked.
+        """
+        if time.monotonic() - self.returned_at < IDLE_PING_SECONDS:
+            return
+        if not self.cnx.is_connected():
+            self.statements.clear()
+            self.cnx.reconnect(attempts=2, delay=0)
+
+    def close(self):
+        for cursor in self.statements.values():
+            try:
+                cursor.close()
+            except Error:
+                pass
+        self.statements.clear()
+        self.cnx.close()
+
+
+_idle = queue.LifoQueue()
+_slots = threading.BoundedSemaphore(POOL_SIZE)
+
+
+@contextmanager
+def connection():
+    """Borrows a connection from the pool and gives it back afterwards."""
+    if not _slots.acquire(timeout=POOL_TIMEOUT):
+        raise mysql.connector.errors.PoolError("No free database connection in the pool.")
+    try:
+        try:
+            conn = _idle.get_nowait()
+            conn.ensure_alive()
+        except queue.Empty:
+            conn = _PooledConnection()
+    except BaseException:
+        _slots.release()
+        raise
+
+    try:
+        yield conn
+    except BaseException:
+        # Leave the connection clean for the next borrower.
+        try:
+            conn.cnx.rollback()
+        except Error:
+            conn.close()
+            conn = None
+        raise
+    finally:
+        if conn is not None:
+            conn.returned_at = time.monotonic()
+            _idle.put(conn)
+        _slots.release()
+
+
+def close_pool():
+    """Closes every idle pooled connection (used on application exit)."""
+    while True:
+        try:
+            _idle.get_nowait().close()
+        except queue.Empty:
+            return
+
+
+# --- Query Statistics ---
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(name, started, rows):
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _stats_lock:
+        entry = _stats.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0})
+        entry["calls"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["rows"] += rows
+    if elapsed_ms >= SLOW_QUERY_MS:
+        print(f"[db] slow query '{name}': {elapsed_ms:.1f} ms, {rows} row(s)")
+
+
+def query_stats():
+    """Returns {query name: {calls, total_ms, avg_ms, max_ms, rows}}."""
+    with _stats_lock:
+        return {
+            name: dict(entry, avg_ms=entry["total_ms"] / entry["calls"])
+            for name, entry in _stats.items()
+        }
+
+
+def reset_query_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def print_query_stats():
+    """Prints the per-query statistics, slowest total first."""
+    stats = sorted(query_stats().items(), key=lambda item: item[1]["total_ms"], reverse=True)
+    print(f"{'query':<28}{'calls':>7}{'avg ms':>10}{'max ms':>10}{'rows':>9}")
+    for name, entry in stats:
+        print(f"{name:<28}{entry['calls']:>7}{entry['avg_ms']:>10.1f}{entry['max_ms']:>10.1f}{entry['rows']:>9}")
+
+
+# --- Query Helpers ---
+def _run(conn, name, params):
+    """Executes the named query on `conn` and returns its cursor."""
+    cursor = conn.cursor_for(QUERIES[name])
+    cursor.execute(QUERIES[name], tuple(params))
+    return cursor
+
+
+def _as_dicts(cursor):
+    columns = cursor.column_names
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def fetch_all(name, params=()):
+    """Runs a named SELECT and returns its rows as a list of dicts."""
+    started = time.perf_counter()
+    with connection() as conn:
+        rows = _as_dicts(_run(conn, name, params))
+        conn.cnx.commit()  # end the read so the next one sees fresh data
+    _record(name, started, len(rows))
+    return rows
+
+
+def fetch_one(name, params=()):
+    """Runs a named SELECT and returns the first row as a dict, or None."""
+    rows = fetch_all(name, params)
+    return rows[0] if rows else None
+
+
+def fetch_value(name, params=()):
+    """Runs a named SELECT and returns the first column of the first row."""
+    row = fetch_one(name, params)
+    return next(iter(row.values())) if row else None
+
+
+def execute(name, params=()):
+    """Runs a named INSERT/UPDATE/DELETE, commits, and returns (rowcount, lastrowid)."""
+    started = time.perf_counter()
+    with connection() as conn:
+        cursor = _run(conn, name, params)
+        result = (cursor.rowcount, cursor.lastrowid)
+        conn.cnx.commit()
+    _record(name, started, result[0])
+    return result
+
+
+class Transaction:
+    """Runs several named statements on one pooled connection, committed together."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, name, params=()):
+        started = time.perf_counter()
+        cursor = _run(self._conn, name, params)
+        _record(name, started, cursor.rowcount)
+        return cursor.rowcount, cursor.lastrowid
+
+    def executemany(self, name, seq_of_params):
+        """Runs a named statement for every params tuple; returns (rowcount, lastrowid).
+
+        INSERTs are sent as one multi-row statement, so lastrowid is the id of the first row.
+        """
+        started = time.perf_counter()
+        cursor = self._conn.cnx.cursor()
+        try:
+            cursor.executemany(QUERIES[name], [tuple(p) for p in seq_of_params])
+            result = (cursor.rowcount, cursor.lastrowid)
+        finally:
+            cursor.close()
+        _record(name, started, result[0])
+        return result
+
+    def fetch_all(self, name, params=()):
+        started = time.perf_counter()
+        rows = _as_dicts(_run(self._conn, name, params))
+        _record(name, started, len(rows))
+        return rows
+
+
+@contextmanager
+def transaction():
+    """Yields a Transaction; commits on success, rolls back on any error."""
+    with connection() as conn:
+        yield Transaction(conn)
+        conn.cnx.commit()
@@ -0,0 +1,203 @@
+# Content-addressed store for uploaded print files.
+#
+# printer.py used to record only the customer's local path, so admin_print
+# could only "download" a file on the machine it was uploaded from.  Uploads
+# are now streamed into a shop-owned directory while being hashed:
+#
+#   <STORE_PATH>/ab/cd/abcd...ef    (the SHA-256 of the content)
+#
+# Identical content is stored once.  files.file_path holds the path relative
+# to the store, and a GC pass removes rows and blobs no job references any more.
+#
+# The store must be a folder every counter PC and the admin PC can reach (a
+# network share): set COPY_CORNER_FILE_STORE on each machine.  There is no
+# per-machine default, because a local folder would bring back the "file only
+# exists where it was uploaded" problem.
+#
+# Usage:  python filestore.py --gc   (remove unreferenced rows and blobs)
+
+import hashlib
+import os
+import sys
+import time
+from pathlib import Path
+
+import db
+
+STORE_ENV = "COPY_CORNER_FILE_STORE"
+CHUNK_SIZE = 1024 * 1024  # bytes read/written per step
+GC_GRACE_SECONDS = 3600  # never collect blobs younger than this (an upload may still be committing)
+
+
+class StoreNotConfigured(RuntimeError):
+    pass
+
+
+def store_path():
+    """The shared store folder; refuses to guess one when it is not configured."""
+    configured = os.environ.get(STORE_ENV)
+    if not configured:
+        raise StoreNotConfigured(
+            f"{STORE_ENV} is not set. Point it at the shared folder that holds uploaded files."
+        )
+    return Path(configured)
+
+
+def blob_path(sha256):
+    return Path(sha256[:2]) / sha256[2:4] / sha256
+
+
+# --- Ingest ---
+def ingest(source_path, progress=None):
+    """Streams a file into the store while hashing it.
+
+    Returns {"sha256", "size", "path"} where path is relative to the store.
+    If the content is already stored the new copy is dropped.
+    progress(done_bytes, total_bytes) is called after every chunk.
+    """
+    store = store_path()
+    incoming = store / "incoming"
+    incoming.mkdir(parents=True, exist_ok=True)
+    total = os.path.getsize(source_path)
+    digest = hashlib.sha256()
+    temp_path = incoming / f"{os.getpid()}-{time.monotonic_ns()}.part"
+
+    try:
+        with open(source_path, "rb") as src, open(temp_path, "wb") as dst:
+            done = 0
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                dst.write(chunk)
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
+
+        sha256 = digest.hexdigest()
+        relative = blob_path(sha256)
+        target = store / relative
+        if target.exists():
+            os.utime(target)  # restart the GC grace period: a new row is about to reference it
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_path, target)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+    return {"sha256": sha256, "size": done, "path": relative.as_posix()}
+
+
+def attach_many(tx, user_id, uploads):
+    """Returns the file_id for each (file_name, blob) in uploads, in order.
+
+    The user's existing row for the same name and content is reused, new rows
+    are inserted, all in one multi-row upsert; only the batch's rows are read
+    and locked.  Must run in the transaction that inserts the print jobs using
+    the files (one job per upload).
+    """
+    distinct = {_blob_key(blob["sha256"], file_name): (file_name, blob) for file_name, blob in uploads}
+    tx.executemany("file_insert", [
+        (user_id, file_name, blob["path"], os.path.splitext(file_name)[1].lower().replace(".", ""),
+         blob["sha256"], blob["size"])
+        for file_name, blob in distinct.values()
+    ])
+
+    file_ids = {}  # _blob_key -> file_id
+    hashes = sorted({sha256 for sha256, _ in distinct})
+    for start in range(0, len(hashes), db.FILE_LOOKUP_SIZE):
+        chunk = hashes[start:start + db.FILE_LOOKUP_SIZE]
+        chunk += [None] * (db.FILE_LOOKUP_SIZE - len(chunk))
+        for row in tx.fetch_all("file_batch_ids", (user_id, *chunk)):
+            file_ids[_blob_key(row["sha256"], row["file_name"])] = row["file_id"]
+    return [file_ids[_blob_key(blob["sha256"], file_name)] for file_name, blob in uploads]
+
+
+def _blob_key(sha256, file_name):
+    """Equal exactly when uq_files_user_blob sees a duplicate: file_name is
+    utf8mb4_bin, which is case and accent sensitive but ignores trailing spaces."""
+    return sha256, file_name.rstrip(" ")
+
+
+# --- Download ---
+def source_of(file_record):
+    """Where a files row's content lives (old rows only know the uploader's local path)."""
+    if file_record.get("sha256"):
+        return store_path() / file_record["file_path"]
+    return Path(file_record["file_path"])
+
+
+def copy_out(file_record, save_path, progress=None):
+    """Copies a stored file to save_path in chunks; progress(done, total) per chunk.
+
+    Uses os.sendfile where the platform supports file-to-file copies.
+    """
+    source = source_of(file_record)
+    if not source.exists():
+        raise FileNotFoundError(f"File not found: {source}")
+    total = source.stat().st_size
+    done = 0
+    with open(source, "rb") as src, open(save_path, "wb") as dst:
+        if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+            while done < total:
+                sent = os.sendfile(dst.fileno(), src.fileno(), done, min(CHUNK_SIZE, total - done))
+                if sent == 0:
+                    break
+                done += sent
+                if progress:
+                    progress(done, total)
+        else:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                dst.write(chunk)
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
+    return done
+
+
+# --- Garbage Collection ---
+def collect_garbage(grace_seconds=GC_GRACE_SECONDS):
+    """Deletes files rows no print job uses, then blobs no row references.
+
+    Returns (rows removed, blobs removed, bytes freed).
+    """
+    store = store_path()
+    rows_removed, _ = db.execute("file_gc_rows")
+    live = {row["sha256"] for row in db.fetch_all("file_live_hashes")}
+
+    blobs_removed = bytes_freed = 0
+    cutoff = time.time() - grace_seconds
+    for path in store.glob("??/??/*"):
+        if path.name in live or not path.is_file():
+            continue
+        stat = path.stat()
+        if stat.st_mtime > cutoff:
+            continue
+        path.unlink()
+        blobs_removed += 1
+        bytes_freed += stat.st_size
+
+    # Leftovers of uploads that crashed half way
+    for path in (store / "incoming").glob("*.part"):
+        if path.stat().st_mtime <= cutoff:
+            path.unlink()
+    return rows_removed, blobs_removed, bytes_freed
+
+
+if __name__ == "__main__":
+    if "--gc" not in sys.argv:
+        print("Usage: python filestore.py --gc")
+        sys.exit(2)
+    try:
+        rows, blobs, freed = collect_garbage()
+        print(f"Removed {rows} file row(s) and {blobs} blob(s), freed {freed / 1024 / 1024:.1f} MB.")
+    except (db.Error, StoreNotConfigured) as err:
+        print(f"File GC failed: {err}")
+        sys.exit(1)
+    finally:
+        db.close_pool()
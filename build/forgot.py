@@ -1,8 +1,7 @@
 from pathlib import Path
-from tkinter import Tk, Canvas, Entry, messagebox
-import mysql.connector
-import subprocess
-import sys
+from tkinter import Canvas, Entry, messagebox
+import app
+import db
 import smtplib
 import random
 from email.mime.text import MIMEText
@@ -43,26 +42,10 @@ class PlaceholderEntry(Entry):
             self.put_placeholder()
 
 
-# --- Database Connection ---
-def get_db_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="",
-        database="printing_system"
-    )
-
-
 # --- Check if Email Exists ---
 def email_exists(email):
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE email=%s", (email,))
-        result = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        return result is not None
+        return db.fetch_one("user_by_email", (email,)) is not None
     except Exception as e:
         messagebox.showerror("Database Error", str(e))
         return False
@@ -199,24 +182,17 @@ def reset_password(email):
         return
 
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE users SET password=%s WHERE email=%s", (new_pass, email))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        db.execute("user_password_reset", (new_pass, email))
 
         messagebox.showinfo("Success", "Password has been reset successfully!")
-        window.destroy()
-        subprocess.Popen([sys.executable, "login.py"])
+        app.show("login")
     except Exception as e:
         messagebox.showerror("Database Error", str(e))
 
 
 # --- GO BACK ---
 def go_back():
-    window.destroy()
-    subprocess.Popen([sys.executable, "login.py"])
+    app.show("login")
 
 
 # --- Round Rectangle Helper ---
@@ -304,7 +280,7 @@ def create_rounded_button(x, y, text, command, width=150, height=35, bg="#000000
 
 
 # --- UI ---
-window = Tk()
+window = app.create_window()
 # --- Center the Window ---
 window_width = 859
 window_height = 534
@@ -350,4 +326,3 @@ entry_new_password, _ = create_rounded_entry(400, 259, placeholder="New Password
 entry_confirm_password, _ = create_rounded_entry(400, 312, placeholder="Confirm Password", show_char="*", with_eye=True)
 
 window.resizable(False, False)
-window.mainloop()
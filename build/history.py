@@ -1,21 +1,14 @@
 from pathlib import Path
-from tkinter import Tk, Canvas, PhotoImage, messagebox, Frame, Label, Scrollbar, ttk
+from tkinter import Canvas, PhotoImage, messagebox, Frame, Label, Scrollbar, ttk
 import tkinter as tk # Use tk alias
-import subprocess
-import sys
-import mysql.connector
 from datetime import datetime
+import app
+import db
+import printjobs
 
-# --- Get User ID and Fullname from Arguments ---
-user_id = None
-fullname = "User" # Default
-if len(sys.argv) > 1:
-    try:
-        user_id = int(sys.argv[1]) # Expect user_id as the first argument
-    except ValueError:
-        print("Warning: First argument should be user_id (integer).")
-if len(sys.argv) > 2:
-    fullname = sys.argv[2] # Fullname as the second argument
+# --- Get User ID and Fullname from the session ---
+user_id = app.session["user_id"]
+fullname = app.session["fullname"]
 
 
 OUTPUT_PATH = Path(__file__).parent
@@ -34,21 +27,6 @@ WHITE = "#FFFFFF"
 BLACK = "#000000"
 LIGHT_GRAY = "#DDDDDD"
 
-# --- Database Connection ---
-def get_db_connection():
-    """Creates and returns a connection to the MySQL database."""
-    try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="copy_corner_db"
-        )
-        return connection
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", f"Failed to connect to database: {err}")
-        return None
-
 # --- Fetch and Display History Function (MODIFIED) ---
 def fetch_and_display_history(frame, target_user_id):
     """Fetches print job history for the user and displays it in the scrollable frame."""
@@ -61,24 +39,9 @@ def fetch_and_display_history(frame, target_user_id):
                font=("Inter Bold", 16), bg=WHITE, fg="red").pack(pady=20, padx=10)
          return
 
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return
-
-        cursor = conn.cursor(dictionary=True)
-        # Query print jobs for the specific user, join with files to get filename
-        # Order by submission date, newest first
-        sql_query = """
-            SELECT pj.job_id, f.file_name, pj.created_at
-            FROM print_jobs pj
-            LEFT JOIN files f ON pj.file_id = f.file_id
-            WHERE pj.user_id = %s
-            ORDER BY pj.created_at DESC
-        """
-        cursor.execute(sql_query, (target_user_id,))
-        history = cursor.fetchall()
+        # Print jobs for the specific user with their filename, newest first
+        history = printjobs.fetch_history(target_user_id)
 
         if not history:
              Label(frame, text="No print history found.",
@@ -123,14 +86,8 @@ def fetch_and_display_history(frame, target_user_id):
             row_index += 2
             item_number += 1
 
-    except mysql.connector.Error as err:
+    except db.Error as err:
         messagebox.showerror("Database Error", f"Failed to fetch history: {err}")
-    finally:
-        if conn and conn.is_connected():
-            # cursor should be closed before connection if it exists
-            if 'cursor' in locals() and cursor:
-                 cursor.close()
-            conn.close()
 
 
 # --- Scrollbar Helper Functions ---
@@ -159,13 +116,12 @@ def round_rectangle(canvas, x1, y1, x2, y2, r=15, **kwargs):
 def open_printer_py():
     if user_id is None:
         messagebox.showerror("Error", "User ID not found. Cannot go back.")
-        window.destroy()
+        app.show("login")
         return
-    window.destroy()
-    subprocess.Popen([sys.executable, "printer.py", str(user_id), fullname])
+    app.show("printer")
 
 # --- Window Setup ---
-window = Tk()
+window = app.create_window()
 window.title("History")
 
 window_width = 900
@@ -223,8 +179,8 @@ history_canvas.bind( # Make content frame fill canvas width
     "<Configure>",
     lambda e: history_canvas.itemconfig(history_content_frame_window, width=e.width)
 )
-# Bind mousewheel scrolling globally directed to this canvas
-window.bind_all(
+# Bind mousewheel scrolling on this screen's window, directed to this canvas
+window.bind(
     "<MouseWheel>",
     lambda event: on_mousewheel(event, history_canvas)
 )
@@ -252,5 +208,9 @@ for tag in (back_rect, back_text):
 fetch_and_display_history(history_content_frame, user_id) # Call the function
 
 
-window.resizable(False, False)
-window.mainloop()
\ No newline at end of file
+# --- Called by the app shell each time the cached screen is shown again ---
+def on_show():
+    fetch_and_display_history(history_content_frame, user_id)
+
+
+window.resizable(False, False)
\ No newline at end of file
@@ -0,0 +1,71 @@
+# Notification storage shared by Notification.py and admin_notification.py.
+#
+# A notification for one user is a notifications row with that user_id and
+# its own Read/Unread status.  A broadcast ("All User") is a single row with
+# user_id NULL: nothing is written per user until that user opens or clears
+# it, which inserts a notification_receipts row (fan-out on read).
+#
+# Unread counts are maintained, not counted:
+#   unread = notification_counts.unread_direct
+#          + counters['broadcasts'] - notification_counts.read_broadcasts
+
+import sys
+
+import db
+
+PAGE_SIZE = 20  # notifications per feed page
+NO_CURSOR = sys.maxsize  # "before" value of the first page
+
+
+def send_to_user(user_id, subject, message):
+    with db.transaction() as tx:
+        _, notif_id = tx.execute("notification_insert", (user_id, subject, message))
+        tx.execute("notification_count_sent", (user_id,))
+    return notif_id
+
+
+def broadcast(subject, message):
+    """Sends to every user with one insert, however many users there are."""
+    with db.transaction() as tx:
+        _, notif_id = tx.execute("notification_insert", (None, subject, message))
+        tx.execute("broadcast_count_add")
+    return notif_id
+
+
+def fetch_page(user_id, before=None, limit=PAGE_SIZE):
+    """Returns up to `limit` notifications older than notif_id `before`, newest first.
+
+    Each row has notif_id, subject, message, created_at, status and broadcast.
+    """
+    before = before or NO_CURSOR
+    return db.fetch_all("notification_page", (user_id, before, limit, user_id, before, limit, limit))
+
+
+def unread_count(user_id):
+    return db.fetch_value("notification_unread_count", (user_id,)) or 0
+
+
+def mark_read(user_id, notification):
+    """Marks one notification read for this user; returns True if it was unread."""
+    with db.transaction() as tx:
+        if notification["broadcast"]:
+            changed, _ = tx.execute("notification_receipt_insert", (user_id, notification["notif_id"]))
+            if changed:
+                tx.execute("notification_count_read_broadcasts", (user_id, changed))
+        else:
+            changed, _ = tx.execute("notification_mark_read", (notification["notif_id"], user_id))
+            if changed:
+                tx.execute("notification_count_read", (changed, user_id))
+    return changed > 0
+
+
+def clear(user_id):
+    """Marks everything the user has not read yet as read; returns how many."""
+    with db.transaction() as tx:
+        direct, _ = tx.execute("notifications_clear", (user_id,))
+        if direct:
+            tx.execute("notification_count_read", (direct, user_id))
+        broadcasts, _ = tx.execute("notification_receipts_clear", (user_id, user_id))
+        if broadcasts:
+            tx.execute("notification_count_read_broadcasts", (user_id, broadcasts))
+    return direct + broadcasts
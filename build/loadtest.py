@@ -0,0 +1,380 @@
+# Load test for the copy_corner_db hot paths.
+#
+# Creates a separate database (never the application's own), seeds it with a
+# reproducible synthetic workload and times, without opening any window, the
+# database work done by the busiest screen functions:
+#
+#   admin_print     fetch_print_jobs / filter_print_jobs
+#   admin_user      fetch_users / fetch_user_details (and the user search)
+#   Notification    fetch_notifications
+#   history         fetch_and_display_history
+#   admin_dashboard the dashboard counters
+#
+# The screens build their Tk windows on import, so each case below calls the
+# Tk-free function its screen uses (printjobs, accounts, userindex, inbox).
+# Results -- latency percentiles, queries per call, rows per call and peak
+# memory -- are printed as JSON and can be written to a file to compare
+# versions.
+#
+# Usage:  python loadtest.py                                  (seed if empty, then run)
+#         python loadtest.py --users 100000 --jobs 1000000 --reseed
+#         python loadtest.py --iterations 50 --output before.json
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    import resource  # POSIX only
+except ImportError:
+    resource = None
+
+import mysql.connector
+
+import accounts
+import db
+import inbox
+import migrate
+import printjobs
+import reports
+import userindex
+
+BENCH_DATABASE = "copy_corner_bench"
+BASE_SCHEMA = "000_base_schema.sql"  # tables only; the later migrations run after seeding
+BATCH_SIZE = 5000  # rows per multi-row INSERT while seeding
+HISTORY_DAYS = 365  # seeded jobs are spread over this many days up to now
+HEAVY_USER_SHARE = 0.001  # fraction of users that are "heavy" customers...
+HEAVY_JOB_SHARE = 0.2  # ...and the fraction of all jobs they submit
+WARMUP_CALLS = 3  # untimed calls per case (fills the pool and statement cache)
+PERCENTILES = (50, 90, 95, 99)
+
+FIRST_NAMES = ("Ana", "Ben", "Carlo", "Dana", "Elena", "Franco", "Grace", "Hector", "Isabel", "Jose",
+               "Karen", "Luis", "Maria", "Noel", "Olivia", "Paolo", "Rosa", "Sam", "Tess", "Victor")
+LAST_NAMES = ("Santos", "Reyes", "Cruz", "Bautista", "Garcia", "Mendoza", "Torres", "Flores",
+              "Ramos", "Villanueva", "Castillo", "Aquino", "Navarro", "Dela Cruz", "Gonzales")
+STATUSES = (("Completed", 60), ("Approved", 15), ("Pending", 15), ("Voided", 10))
+PAPER_SIZES = (("A4", 50), ("Short", 35), ("Long", 15))
+COLORS = (("Black & White", 65), ("Partially Colored", 20), ("Color", 15))
+
+
+# --- Database Setup ---
+def use_database(name, reseed=False):
+    """Points db.py at `name`, creating it (or dropping it first with reseed=True)."""
+    if name == db.DB_CONFIG["database"]:
+        raise SystemExit(f"Refusing to load test the application database '{name}'; use --database.")
+    server = {key: value for key, value in db.DB_CONFIG.items() if key != "database"}
+    cnx = mysql.connector.connect(**server)
+    try:
+        cursor = cnx.cursor()
+        if reseed:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{name}`")
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{name}`")
+        cursor.close()
+    finally:
+        cnx.close()
+    db.close_pool()
+    db.DB_CONFIG["database"] = name
+
+
+DATASET_TABLES = ("users", "files", "print_jobs", "notifications", "notification_receipts")
+
+
+def table_counts(tables=DATASET_TABLES):
+    counts = {}
+    with db.connection() as conn:
+        cursor = conn.cnx.cursor()
+        try:
+            for table in tables:
+                cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                counts[table] = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+        conn.cnx.commit()
+    return counts
+
+
+# --- Seeding ---
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return lambda: rng.choices(values, weights)[0]
+
+
+def _insert_batches(sql, rows, label):
+    """Inserts rows (any iterable) BATCH_SIZE at a time, committing each batch."""
+    done = 0
+    with db.connection() as conn:
+        cursor = conn.cnx.cursor()
+        try:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == BATCH_SIZE:
+                    cursor.executemany(sql, batch)
+                    conn.cnx.commit()
+                    done += len(batch)
+                    batch.clear()
+                    if done % (BATCH_SIZE * 20) == 0:
+                        print(f"  {label}: {done:,}")
+            if batch:
+                cursor.executemany(sql, batch)
+                conn.cnx.commit()
+                done += len(batch)
+        finally:
+            cursor.close()
+    print(f"  {label}: {done:,} done")
+
+
+def _users(rng, count, start):
+    for user_id in range(1, count + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        username = f"{first}{last.replace(' ', '')}{user_id}".lower()
+        created_at = start + timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+        yield (user_id, f"{first} {last}", username, f"09{rng.randrange(10 ** 9):09d}",
+               f"{username}@example.com", "password", created_at)
+
+
+def _jobs(seed_value, users, jobs, start, end):
+    """(file row, job row) pairs in job_id order; created_at grows with job_id.
+
+    Files and jobs are inserted in two passes over the same seeded sequence.
+    """
+    rng = random.Random(seed_value)
+    heavy_users = max(1, int(users * HEAVY_USER_SHARE))
+    status, paper_size, color = _weighted(rng, STATUSES), _weighted(rng, PAPER_SIZES), _weighted(rng, COLORS)
+    step = (end - start) / max(jobs, 1)
+    for job_id in range(1, jobs + 1):
+        if rng.random() < HEAVY_JOB_SHARE:
+            user_id = rng.randint(1, heavy_users)
+        else:
+            user_id = rng.randint(1, users)
+        created_at = start + step * job_id
+        file_name = f"document_{job_id}.pdf"
+        file_row = (job_id, user_id, file_name, f"C:/Users/customer/Documents/{file_name}", "pdf", created_at)
+        # total_amount is left NULL: migration 006 prices every job from the price matrix
+        job_row = (job_id, user_id, job_id, rng.randint(1, 40), paper_size(), color(), rng.randint(1, 3),
+                   status(), "", created_at)
+        yield file_row, job_row
+
+
+def _notifications(rng, users, direct, broadcasts, start, end):
+    total = direct + broadcasts
+    step = (end - start) / max(total, 1)
+    broadcast_every = total // broadcasts if broadcasts else 0
+    for notif_id in range(1, total + 1):
+        created_at = start + step * notif_id
+        if broadcast_every and notif_id % broadcast_every == 0:
+            yield (notif_id, None, f"Announcement #{notif_id}", "The shop will be closed on Sunday.",
+                   "Unread", created_at)
+        else:
+            status = "Read" if rng.random() < 0.7 else "Unread"
+            yield (notif_id, rng.randint(1, users), f"Request update #{notif_id}",
+                   "Your print request has been updated.", status, created_at)
+
+
+def seed(users, jobs, notifications, broadcasts, seed_value):
+    """Fills the base tables, then lets the numbered migrations index and backfill them.
+
+    Rows are inserted the way pre-migration data looked (files without a
+    content hash, jobs without an amount), so the migrations derive
+    updated_at, the notification counters and total_amount.
+    """
+    rng = random.Random(seed_value)
+    end = datetime.now().replace(microsecond=0)
+    start = end - timedelta(days=HISTORY_DAYS)
+
+    print(f"Seeding {users:,} users, {jobs:,} print jobs, {notifications:,} notifications...")
+    _insert_batches("""
+        INSERT INTO users (user_id, fullname, username, contact, email, password, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """, _users(rng, users, start), "users")
+    _insert_batches("INSERT INTO admin_login (admin_username, admin_password) VALUES (%s, %s)",
+                    [("admin", "admin")], "admins")
+
+    _insert_batches("""
+        INSERT INTO files (file_id, user_id, file_name, file_path, file_type, uploaded_at)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, (file_row for file_row, _ in _jobs(seed_value + 1, users, jobs, start, end)), "files")
+    _insert_batches("""
+        INSERT INTO print_jobs
+        (job_id, user_id, file_id, pages, paper_size, color_option, copies, status, notes, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, (job_row for _, job_row in _jobs(seed_value + 1, users, jobs, start, end)), "print jobs")
+
+    _insert_batches("""
+        INSERT INTO notifications (notif_id, user_id, subject, message, status, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, _notifications(rng, users, notifications, broadcasts, start, end), "notifications")
+
+    print("Applying migrations (indexes, counters, prices)...")
+    migrate.migrate()
+    print(f"Rebuilt {reports.rebuild():,} rollup cell(s).")
+
+
+# --- Cases (each calls the data function behind one screen function) ---
+def build_cases(rng, users):
+    """Returns {name: callable}; parameters are drawn once per call from a seeded RNG."""
+    heavy_users = max(1, int(users * HEAVY_USER_SHARE))
+    usernames = [row["username"] for row in userindex.search("", 1000)] or ["a"]
+    first_job = printjobs.fetch_print_jobs(limit=1)
+    newest = first_job[0]["created_at"] if first_job else datetime.now()
+
+    def typical_user():
+        return rng.randint(heavy_users + 1, max(users, heavy_users + 1))
+
+    def heavy_user():
+        return rng.randint(1, heavy_users)
+
+    def prefix():
+        return rng.choice(usernames)[:3]
+
+    def deep_cursor():
+        return newest - timedelta(days=rng.randrange(1, HISTORY_DAYS)), 2 ** 31
+
+    return {
+        # admin_print.fetch_print_jobs: first page, then a page deep in the history
+        "fetch_print_jobs.first_page": lambda: printjobs.fetch_print_jobs(),
+        "fetch_print_jobs.deep_page": lambda: printjobs.fetch_print_jobs(after=deep_cursor()),
+        # admin_print.filter_print_jobs -> JobTable.reset -> the first filtered page
+        "filter_print_jobs.status": lambda: printjobs.fetch_print_jobs("", "Pending"),
+        "filter_print_jobs.username": lambda: printjobs.fetch_print_jobs(prefix()),
+        "filter_print_jobs.username_status": lambda: printjobs.fetch_print_jobs(prefix(), "Voided"),
+        # admin_user.fetch_users (a cold load of the shared index) and run_user_search
+        "fetch_users": lambda: userindex.load(force=True),
+        "run_user_search": lambda: userindex.search(prefix(), userindex.RESULT_LIMIT),
+        # admin_user.fetch_user_details
+        "fetch_user_details.typical_user": lambda: accounts.fetch_user_details(typical_user()),
+        "fetch_user_details.heavy_user": lambda: accounts.fetch_user_details(heavy_user()),
+        # Notification.fetch_notifications (+ the unread badge shown with it)
+        "fetch_notifications": lambda: inbox.fetch_page(typical_user()),
+        "notification_unread_count": lambda: inbox.unread_count(typical_user()),
+        # history.fetch_and_display_history
+        "fetch_and_display_history.typical_user": lambda: printjobs.fetch_history(typical_user()),
+        "fetch_and_display_history.heavy_user": lambda: printjobs.fetch_history(heavy_user()),
+        # admin_dashboard.load_counters / load_dashboard
+        "dashboard_counters": printjobs.dashboard_counters,
+        "dashboard_requests": printjobs.dashboard_requests,
+    }
+
+
+# --- Measuring ---
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+def measure(func, iterations):
+    for _ in range(WARMUP_CALLS):
+        func()
+
+    db.reset_query_stats()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    stats = db.query_stats()
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    result = {f"p{pct}_ms": round(percentile(timings, pct), 3) for pct in PERCENTILES}
+    result.update(
+        mean_ms=round(sum(timings) / len(timings), 3),
+        max_ms=round(timings[-1], 3),
+        calls=iterations,
+        queries_per_call=round(sum(entry["calls"] for entry in stats.values()) / iterations, 2),
+        rows_per_call=round(sum(entry["rows"] for entry in stats.values()) / iterations, 1),
+        queries={name: entry["calls"] for name, entry in sorted(stats.items())},
+        peak_alloc_kb=round(peak / 1024, 1),
+    )
+    return result
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process, or None where `resource` is missing (Windows)."""
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    use_database(args.database, reseed=args.reseed)
+    migrate.migrate(upto=BASE_SCHEMA)
+    if table_counts(("users",))["users"] == 0:
+        seed(args.users, args.jobs, args.notifications, args.broadcasts, args.seed)
+    else:
+        migrate.migrate()
+        print("Using the existing data (pass --reseed to regenerate it).")
+
+    userindex.load()
+    rng = random.Random(args.seed + 2)
+    cases = build_cases(rng, userindex.count())
+    if args.only:
+        cases = {name: func for name, func in cases.items() if any(part in name for part in args.only)}
+
+    results = {}
+    for name, func in cases.items():
+        results[name] = measure(func, args.iterations)
+        print(f"  {name:42} p50 {results[name]['p50_ms']:9.2f} ms   p95 {results[name]['p95_ms']:9.2f} ms"
+              f"   {results[name]['queries_per_call']:5.2f} queries")
+
+    report = {
+        "revision": git_revision(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {key: getattr(args, key) for key in
+                   ("database", "users", "jobs", "notifications", "broadcasts", "seed", "iterations")},
+        "dataset": table_counts(),
+        "results": results,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        print(f"Wrote {args.output}")
+    else:
+        print(output)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Seed a benchmark database and time the hot paths.")
+    parser.add_argument("--database", default=BENCH_DATABASE, help="database to create and use")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--notifications", type=int, default=50_000, help="notifications sent to one user")
+    parser.add_argument("--broadcasts", type=int, default=200, help="notifications sent to all users")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (same seed, same data)")
+    parser.add_argument("--reseed", action="store_true", help="drop and regenerate the database")
+    parser.add_argument("--iterations", type=int, default=30, help="timed calls per case")
+    parser.add_argument("--only", nargs="*", help="run only cases whose name contains one of these")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        run(parse_args(sys.argv[1:]))
+    except db.Error as err:
+        print(f"Load test failed: {err}")
+        sys.exit(1)
+    finally:
+        db.close_pool()
@@ -6,10 +6,16 @@ from pathlib import Path
 import tkinter as tk
 # from tkinter import *
 # Explicit imports to satisfy Flake8
-from tkinter import Tk, Canvas, Entry, Text, Button, PhotoImage, messagebox, font
-import mysql.connector
-import subprocess
+from tkinter import Canvas, Entry, Text, Button, PhotoImage, messagebox, font
 import sys
+import app
+import db
+
+# Running "python login.py" still starts the application; the shell then imports
+# this module as the "login" screen.
+if __name__ == "__main__":
+    app.main()
+    sys.exit()
 
 # --- Placeholder Entry Class ---
 from tkinter import Entry
@@ -45,25 +51,13 @@ class PlaceholderEntry(Entry):
             self.put_placeholder()
 
 
-# --- Database Connection ---
-def get_db_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="",
-        database="copy_corner_db"
-    )
-
-
 # --- Open Register Window ---
 def open_register():
-    window.destroy()
-    subprocess.Popen([sys.executable, "register.py"])
+    app.show("register")
 
 
 def open_forgot():
-    window.destroy()
-    subprocess.Popen([sys.executable, "forgot.py"])
+    app.show("forgot")
 
 
 # --- Login Function ---
@@ -82,45 +76,29 @@ def login_user():
         return
 
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-
         if role == "User":
-            cursor.execute("""
-                SELECT user_id, fullname FROM users
-                WHERE (username = %s OR email = %s) AND password = %s
-            """, (username_or_email, username_or_email, password))
-            user = cursor.fetchone()
+            user = db.fetch_one("login_user", (username_or_email, username_or_email, password))
 
             if user:
                 user_id = user['user_id']
                 fullname = user['fullname']
                 messagebox.showinfo("Success", f"Welcome {fullname}!")
-                window.destroy()
-                subprocess.Popen([sys.executable, "printer.py", str(user_id), fullname])
+                app.show("printer", user_id=user_id, fullname=fullname)
             else:
                 messagebox.showerror("Error", "Invalid username/email or password.")
                 canvas.itemconfigure(forgot_pw_label, state="normal")
 
         elif role == "Admin":
-            cursor.execute("""
-                SELECT * FROM admin_login
-                WHERE admin_username = %s AND admin_password = %s
-            """, (username_or_email, password))
-            admin = cursor.fetchone()
+            admin = db.fetch_one("login_admin", (username_or_email, password))
 
             if admin:
                 admin_name = admin['admin_username']
                 messagebox.showinfo("Success", f"Welcome {admin_name} (Admin)!")
-                window.destroy()
-                subprocess.Popen([sys.executable, "admin_dashboard.py", admin_name])
+                app.show("admin_dashboard", admin_name=admin_name)
             else:
                 messagebox.showerror("Error", "Invalid admin username or password.")
                 canvas.itemconfigure(forgot_pw_label, state="normal")
 
-        cursor.close()
-        conn.close()
-
     except Exception as e:
         messagebox.showerror("Database Error", str(e))
 
@@ -229,7 +207,7 @@ def relative_to_assets(path: str) -> Path:
     return ASSETS_PATH / Path(path)
 
 
-window = Tk()
+window = app.create_window()
 window_width = 859
 window_height = 534
 screen_width = window.winfo_screenwidth()
@@ -250,7 +228,7 @@ try:
     window.eye_slash_image = PhotoImage(file=relative_to_assets("hide.png"))
 except tk.TclError:
     messagebox.showerror("Asset Error", "Could not find 'eye.png' or 'eye-slash.png' in the assets folder.")
-    window.destroy()
+    app.quit_app()
     sys.exit()
 
 canvas.create_rectangle(15.0, 14.0, 844.0, 518.0, fill="#FFFFFF", outline="#000000", width=1.5)
@@ -306,5 +284,12 @@ for tag in (btn_login, btn_login_text, forgot_pw_label, register_text):
 canvas.tag_bind(forgot_pw_label, "<Button-1>", lambda e: open_forgot())
 canvas.tag_bind(register_text, "<Button-1>", lambda e: open_register())
 
-window.resizable(False, False)
-window.mainloop()
\ No newline at end of file
+
+# --- Reset the form whenever the cached screen is shown again (e.g. after logout) ---
+def on_show():
+    entry_email.put_placeholder()
+    entry_password.put_placeholder()
+    canvas.itemconfigure(forgot_pw_label, state="hidden")
+
+
+window.resizable(False, False)
\ No newline at end of file
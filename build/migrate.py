@@ -0,0 +1,72 @@
+# Applies the SQL files in migrations/ to the Copy Corner database.
+#
+# Files run in name order (001_..., 002_...) and each one only once: applied
+# files are recorded in the schema_migrations table.
+#
+# Usage:  python migrate.py          (apply pending migrations)
+#         python migrate.py --list   (show applied / pending migrations)
+
+import sys
+from pathlib import Path
+
+import db
+
+MIGRATIONS_PATH = Path(__file__).parent / "migrations"
+
+
+def migration_files():
+    return sorted(MIGRATIONS_PATH.glob("*.sql"))
+
+
+def split_statements(sql):
+    """Splits a migration file into statements, dropping `--` comments."""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+def applied_migrations(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            name VARCHAR(255) PRIMARY KEY,
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT name FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def migrate(list_only=False, upto=None):
+    """Applies pending migrations (only those named <= `upto`, if given)."""
+    with db.connection() as conn:
+        cursor = conn.cnx.cursor()
+        try:
+            applied = applied_migrations(cursor)
+            for path in migration_files():
+                if upto is not None and path.name > upto:
+                    break
+                if path.name in applied:
+                    if list_only:
+                        print(f"applied  {path.name}")
+                    continue
+                if list_only:
+                    print(f"pending  {path.name}")
+                    continue
+                print(f"Applying {path.name}...")
+                # DDL commits implicitly in MySQL, so a failed file is reported
+                # and the remaining files are not run.
+                for statement in split_statements(path.read_text(encoding="utf-8")):
+                    cursor.execute(statement)
+                cursor.execute("INSERT INTO schema_migrations (name) VALUES (%s)", (path.name,))
+                conn.cnx.commit()
+        finally:
+            cursor.close()
+
+
+if __name__ == "__main__":
+    try:
+        migrate(list_only="--list" in sys.argv)
+    except db.Error as err:
+        print(f"Migration failed: {err}")
+        sys.exit(1)
+    finally:
+        db.close_pool()
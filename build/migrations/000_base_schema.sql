@@ -0,0 +1,53 @@
+-- The copy_corner_db tables as the application expects them before the
+-- numbered migrations, so an empty database can be set up with
+-- "python migrate.py" (loadtest.py does this). On an existing database every
+-- statement is a no-op.
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id INT AUTO_INCREMENT PRIMARY KEY,
+    fullname VARCHAR(100) NOT NULL,
+    username VARCHAR(50) NOT NULL,
+    contact VARCHAR(20),
+    email VARCHAR(100) NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS admin_login (
+    admin_id INT AUTO_INCREMENT PRIMARY KEY,
+    admin_username VARCHAR(50) NOT NULL,
+    admin_password VARCHAR(255) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS files (
+    file_id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT,
+    file_name VARCHAR(255) NOT NULL,
+    file_path VARCHAR(500) NOT NULL,
+    file_type VARCHAR(20),
+    uploaded_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS print_jobs (
+    job_id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT,
+    file_id INT,
+    pages INT,
+    paper_size VARCHAR(20),
+    color_option VARCHAR(50),
+    copies INT DEFAULT 1,
+    payment_method VARCHAR(50),
+    total_amount DECIMAL(10, 2),
+    status VARCHAR(20) DEFAULT 'Pending',
+    notes TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    notif_id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT,
+    subject VARCHAR(255) NOT NULL,
+    message TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'Unread',
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
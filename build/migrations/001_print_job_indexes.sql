@@ -0,0 +1,10 @@
+-- Indexes for the admin_print job table (keyset pagination, newest first).
+-- Every page is "ORDER BY created_at DESC, job_id DESC" after a
+-- (created_at, job_id) cursor, optionally filtered by status or user.
+
+CREATE INDEX idx_print_jobs_created ON print_jobs (created_at, job_id);
+CREATE INDEX idx_print_jobs_status_created ON print_jobs (status, created_at, job_id);
+CREATE INDEX idx_print_jobs_user_created ON print_jobs (user_id, created_at, job_id);
+
+-- The username filter is a prefix match (LIKE 'abc%'), which can use this index.
+CREATE INDEX idx_users_username ON users (username);
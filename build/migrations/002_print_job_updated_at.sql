@@ -0,0 +1,13 @@
+-- Change tracking for the admin dashboard live refresh: every insert or
+-- update stamps updated_at, so the dashboard only polls rows changed since
+-- the last (updated_at, job_id) it has seen.
+
+ALTER TABLE print_jobs
+    ADD COLUMN updated_at DATETIME(6) NOT NULL
+        DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+UPDATE print_jobs SET updated_at = COALESCE(created_at, updated_at);
+CREATE INDEX idx_print_jobs_updated ON print_jobs (updated_at, job_id);
+
+-- Status box ordering ("Pending first, then by job_id"): InnoDB appends the
+-- primary key to secondary indexes, so this serves WHERE status = ? ORDER BY job_id.
+CREATE INDEX idx_print_jobs_status ON print_jobs (status);
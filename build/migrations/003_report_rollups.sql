@@ -0,0 +1,30 @@
+-- Rollups behind admin_report.py and the "Revenue Today" box, maintained by
+-- reports.py whenever a job is inserted or its status changes.
+-- Rebuild them from print_jobs with:  python reports.py --rebuild
+
+-- One row per user per day x status x paper size x color option.
+-- user_id 0 stands for jobs without a user.
+CREATE TABLE IF NOT EXISTS report_user_daily (
+    day DATE NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    paper_size VARCHAR(20) NOT NULL,
+    color_option VARCHAR(50) NOT NULL,
+    user_id INT NOT NULL,
+    jobs INT NOT NULL DEFAULT 0,
+    pages BIGINT NOT NULL DEFAULT 0,
+    spend DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, status, paper_size, color_option, user_id)
+);
+
+-- The same cells summed over users; `users` counts the report_user_daily rows of the cell.
+CREATE TABLE IF NOT EXISTS report_daily (
+    day DATE NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    paper_size VARCHAR(20) NOT NULL,
+    color_option VARCHAR(50) NOT NULL,
+    jobs INT NOT NULL DEFAULT 0,
+    pages BIGINT NOT NULL DEFAULT 0,
+    revenue DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    users INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, status, paper_size, color_option)
+);
@@ -0,0 +1,15 @@
+-- Content-addressed file store (see filestore.py). New rows keep the blob
+-- path relative to the store in file_path; rows without sha256 are legacy
+-- uploads that only know the customer's local path.
+--
+-- There is no reference count: print jobs are never deleted (only Voided),
+-- so nothing would ever release a file. The GC pass (filestore.py --gc)
+-- decides what is unused from print_jobs.file_id, which idx_print_jobs_file
+-- serves.
+
+ALTER TABLE files
+    ADD COLUMN sha256 CHAR(64) NULL,
+    ADD COLUMN size BIGINT NULL;
+
+CREATE INDEX idx_files_sha256 ON files (sha256);
+CREATE INDEX idx_print_jobs_file ON print_jobs (file_id);
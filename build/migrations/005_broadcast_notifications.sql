@@ -0,0 +1,36 @@
+-- Broadcast notifications are stored once (user_id IS NULL). Who has read a
+-- broadcast is recorded in notification_receipts, written only when a user
+-- opens or clears it. Unread counts are kept in notification_counts and
+-- counters, so the badge never counts rows (see inbox.py).
+
+CREATE TABLE IF NOT EXISTS notification_receipts (
+    user_id INT NOT NULL,
+    notif_id INT NOT NULL,
+    read_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, notif_id)
+);
+
+-- unread = unread_direct + counters('broadcasts') - read_broadcasts
+CREATE TABLE IF NOT EXISTS notification_counts (
+    user_id INT PRIMARY KEY,
+    unread_direct INT NOT NULL DEFAULT 0,
+    read_broadcasts INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS counters (
+    name VARCHAR(50) PRIMARY KEY,
+    value BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO counters (name, value)
+SELECT 'broadcasts', COUNT(*) FROM notifications WHERE user_id IS NULL
+ON DUPLICATE KEY UPDATE value = VALUES(value);
+
+INSERT INTO notification_counts (user_id, unread_direct)
+SELECT user_id, SUM(status = 'Unread') FROM notifications
+WHERE user_id IS NOT NULL
+GROUP BY user_id
+ON DUPLICATE KEY UPDATE unread_direct = VALUES(unread_direct);
+
+-- Feed pages: WHERE user_id = ? (or IS NULL) AND notif_id < ? ORDER BY notif_id DESC
+CREATE INDEX idx_notifications_user_id ON notifications (user_id, notif_id);
@@ -0,0 +1,29 @@
+-- Per-page prices by color option and paper size (see pricing.py). Prices.py
+-- renders this table and printer.py prices every job from it, so a job's
+-- total_amount = price_per_page * pages * copies.
+
+CREATE TABLE IF NOT EXISTS prices (
+    color_option VARCHAR(50) NOT NULL,
+    paper_size VARCHAR(20) NOT NULL,
+    price_per_page DECIMAL(10, 2) NOT NULL,
+    PRIMARY KEY (color_option, paper_size)
+);
+
+INSERT INTO prices (color_option, paper_size, price_per_page) VALUES
+    ('Black & White', 'Short', 3.00),
+    ('Black & White', 'A4', 3.00),
+    ('Black & White', 'Long', 3.00),
+    ('Partially Colored', 'Short', 7.00),
+    ('Partially Colored', 'A4', 7.00),
+    ('Partially Colored', 'Long', 8.00),
+    ('Color', 'Short', 10.00),
+    ('Color', 'A4', 10.00),
+    ('Color', 'Long', 15.00)
+ON DUPLICATE KEY UPDATE price_per_page = price_per_page;
+
+-- Jobs submitted before pricing existed have no amount. Run
+-- "python reports.py --rebuild" afterwards so the rollups include them.
+UPDATE print_jobs pj
+JOIN prices p ON p.color_option = pj.color_option AND p.paper_size = pj.paper_size
+SET pj.total_amount = p.price_per_page * COALESCE(pj.pages, 0) * COALESCE(pj.copies, 1)
+WHERE pj.total_amount IS NULL;
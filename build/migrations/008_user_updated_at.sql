@@ -0,0 +1,8 @@
+-- Change tracking for the shared user index (userindex.py): inserts and
+-- profile edits stamp updated_at, so an admin screen that is shown again
+-- only reads the users changed since its last look, whichever PC made them.
+
+ALTER TABLE users
+    ADD COLUMN updated_at DATETIME(6) NOT NULL
+        DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+CREATE INDEX idx_users_updated ON users (updated_at, user_id);
@@ -0,0 +1,13 @@
+-- One files row per (user, content, name): batch submissions insert with
+-- ON DUPLICATE KEY UPDATE, so reusing a stored file touches only that row
+-- instead of reading and locking the user's whole upload history.
+-- Legacy rows (sha256 NULL) never collide.
+--
+-- file_name is compared in binary so that "Report.pdf" and "report.PDF" stay
+-- two rows, as filestore.attach_many expects; the default collation would
+-- ignore case and accents. The key's (user_id, sha256) prefix serves the
+-- lookups idx_files_user_sha256 would have.
+
+ALTER TABLE files
+    MODIFY file_name VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    ADD UNIQUE KEY uq_files_user_blob (user_id, sha256, file_name);
@@ -0,0 +1,51 @@
+# Price matrix shared by Prices.py (the pricelist) and printer.py (job totals).
+#
+# Per-page prices live in the prices table (migrations/006_price_matrix.sql),
+# keyed by color option and paper size.  They are read once and cached for
+# CACHE_SECONDS, so quoting a job never costs a query.
+
+import threading
+import time
+from decimal import Decimal
+
+import db
+
+PAPER_SIZES = ("Short", "A4", "Long")
+COLOR_OPTIONS = ("Black & White", "Partially Colored", "Color")  # print_jobs.color_option values
+COLOR_LABELS = {"Black & White": "Black & White", "Partially Colored": "Partially Colored",
+                "Color": "Full Colored"}
+CACHE_SECONDS = 300  # how long a loaded matrix is trusted
+
+_matrix = {}  # (color_option, paper_size) -> Decimal price per page
+_loaded_at = None
+_lock = threading.Lock()  # jobs are priced on worker threads
+
+
+def load(force=False):
+    """Returns the price matrix, reading the prices table when the cache is stale."""
+    global _matrix, _loaded_at
+    with _lock:
+        if force or _loaded_at is None or time.monotonic() - _loaded_at > CACHE_SECONDS:
+            _matrix = {
+                (row["color_option"], row["paper_size"]): Decimal(row["price_per_page"])
+                for row in db.fetch_all("price_matrix")
+            }
+            _loaded_at = time.monotonic()
+        return _matrix
+
+
+def price_per_page(color_option, paper_size):
+    """Per-page price, or None if the combination is not on the pricelist."""
+    return load().get((color_option, paper_size))
+
+
+def quote(pages, copies, color_option, paper_size):
+    """Total amount of a job: price per page x pages x copies."""
+    rate = price_per_page(color_option, paper_size)
+    if rate is None:
+        raise ValueError(f"No price for {color_option} on {paper_size} paper.")
+    return rate * pages * copies
+
+
+def peso(amount):
+    return f"₱{amount:,.2f}"
@@ -1,53 +1,28 @@
-import sys
-import subprocess
 from pathlib import Path
 from tkinter import (
-    Tk, Canvas, Entry, Text, messagebox, filedialog,
-    Checkbutton, IntVar, DISABLED, NORMAL, StringVar, OptionMenu, PhotoImage, Label, Button
+    Canvas, Entry, Text, messagebox, filedialog,
+    Checkbutton, IntVar, DISABLED, NORMAL, StringVar, OptionMenu, PhotoImage, Label, Button, Listbox
 )
 import os
 from datetime import datetime
-import mysql.connector
+import app
+import db
+import filestore
+import pricing
+import reports
+import worker
 
 
-# --- Database Connection Function ---
-def create_db_connection():
-    """Creates and returns a connection to the MySQL database."""
-    try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="copy_corner_db"
-        )
-        return connection
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", f"Failed to connect to database: {err}")
-        return None
-
 def update_request_status(job_id, new_status):
     """
     Updates the status of a print job in the database.
     Example: update_request_status(5, "Declined") or update_request_status(5, "Approved")
     """
-    conn = None
     try:
-        conn = create_db_connection()
-        if conn is None:
-            return
-
-        cursor = conn.cursor()
-        sql_query = "UPDATE print_jobs SET status = %s WHERE id = %s"
-        cursor.execute(sql_query, (new_status, job_id))
-        conn.commit()
-
+        reports.set_job_status(job_id, new_status)
         messagebox.showinfo("Status Updated", f"Request #{job_id} marked as {new_status}.")
-    except mysql.connector.Error as err:
+    except db.Error as err:
         messagebox.showerror("Database Error", f"Failed to update status: {err}")
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 
 # --- NEW: Function to load existing requests for the logged-in user ---
@@ -56,22 +31,9 @@ def load_user_requests():
     if not user_id:
         return  # Don't load anything if there's no user logged in
 
-    conn = None
     try:
-        conn = create_db_connection()
-        if not conn:
-            return
-
-        cursor = conn.cursor(dictionary=True)
-        # Select the most recent jobs for this specific user
-        sql_query = """
-        SELECT pages, status, created_at FROM print_jobs 
-        WHERE user_id = %s 
-        ORDER BY created_at DESC 
-        LIMIT 5 
-        """
-        cursor.execute(sql_query, (user_id,))
-        requests = cursor.fetchall()
+        # The most recent jobs for this specific user
+        requests = db.fetch_all("recent_requests", (user_id,))
 
         # Display the requests, with the oldest one at the top
         for request in reversed(requests):
@@ -80,12 +42,8 @@ def load_user_requests():
             status = request['status']
             add_request_status(filename, date_str, status)
 
-    except mysql.connector.Error as err:
+    except db.Error as err:
         print(f"Could not load request history: {err}")  # Log error to console
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 
 # --- Rounded Rectangle Function ---
@@ -97,44 +55,34 @@ def round_rectangle(canvas, x1, y1, x2, y2, r=15, **kwargs):
     return canvas.create_polygon(points, smooth=True, **kwargs)
 
 
-# --- MODIFIED: Navigation Functions to pass user info ---
+# --- Navigation Functions (user info travels in app.session) ---
 def open_user_py():
     if user_id:
-        subprocess.Popen([sys.executable, "user.py", str(user_id), fullname])
-        window.destroy()
+        app.show("user")
 
 
 def open_notification_py():
     if user_id:
-        subprocess.Popen([sys.executable, "Notification.py", str(user_id), fullname])
-        window.destroy()
+        app.show("notification")
 
 
 def open_prices_py():
     if user_id:
-        subprocess.Popen([sys.executable, "Prices.py", "printer.py", str(user_id), fullname])
-        window.destroy()
+        app.show("prices")
 
 
-# Inside printer.py
-
-# Assuming you have user_id and fullname variables already
 def open_help_py():
     if user_id is None: # Add check
         messagebox.showerror("Error", "User ID not found.")
         return
-    # Pass user_id and fullname to help.py
-    subprocess.Popen([sys.executable, "help.py", str(user_id), fullname])
-    window.destroy()
+    app.show("help")
 
 # Similar function for opening history.py
 def open_history_py():
     if user_id is None:
         messagebox.showerror("Error", "User ID not found.")
         return
-    # Pass user_id and fullname to history.py
-    subprocess.Popen([sys.executable, "history.py", str(user_id), fullname])
-    window.destroy()
+    app.show("history")
 
 
 def make_icon_clickable(widget, command):
@@ -184,86 +132,164 @@ def clear_form():
     notes_text.config(state=DISABLED)
 
 
-# --- MODIFIED: Submit Request Function to include user_id ---
-def submit_request():
-    # 1. Validate user input
-    if not user_id:
-        messagebox.showerror("Error", "No user is logged in. Cannot submit request.")
-        return
+# --- Batch Queue (each file keeps its own pages, size, color and copies) ---
+COLOR_VALUES = {"bw": "Black & White", "partial": "Partially Colored", "color": "Color"}
+COLOR_SHORT = {"Black & White": "B&W", "Partially Colored": "Partial", "Color": "Color"}
+job_queue = []  # dicts: path, name, pages, paper_size, color_option, copies, notes, amount
+
+
+def read_form():
+    """Validates the form and returns it as a queue item, or None."""
     if not selected_file:
         messagebox.showwarning("Missing File", "Please select a file to print.")
-        return
+        return None
     pages = pages_entry.get().strip()
     if not pages.isdigit() or int(pages) <= 0:
         messagebox.showwarning("Invalid Input", "Please enter a valid number of pages.")
-        return
+        return None
     copies = copies_entry.get().strip()
     if not copies.isdigit() or int(copies) <= 0:
         messagebox.showwarning("Invalid Input", "Please enter a valid number of copies.")
-        return
+        return None
     color_option = color_choice.get()
     if not color_option:
         messagebox.showwarning("Missing Option", "Please select a color option.")
+        return None
+
+    item = {
+        "path": selected_file,
+        "name": os.path.basename(selected_file),
+        "pages": int(pages),
+        "paper_size": paper_size_var.get(),
+        "color_option": COLOR_VALUES[color_option],
+        "copies": int(copies),
+        "notes": notes_text.get("1.0", "end").strip() if notes_var.get() == 1 else "",
+    }
+    try:
+        item["amount"] = pricing.quote(item["pages"], item["copies"], item["color_option"], item["paper_size"])
+    except db.Error as err:
+        messagebox.showerror("Database Error", f"Could not load the pricelist: {err}")
+        return None
+    except ValueError as err:
+        messagebox.showwarning("Not Available", str(err))
+        return None
+    return item
+
+
+def add_to_queue():
+    if submitting:
+        return
+    item = read_form()
+    if item:
+        job_queue.append(item)
+        show_queue()
+        clear_form()
+
+
+def remove_from_queue(event=None):
+    if submitting:
         return
+    selection = queue_list.curselection()
+    if selection:
+        del job_queue[selection[0]]
+        show_queue()
+
+
+def show_queue():
+    queue_list.delete(0, "end")
+    for item in job_queue:
+        queue_list.insert("end", f"{item['name']}  -  {item['pages']}p {item['paper_size']} "
+                                 f"{COLOR_SHORT[item['color_option']]} x{item['copies']}  -  "
+                                 f"{pricing.peso(item['amount'])}")
+    if job_queue:
+        total = sum(item["amount"] for item in job_queue)
+        summary = f"Queue: {len(job_queue)} file(s), {pricing.peso(total)} (double-click to remove)"
+    else:
+        summary = "Queue: empty"
+    canvas.itemconfig(queue_label, text=summary)
 
-    # 2. Gather all data from the form
-    filename = os.path.basename(selected_file)
-    paper_size = paper_size_var.get()
-    color_value = "Color" if color_option == 'color' else "Black & White"
-    notes = notes_text.get("1.0", "end").strip() if notes_var.get() == 1 else ""
 
-    # 3. Insert data into the database
-    conn = None
-    try:
-        conn = create_db_connection()
-        if conn is None:
+# --- MODIFIED: Submit Request Function to include user_id ---
+submitting = False  # True while a batch is being uploaded
+
+
+def submit_request():
+    """Submits the queue, plus the file in the form if one is selected."""
+    global submitting
+    if submitting:
+        return  # the previous batch is still uploading
+    # 1. Validate user input
+    if not user_id:
+        messagebox.showerror("Error", "No user is logged in. Cannot submit request.")
+        return
+    if selected_file or not job_queue:
+        item = read_form()
+        if not item:
             return
+        job_queue.append(item)
+        show_queue()
+        clear_form()
 
-        cursor = conn.cursor()
-
-        file_name = os.path.basename(selected_file)
-        file_ext = os.path.splitext(file_name)[1].lower().replace(".", "")
-        file_path = selected_file  # full local path
-
-        insert_file_query = """
-                INSERT INTO files (user_id, file_name, file_path, file_type)
-                VALUES (%s, %s, %s, %s)
-                """
-        cursor.execute(insert_file_query, (user_id, file_name, file_path, file_ext))
-        file_id = cursor.lastrowid
-
-        # MODIFIED: Added user_id to the query
-        sql_query = """
-               INSERT INTO print_jobs 
-               (user_id, file_id, pages, paper_size, color_option, copies, notes, status) 
-               VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-               """
-        job_data = (
-            user_id,
-            file_id,  # linked file
-            int(pages),
-            paper_size,
-            color_value,
-            int(copies),
-            notes,
-            "Pending"
-        )
-
-        cursor.execute(sql_query, job_data)
-        conn.commit()
-
-        messagebox.showinfo("Success", f"Print request for '{filename}' submitted successfully!")
+    # 2. Stream the files into the shop's file store, then insert all files
+    #    and jobs in one transaction -- on a worker thread so the UI stays responsive
+    items = list(job_queue)
+    canvas.itemconfig(file_label, text=f"Uploading {len(items)} file(s)...")
+    submitting = True
 
+    def done(_):
+        global submitting
+        submitting = False
+        canvas.itemconfig(file_label, text="No file selected")
+        total = sum(item["amount"] for item in items)
+        messagebox.showinfo("Success", f"{len(items)} print request(s) submitted successfully!\n"
+                                       f"Total: {pricing.peso(total)}")
         date_now = datetime.now().strftime("%B %d, %Y")
-        add_request_status(filename, date_now, "Pending")
-        clear_form()
+        for item in items:
+            add_request_status(item["name"], date_now, "Pending")
+        job_queue.clear()
+        show_queue()
+
+    def failed(err):
+        global submitting
+        submitting = False
+        canvas.itemconfig(file_label, text="No file selected")
+        if isinstance(err, db.Error):
+            messagebox.showerror("Database Error", f"An error occurred: {err}")
+        else:
+            messagebox.showerror("Upload Failed", f"Could not upload the files:\n{err}")
+
+    worker.submit(store_and_submit, user_id, items, on_done=done, on_error=failed)
+
+
+def store_and_submit(owner_id, items):
+    """Ingests the files and records all files + print jobs in one transaction (worker thread).
 
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", f"An error occurred: {err}")
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+    Jobs are priced from the price matrix here, not from the quotes shown in the queue.
+    """
+    blobs = {}  # path -> blob, so a file queued twice is read once
+    for item in items:
+        if item["path"] not in blobs:
+            blobs[item["path"]] = filestore.ingest(item["path"])
+    amounts = [
+        pricing.quote(item["pages"], item["copies"], item["color_option"], item["paper_size"])
+        for item in items
+    ]
+
+    with db.transaction() as tx:
+        file_ids = filestore.attach_many(tx, owner_id, [(item["name"], blobs[item["path"]]) for item in items])
+        jobs = [
+            {"user_id": owner_id, "file_id": file_id, "pages": item["pages"], "paper_size": item["paper_size"],
+             "color_option": item["color_option"], "copies": item["copies"], "notes": item["notes"],
+             "status": "Pending", "total_amount": amount}
+            for item, file_id, amount in zip(items, file_ids, amounts)
+        ]
+        _, first_job_id = tx.executemany("job_insert", [
+            (job["user_id"], job["file_id"], job["pages"], job["paper_size"], job["color_option"],
+             job["copies"], job["notes"], job["status"], job["total_amount"])
+            for job in jobs
+        ])
+        reports.add_batch(tx, first_job_id, jobs)
+    return first_job_id
 
 
 # --- Dynamic Request Status System ---
@@ -288,23 +314,12 @@ def relative_to_assets(path: str) -> Path:
     return ASSETS_PATH / Path(path)
 
 
-# --- MODIFIED: Get user_id and fullname from login.py ---
-user_id = None
-fullname = "User"
-# Expects command: python printer.py <user_id> <fullname>
-if len(sys.argv) > 2:
-    try:
-        user_id = int(sys.argv[1])
-        fullname = sys.argv[2]
-    except ValueError:
-        print("Error: User ID passed from login was not a valid number.")
-        user_id = None  # Invalidate user_id if it's not a number
-        fullname = "User (Error)"
-elif len(sys.argv) > 1:
-    fullname = sys.argv[1]  # Fallback for testing
+# --- Get user_id and fullname from the session set by login.py ---
+user_id = app.session["user_id"]
+fullname = app.session["fullname"]
 
 # --- Tkinter Window Setup ---
-window = Tk()
+window = app.create_window()
 window_width = 859
 window_height = 534
 
@@ -383,20 +398,33 @@ canvas.create_text(462, 232, anchor="nw", text="Color Option", fill="#000000", f
 color_choice = StringVar(value="")
 bw_check = Checkbutton(window, text="Black & White", variable=color_choice, onvalue="bw", offvalue="", bg="#FFFFFF",
                        command=lambda: color_choice.set("bw"))
-color_check = Checkbutton(window, text="Color", variable=color_choice, onvalue="color", offvalue="", bg="#FFFFFF",
+partial_check = Checkbutton(window, text="Partially Colored", variable=color_choice, onvalue="partial", offvalue="",
+                            bg="#FFFFFF", command=lambda: color_choice.set("partial"))
+color_check = Checkbutton(window, text="Full Color", variable=color_choice, onvalue="color", offvalue="", bg="#FFFFFF",
                           command=lambda: color_choice.set("color"))
-bw_check.place(x=436, y=257)
-color_check.place(x=558, y=257)
+bw_check.place(x=366, y=257)
+partial_check.place(x=468, y=257)
+color_check.place(x=588, y=257)
 
 canvas.create_text(525, 285, anchor="nw", text="Additional Notes", fill="#000000", font=("Inter Bold", 13))
 notes_var = IntVar()
 notes_toggle = Checkbutton(window, variable=notes_var, bg="#FFFFFF", command=toggle_notes)
 notes_toggle.place(x=497, y=280)
-round_rectangle(canvas, 372, 309, 819, 455, r=10, fill="#FFFFFF", outline="#000000", width=1)
+round_rectangle(canvas, 372, 309, 819, 367, r=10, fill="#FFFFFF", outline="#000000", width=1)
 notes_text = Text(window, bd=0, relief="flat", wrap="word", highlightthickness=0)
-notes_text.place(x=375, y=312, width=440, height=140)
+notes_text.place(x=375, y=312, width=440, height=52)
 notes_text.config(state=DISABLED)
 
+# Batch queue: files waiting to be submitted together
+round_rectangle(canvas, 372, 373, 819, 455, r=10, fill="#FFFFFF", outline="#000000", width=1)
+queue_label = canvas.create_text(380, 377, anchor="nw", text="Queue: empty", fill="#000000", font=("Inter Bold", 10))
+queue_rect = round_rectangle(canvas, 716, 376, 814, 394, r=8, fill="#000000", outline="#000000")
+queue_text = canvas.create_text(765, 385, text="Add to Queue", fill="#FFFFFF", font=("Inter Bold", 9))
+queue_list = Listbox(window, bd=0, relief="flat", highlightthickness=0, activestyle="none", font=("Inter", 9))
+queue_list.place(x=377, y=395, width=437, height=56)
+queue_list.bind("<Double-Button-1>", remove_from_queue)
+queue_list.bind("<Delete>", remove_from_queue)
+
 submit_rect = round_rectangle(canvas, 249, 404, 351, 432, r=15, fill="#000000", outline="#000000")
 submit_text = canvas.create_text(273, 410, anchor="nw", text="Submit", fill="#FFFFFF", font=("Inter Bold", 12))
 
@@ -423,6 +451,15 @@ def on_leave_submit(event): canvas.itemconfig(submit_rect, fill="#000000"); wind
 def on_click_submit(event): submit_request()
 
 
+def on_hover_queue(event): canvas.itemconfig(queue_rect, fill="#333333"); window.config(cursor="hand2")
+
+
+def on_leave_queue(event): canvas.itemconfig(queue_rect, fill="#000000"); window.config(cursor="")
+
+
+def on_click_queue(event): add_to_queue()
+
+
 def on_hover_choose(event): canvas.itemconfig(choose_btn, fill="#333333"); window.config(cursor="hand2")
 
 
@@ -436,6 +473,10 @@ for tag in (submit_rect, submit_text):
     canvas.tag_bind(tag, "<Enter>", on_hover_submit)
     canvas.tag_bind(tag, "<Leave>", on_leave_submit)
     canvas.tag_bind(tag, "<Button-1>", on_click_submit)
+for tag in (queue_rect, queue_text):
+    canvas.tag_bind(tag, "<Enter>", on_hover_queue)
+    canvas.tag_bind(tag, "<Leave>", on_leave_queue)
+    canvas.tag_bind(tag, "<Button-1>", on_click_queue)
 for tag in (choose_btn, choose_text):
     canvas.tag_bind(tag, "<Enter>", on_hover_choose)
     canvas.tag_bind(tag, "<Leave>", on_leave_choose)
@@ -450,6 +491,6 @@ round_rectangle(canvas, 249, 465, 832, 510, r=10, fill="#FFFFFF", outline="#0000
 
 # --- NEW: Load user's request history when the application starts ---
 load_user_requests()
+worker.submit(pricing.load, on_error=lambda err: print(f"Could not load the pricelist: {err}"))  # warm the quote cache
 
-window.resizable(False, False)
-window.mainloop()
\ No newline at end of file
+window.resizable(False, False)
\ No newline at end of file
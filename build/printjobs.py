@@ -0,0 +1,65 @@
+# Print job reads shared by the screens and loadtest.py.
+#
+# The screens build their Tk windows on import, so the queries behind
+# admin_print, history and admin_dashboard live here, free of Tk, and both
+# the screens and the load test call them.
+
+import sys
+from datetime import datetime, timedelta
+
+import db
+
+JOB_PAGE_SIZE = 50  # rows fetched per keyset page (admin_print)
+STATUS_BOX_ROWS = 5  # rows in the admin dashboard's STATUS PRINT REQUESTS box
+# Far-future keyset cursor, so the first page uses the same query as the next ones
+FIRST_PAGE = (datetime(9999, 12, 31, 23, 59, 59), sys.maxsize)
+
+
+# --- admin_print ---
+def like_escape(text):
+    """Makes % and _ typed by the admin match literally in a LIKE pattern."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def fetch_print_jobs(username_filter="", status_filter="All", after=None, limit=JOB_PAGE_SIZE):
+    """
+    Fetches one page of print jobs, newest first, using keyset pagination on
+    (created_at, job_id): `after` is the (created_at, job_id) of the last row
+    already loaded. The username filter is a prefix match so it can use an index.
+    """
+    created_at, job_id = after or FIRST_PAGE
+    params = []
+    if username_filter:
+        params.append(f"{like_escape(username_filter)}%")
+    if status_filter and status_filter != "All":
+        params.append(status_filter)
+    query_name = {
+        (False, False): "job_page",
+        (False, True): "job_page_status",
+        (True, False): "job_page_user",
+        (True, True): "job_page_user_status",
+    }[(bool(username_filter), bool(status_filter and status_filter != "All"))]
+    return db.fetch_all(query_name, (*params, created_at, created_at, job_id, limit))
+
+
+# --- history ---
+def fetch_history(user_id):
+    """The user's print jobs with their file names, newest first."""
+    return db.fetch_all("history", (user_id,))
+
+
+# --- admin_dashboard ---
+def today_range():
+    """[midnight today, midnight tomorrow) so created_at can use its index."""
+    today_start = datetime.combine(datetime.now().date(), datetime.min.time())
+    return today_start, today_start + timedelta(days=1)
+
+
+def dashboard_counters():
+    """Pending / voided today / users counts plus the server time they were read at."""
+    return db.fetch_one("dashboard_counters", today_range())
+
+
+def dashboard_requests(rows=STATUS_BOX_ROWS):
+    """The first `rows` jobs of the status box: Pending, then Approved, Voided, the rest."""
+    return db.fetch_all("dashboard_requests", (rows,) * 5)
@@ -1,8 +1,8 @@
 from pathlib import Path
-from tkinter import Tk, Canvas, Entry, messagebox
-import subprocess
-import sys
-import mysql.connector
+from tkinter import Canvas, Entry, messagebox
+import app
+import db
+import userindex
 
 OUTPUT_PATH = Path(__file__).parent
 ASSETS_PATH = OUTPUT_PATH / Path(
@@ -12,15 +12,6 @@ ASSETS_PATH = OUTPUT_PATH / Path(
 def relative_to_assets(path: str) -> Path:
     return ASSETS_PATH / Path(path)
 
-# --- DB Connection ---
-def get_db_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",      # adjust if your MySQL user is different
-        password="",      # put your MySQL password if set
-        database="copy_corner_db"
-    )
-
 # --- Rounded rectangle function ---
 def round_rectangle(canvas, x1, y1, x2, y2, r=20, **kwargs):
     points = [
@@ -79,26 +70,14 @@ def register_user():
 
     # --- Insert into DB ---
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
         # check duplicates
-        cursor.execute("SELECT 1 FROM users WHERE fullname=%s OR username=%s OR email=%s",
-                       (fullname, username, email))
-        if cursor.fetchone():
+        if db.fetch_one("user_exists", (fullname, username, email)):
             messagebox.showerror("Error", "User with this fullname, username, or email already exists!")
-            cursor.close()
-            conn.close()
             return
 
         # insert new user (now includes contact)
-        cursor.execute(
-            "INSERT INTO users (fullname, username, contact, email, password) VALUES (%s, %s, %s, %s, %s)",
-            (fullname, username, contact, email, password)
-        )
-        conn.commit()
-        cursor.close()
-        conn.close()
+        _, new_user_id = db.execute("user_insert", (fullname, username, contact, email, password))
+        userindex.upsert({"user_id": new_user_id, "username": username, "fullname": fullname, "email": email})
 
         messagebox.showinfo("Success", "Account created successfully!")
 
@@ -114,14 +93,10 @@ def register_user():
 
 # --- Open login.py ---
 def open_login():
-    try:
-        subprocess.Popen([sys.executable, "login.py"])
-        window.destroy()
-    except Exception as e:
-        messagebox.showerror("Error", f"Could not open login.py\n{e}")
+    app.show("login")
 
 # --- Main Window ---
-window = Tk()
+window = app.create_window()
 # --- Center the Window ---
 window_width = 859
 window_height = 604
@@ -223,4 +198,3 @@ canvas.tag_bind(login_text, "<Leave>", lambda e: window.config(cursor=""))
 
 # --- End ---
 window.resizable(False, False)
-window.mainloop()
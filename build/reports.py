@@ -0,0 +1,159 @@
+# Analytics engine behind admin_report.py and the "Revenue Today" box.
+#
+# Two rollup tables (see migrations/003_report_rollups.sql) are kept up to
+# date as jobs come in and change status, so reports never scan print_jobs:
+#
+#   report_user_daily   day x status x paper size x color option x user
+#   report_daily        the same cells summed over users (+ distinct users)
+#
+# Usage:  python reports.py --rebuild                    (backfill everything)
+#         python reports.py --rebuild --since 2025-09-01 (only from that day on)
+
+import sys
+from datetime import date, datetime, timedelta
+
+import db
+
+GROUPINGS = ("Daily", "Weekly", "Monthly")
+TOP_SPENDERS = 4  # rows in the "Top Users by Spend" table
+
+
+# --- Incremental Maintenance (call inside the transaction that changes the job) ---
+def _cell(job, status=None):
+    """Rollup key of a job: (day, status, paper_size, color_option)."""
+    return (
+        job["created_at"].date(),
+        status if status is not None else (job["status"] or ""),
+        job["paper_size"] or "",
+        job["color_option"] or "",
+    )
+
+
+def _add(tx, job, status=None):
+    _add_totals(tx, _cell(job, status), job["user_id"] or 0, 1, job["pages"] or 0, job["total_amount"] or 0)
+
+
+def _add_totals(tx, key, user_id, jobs, pages, amount):
+    inserted, _ = tx.execute("rollup_user_add", (*key, user_id, jobs, pages, amount))
+    new_users = 1 if inserted == 1 else 0
+    tx.execute("rollup_daily_add", (*key, jobs, pages, amount, new_users))
+
+
+def _remove(tx, job, status=None):
+    key = _cell(job, status)
+    user_id = job["user_id"] or 0
+    pages, amount = job["pages"] or 0, job["total_amount"] or 0
+    tx.execute("rollup_user_remove", (pages, amount, *key, user_id))
+    users_left, _ = tx.execute("rollup_user_prune", (*key, user_id))
+    tx.execute("rollup_daily_remove", (pages, amount, users_left, *key))
+
+
+def add_batch(tx, first_job_id, jobs):
+    """Counts jobs just inserted by one multi-row INSERT (first_job_id = its lastrowid).
+
+    jobs are the inserted values (user_id, status, paper_size, color_option,
+    pages, total_amount); only created_at is read back, from the first job,
+    since every row of one statement gets the same CURRENT_TIMESTAMP.  Jobs
+    falling in the same rollup cell are added with a single update.
+    """
+    rows = tx.fetch_all("report_job", (first_job_id,))
+    if not rows or rows[0]["created_at"] is None:
+        return
+    created_at = rows[0]["created_at"]
+    totals = {}  # (cell, user_id) -> [jobs, pages, amount]
+    for job in jobs:
+        key = (_cell(dict(job, created_at=created_at)), job["user_id"] or 0)
+        cell = totals.setdefault(key, [0, 0, 0])
+        cell[0] += 1
+        cell[1] += job["pages"] or 0
+        cell[2] += job["total_amount"] or 0
+    for (key, user_id), (count, pages, amount) in totals.items():
+        _add_totals(tx, key, user_id, count, pages, amount)
+
+
+def set_job_status(job_id, new_status):
+    """Changes a job's status and moves it to its new rollup cell, atomically."""
+    with db.transaction() as tx:
+        rows = tx.fetch_all("report_job", (job_id,))  # locks the job row
+        tx.execute("job_status_update", (new_status, job_id))
+        if not rows or rows[0]["created_at"] is None:
+            return
+        job = rows[0]
+        if (job["status"] or "") != new_status:
+            _remove(tx, job)
+            _add(tx, job, new_status)
+
+
+def rebuild(since=None):
+    """Recomputes the rollups from print_jobs (all history, or from `since` on)."""
+    since = since or date(1000, 1, 1)  # the earliest DATE MySQL supports
+    with db.transaction() as tx:
+        tx.execute("rollup_clear_daily", (since,))
+        tx.execute("rollup_clear_user", (since,))
+        cells, _ = tx.execute("rollup_backfill_user", (since,))
+        tx.execute("rollup_backfill_daily", (since,))
+    return cells
+
+
+# --- Reports ---
+def bucket_start(day, group_by):
+    """First day of the Daily / Weekly (Monday) / Monthly bucket holding `day`."""
+    if group_by == "Weekly":
+        return day - timedelta(days=day.weekday())
+    if group_by == "Monthly":
+        return day.replace(day=1)
+    return day
+
+
+def buckets(first_day, last_day, group_by):
+    """Every bucket start between two days (inclusive), so empty periods still show."""
+    starts = []
+    day = bucket_start(first_day, group_by)
+    while day <= last_day:
+        starts.append(day)
+        if group_by == "Weekly":
+            day += timedelta(days=7)
+        elif group_by == "Monthly":
+            day = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            day += timedelta(days=1)
+    return starts
+
+
+def load_report(first_day, last_day, group_by="Daily"):
+    """Returns {summary, series, top_users} for first_day..last_day (inclusive).
+
+    series is a list of (bucket start, revenue) in date order.
+    """
+    end = last_day + timedelta(days=1)
+    summary = db.fetch_one("report_summary", (first_day, end))
+    billable = summary["billable_jobs"]
+    summary["avg_job_value"] = summary["revenue"] / billable if billable else 0
+
+    revenue = dict.fromkeys(buckets(first_day, last_day, group_by), 0)
+    for row in db.fetch_all("report_revenue_by_day", (first_day, end)):
+        revenue[bucket_start(row["day"], group_by)] += row["revenue"] or 0
+
+    top_users = db.fetch_all("report_top_spenders", (first_day, end, TOP_SPENDERS))
+    return {"summary": summary, "series": list(revenue.items()), "top_users": top_users}
+
+
+def revenue_on(day):
+    """Billable revenue of the jobs submitted on `day`."""
+    return db.fetch_one("report_summary", (day, day + timedelta(days=1)))["revenue"]
+
+
+if __name__ == "__main__":
+    if "--rebuild" not in sys.argv:
+        print("Usage: python reports.py --rebuild [--since YYYY-MM-DD]")
+        sys.exit(2)
+    since = None
+    if "--since" in sys.argv:
+        since = datetime.strptime(sys.argv[sys.argv.index("--since") + 1], "%Y-%m-%d").date()
+    try:
+        print(f"Rebuilt {rebuild(since)} rollup cell(s).")
+    except db.Error as err:
+        print(f"Rebuild failed: {err}")
+        sys.exit(1)
+    finally:
+        db.close_pool()
@@ -1,21 +1,12 @@
 from pathlib import Path
-from tkinter import Tk, Canvas, messagebox, PhotoImage, Label, Entry
-import subprocess
-import sys
-import mysql.connector
-
-# --- Get user_id and Fullname from Arguments ---
-user_id = None
-fullname = "User"
-if len(sys.argv) > 2:
-    try:
-        user_id = int(sys.argv[1])
-        fullname = sys.argv[2]
-    except ValueError:
-        user_id = None
-        fullname = "User"
-elif len(sys.argv) > 1:
-    fullname = sys.argv[1]
+from tkinter import Canvas, messagebox, PhotoImage, Label, Entry
+import app
+import db
+import userindex
+
+# --- Get user_id and Fullname from the session ---
+user_id = app.session["user_id"]
+fullname = app.session["fullname"]
 
 # --- Paths ---
 OUTPUT_PATH = Path(__file__).parent
@@ -28,30 +19,10 @@ def relative_to_assets(path: str) -> Path:
     return ASSETS_PATH / Path(path)
 
 
-# --- DB Connection ---
-def get_db_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="",
-        database="copy_corner_db"
-    )
-
-
 # --- Fetch User Data ---
 def get_user_data(user_id):
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT fullname, username, email, password, contact
-            FROM users
-            WHERE user_id = %s
-        """, (user_id,))
-        user = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        return user
+        return db.fetch_one("user_profile", (user_id,))
     except Exception as e:
         messagebox.showerror("Database Error", str(e))
         return None
@@ -60,13 +31,7 @@ def get_user_data(user_id):
 # --- Update User Data ---
 def update_user_data(user_id, new_data):
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE users
-            SET fullname=%s, username=%s, email=%s, password=%s, contact=%s
-            WHERE user_id=%s
-        """, (
+        db.execute("user_profile_update", (
             new_data["fullname"],
             new_data["username"],
             new_data["email"],
@@ -74,9 +39,7 @@ def update_user_data(user_id, new_data):
             new_data["contact"],
             user_id
         ))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        userindex.upsert(dict(new_data, user_id=user_id))
         messagebox.showinfo("Success", "Profile updated successfully!")
     except Exception as e:
         messagebox.showerror("Database Error", str(e))
@@ -85,29 +48,24 @@ def update_user_data(user_id, new_data):
 # --- Log Out ---
 def logout():
     messagebox.showinfo("Logged Out", "Logout successful!")
-    subprocess.Popen([sys.executable, "login.py"])
-    window.destroy()
+    app.logout()
 
 
 # --- Navigation ---
 def open_printer():
-    subprocess.Popen([sys.executable, "printer.py", str(user_id), fullname])
-    window.destroy()
+    app.show("printer")
 
 
 def open_notification_py():
-    subprocess.Popen([sys.executable, "Notification.py", str(user_id), fullname])
-    window.destroy()
+    app.show("notification")
 
 
 def open_prices_py():
-    subprocess.Popen([sys.executable, "Prices.py", str(user_id), fullname])
-    window.destroy()
+    app.show("prices")
 
 
 def open_help_py():
-    subprocess.Popen([sys.executable, "Help.py", str(user_id), fullname])
-    window.destroy()
+    app.show("help")
 
 
 # --- Clickable Icons ---
@@ -153,7 +111,7 @@ def create_rounded_button(canvas, x, y, w, h, text, command=None, fill="#000000"
 
 
 # --- Main Window ---
-window = Tk()
+window = app.create_window()
 window_width = 859
 window_height = 534
 screen_width = window.winfo_screenwidth()
@@ -342,4 +300,3 @@ make_icon_clickable(lbl_sheet, open_prices_py)
 make_icon_clickable(lbl_help, open_help_py)
 
 window.resizable(False, False)
-window.mainloop()
@@ -0,0 +1,179 @@
+# Shared in-memory user index for admin_user.py and admin_notification.py.
+#
+# Both screens used to SELECT every user and substring-scan the whole list on
+# each keystroke.  The index is loaded once per process (all screens share
+# it), kept current by register.py / user.py, and answers ranked, limited
+# queries from prefix and trigram postings over username, full name, email
+# and user id.  Users registered or edited from another PC are picked up by
+# refresh(), which reads only the rows whose updated_at moved:
+#
+#   1-2 characters  -> prefix postings (start of the id, username, email or a name word)
+#   3+ characters   -> intersection of trigram postings, then a substring check
+
+import heapq
+import re
+import threading
+from collections import defaultdict
+from datetime import timedelta
+
+import db
+
+RESULT_LIMIT = 50  # rows returned by search()
+PREFIX_LENGTH = 2  # queries shorter than a trigram use the prefix postings
+# updated_at is stamped when the statement runs, not at commit, so refresh()
+# re-reads this far behind the newest stamp it has seen (upserts are idempotent).
+REFRESH_OVERLAP = timedelta(seconds=10)
+
+_users = {}  # user_id -> {"user_id", "username", "fullname", "email"}
+_prefixes = defaultdict(set)  # 1-2 char prefix -> user_ids
+_trigrams = defaultdict(set)  # 3 char gram -> user_ids
+_loaded = False
+_newest = None  # highest users.updated_at read so far
+_lock = threading.RLock()  # search() may run on a worker thread while the UI edits
+
+
+def _fields(user):
+    """Lower-cased searchable strings of a user."""
+    return [
+        str(user["user_id"]),
+        (user.get("username") or "").lower(),
+        (user.get("fullname") or "").lower(),
+        (user.get("email") or "").lower(),
+    ]
+
+
+def _keys(user):
+    prefixes, grams = set(), set()
+    for field in _fields(user):
+        for token in [field] + re.split(r"[\s@._-]+", field):
+            for length in range(1, PREFIX_LENGTH + 1):
+                if len(token) >= length:
+                    prefixes.add(token[:length])
+        grams.update(field[i:i + 3] for i in range(len(field) - 2))
+    return prefixes, grams
+
+
+def _index(user):
+    prefixes, grams = _keys(user)
+    for key in prefixes:
+        _prefixes[key].add(user["user_id"])
+    for gram in grams:
+        _trigrams[gram].add(user["user_id"])
+
+
+def _unindex(user):
+    prefixes, grams = _keys(user)
+    for key in prefixes:
+        _prefixes[key].discard(user["user_id"])
+    for gram in grams:
+        _trigrams[gram].discard(user["user_id"])
+
+
+# --- Loading and Incremental Updates ---
+def load(force=False):
+    """Reads all users once per process (again only with force=True)."""
+    global _loaded, _newest
+    with _lock:
+        if _loaded and not force:
+            return
+        rows = db.fetch_all("user_index")
+        _users.clear()
+        _prefixes.clear()
+        _trigrams.clear()
+        for row in rows:
+            _store(row)
+        _newest = max((row["updated_at"] for row in rows), default=None)
+        _loaded = True
+
+
+def refresh():
+    """Applies the users added or edited since the last load/refresh (by any process)."""
+    global _newest
+    with _lock:
+        if not _loaded or _newest is None:
+            load(force=True)
+            return
+        rows = db.fetch_all("user_index_changes", (_newest - REFRESH_OVERLAP,))
+        for row in rows:
+            upsert(row)
+        if rows:
+            _newest = max(_newest, rows[-1]["updated_at"])
+
+
+def upsert(user):
+    """Adds or replaces one user (after register / profile edit)."""
+    with _lock:
+        if not _loaded:
+            return  # the first load() will read it from the database
+        old = _users.get(user["user_id"])
+        if old is not None:
+            _unindex(old)
+        _store(user)
+
+
+def _store(user):
+    user = {key: user.get(key) for key in ("user_id", "username", "fullname", "email")}
+    _users[user["user_id"]] = user
+    _index(user)
+
+
+def count():
+    return len(_users)
+
+
+def get(user_id):
+    return _users.get(user_id)
+
+
+def find_username(username):
+    """The user with exactly this username (case-insensitive), or None."""
+    wanted = username.lower()
+    with _lock:
+        for user_id in _candidates(wanted):
+            user = _users[user_id]
+            if (user["username"] or "").lower() == wanted:
+                return user
+    return None
+
+
+# --- Queries ---
+def _candidates(query):
+    if len(query) <= PREFIX_LENGTH:
+        return set(_prefixes.get(query, ()))
+    grams = [query[i:i + 3] for i in range(len(query) - 2)]
+    postings = sorted((_trigrams.get(gram, set()) for gram in grams), key=len)
+    result = set(postings[0])
+    for posting in postings[1:]:
+        result &= posting
+        if not result:
+            break
+    return result
+
+
+def _rank(user, query):
+    user_id, username, fullname, email = _fields(user)
+    if query == user_id or query == username:
+        return 0
+    if username.startswith(query) or user_id.startswith(query):
+        return 1
+    if fullname.startswith(query) or email.startswith(query) or any(
+            word.startswith(query) for word in fullname.split()):
+        return 2
+    if any(query in field for field in (user_id, username, fullname, email)):
+        return 3
+    return None  # trigram false positive
+
+
+def search(text, limit=RESULT_LIMIT):
+    """Best `limit` matches for text, exact and prefix matches first."""
+    query = text.strip().lower()
+    with _lock:
+        if not query:
+            return [_users[user_id] for user_id in heapq.nsmallest(limit, _users)]
+        ranked = []
+        for user_id in _candidates(query):
+            user = _users[user_id]
+            rank = _rank(user, query)
+            if rank is not None:
+                ranked.append((rank, len(user["username"] or ""), user["username"] or "", user_id))
+        return [_users[user_id] for *_, user_id in heapq.nsmallest(limit, ranked)]
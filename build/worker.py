@@ -0,0 +1,82 @@
+# Background query executor for the Tkinter screens.
+#
+# Database calls used to run on the Tk main thread, so every screen froze
+# while MySQL answered.  Screens now hand slow work to submit(): it runs on a
+# small thread pool and the result (or the error) is delivered back on the
+# main thread, from a window.after() poll, because Tk widgets must only be
+# touched from the thread that runs mainloop().
+#
+# Usage:
+#     worker.submit(db.fetch_all, "dashboard_requests",
+#                   on_done=draw_rows, on_error=show_error)
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import app
+import db
+
+POLL_MS = 30  # how often the main thread checks for finished work
+
+# One worker per pooled connection but one: that connection stays free for the
+# main thread, whose own queries would otherwise wait (UI frozen) behind
+# background work for up to db.POOL_TIMEOUT.
+_executor = ThreadPoolExecutor(max_workers=max(1, db.POOL_SIZE - 1), thread_name_prefix="db-worker")
+_results = queue.SimpleQueue()  # (future, on_done, on_error) of finished work
+_pending = 0  # submitted but not yet delivered (only touched on the main thread)
+_polling = False
+
+
+def submit(func, *args, on_done=None, on_error=None, **kwargs):
+    """Runs func(*args, **kwargs) in the background.
+
+    on_done(result) or on_error(exception) is then called on the Tk main
+    thread.  Without on_error, failures are printed to the console.
+    """
+    global _pending
+    future = _executor.submit(func, *args, **kwargs)
+    future.add_done_callback(lambda f: _results.put((f, on_done, on_error)))
+    _pending += 1
+    _start_polling()
+    return future
+
+
+def _start_polling():
+    global _polling
+    if not _polling:
+        _polling = True
+        app.get_root().after(POLL_MS, _deliver)
+
+
+def _deliver():
+    """Runs the callbacks of finished work on the main thread."""
+    global _pending, _polling
+    while True:
+        try:
+            future, on_done, on_error = _results.get_nowait()
+        except queue.Empty:
+            break
+        _pending -= 1
+        if future.cancelled():
+            continue
+        error = future.exception()
+        try:
+            if error is None:
+                if on_done:
+                    on_done(future.result())
+            elif on_error:
+                on_error(error)
+            else:
+                print(f"Background task failed: {error}")
+        except Exception as err:  # a broken callback must not stop delivery
+            print(f"Background callback failed: {err}")
+
+    if _pending > 0:
+        app.get_root().after(POLL_MS, _deliver)
+    else:
+        _polling = False
+
+
+def shutdown():
+    """Stops the workers (used on application exit); queued work is dropped."""
+    _executor.shutdown(wait=False, cancel_futures=True)